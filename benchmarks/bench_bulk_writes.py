@@ -0,0 +1,77 @@
+"""Row-at-a-time inserts vs. the *_bulk DatabaseManager APIs.
+
+Loads the same N patients, appointments and reminder log entries three ways:
+the original connect-per-call manager, the pooled manager one row at a
+time, and the bulk APIs (multi-row INSERTs).
+
+    python -m benchmarks.bench_bulk_writes --rows 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from clinic_app import Patient, Doctor, Appointment, DatabaseManager
+from benchmarks.bench_connection_pool import UnpooledDatabaseManager
+
+
+def make_rows(count):
+    patients = [Patient(f"Patient {n}", f"+1555{n:07d}", f"p{n}@mail.com", f"+1555{n:07d}")
+                for n in range(count)]
+    appointments = [Appointment(n + 1, 1, f"2025-{n % 12 + 1:02d}-{n % 28 + 1:02d} 09:00:00",
+                                "Consultation", "scheduled", False)
+                    for n in range(count)]
+    reminders = [(n + 1, "SMS", "sent") for n in range(count)]
+    return patients, appointments, reminders
+
+
+def row_at_a_time(db, patients, appointments, reminders):
+    for patient in patients:
+        db.add_patient(patient)
+    for appointment in appointments:
+        db.add_appointment(appointment, check_conflicts=False)  # same rows as bulk, which skips the check
+    for appointment_id, reminder_type, status in reminders:
+        db.log_reminder(appointment_id, reminder_type, status)
+
+
+def bulk(db, patients, appointments, reminders):
+    db.add_patients_bulk(patients)
+    db.add_appointments_bulk(appointments)
+    db.log_reminders_bulk(reminders)
+
+
+def measure(manager_cls, load, path, rows):
+    db = manager_cls(path)
+    db.add_doctor(Doctor("Sarah Smith", "+1987654321", "dr.smith@clinic.com", "Cardiology"))
+    start = time.perf_counter()
+    load(db, *rows)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    cases = (
+        ("connect-per-call, row at a time", UnpooledDatabaseManager, row_at_a_time),
+        ("pooled, row at a time", DatabaseManager, row_at_a_time),
+        ("bulk APIs", DatabaseManager, bulk),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = {label: measure(manager_cls, load, os.path.join(tmp, f"{n}.db"), rows)
+                   for n, (label, manager_cls, load) in enumerate(cases)}
+
+    total = args.rows * 3
+    bulk_time = timings["bulk APIs"]
+    print(f"{args.rows} rows each of patients, appointments and reminder_log")
+    for label, elapsed in timings.items():
+        print(f"  {label:<33} {elapsed:8.3f} s  {total / elapsed:10.0f} rows/sec  "
+              f"{elapsed / bulk_time:6.1f}x bulk time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Reminder scheduler tick: full rescan of the due window vs reading the change log.
+
+Generates ``--appointments`` rows with ``benchmarks.datagen``, then times
+``ReminderScheduler.due_appointments`` on its first (full) scan, on a quiet
+tick with no changes, and on ticks after ``--changes`` appointments were
+edited, next to the plain ``get_upcoming_appointments`` query it replaces.
+
+    python -m benchmarks.bench_change_feed --appointments 1000000 --days-ahead 7
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.datagen import generate
+
+
+def timed(call, repeat=5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--days-ahead", type=int, default=7)
+    parser.add_argument("--changes", default="10,100,1000", help="comma-separated numbers of edited appointments")
+    args = parser.parse_args()
+
+    from clinic_app.database import DatabaseManager
+    from clinic_app.scheduler import ReminderScheduler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "clinic.db")
+        generate(db_path, max(10, args.appointments // 1000), max(1000, args.appointments // 10), args.appointments)
+        db = DatabaseManager(db_path, cache_size=0)
+        scheduler = ReminderScheduler(db, None, days_ahead=args.days_ahead)
+        print(f"{args.appointments} appointments, {args.days_ahead} days ahead")
+
+        seconds, upcoming = timed(lambda: db.get_upcoming_appointments(days_ahead=args.days_ahead))
+        print(f"  {'get_upcoming_appointments':<28} {seconds * 1000:8.2f} ms  {len(upcoming):7d} rows")
+        start = time.perf_counter()
+        rows = len(scheduler.due_appointments())
+        print(f"  {'first tick (full scan)':<28} {(time.perf_counter() - start) * 1000:8.2f} ms  {rows:7d} rows")
+        seconds, due = timed(scheduler.due_appointments)
+        print(f"  {'quiet tick':<28} {seconds * 1000:8.2f} ms  {len(due):7d} rows")
+
+        ids = upcoming["id"].tolist()
+        for count in (int(count) for count in args.changes.split(",")):
+            with db.pool.connection() as conn:
+                conn.executemany("UPDATE appointments SET notes = 'edited' WHERE id = ?",
+                                 [(appointment_id,) for appointment_id in ids[:count]])
+                conn.commit()
+            start = time.perf_counter()
+            rows = len(scheduler.due_appointments())
+            print(f"  {f'tick after {count} edits':<28} {(time.perf_counter() - start) * 1000:8.2f} ms  {rows:7d} rows")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Booking throughput for N clinics on one shared database vs one database per clinic.
+
+Each clinic gets a writer process that, for ``--seconds``, books
+appointments one at a time and after every ``--bulk-every`` bookings logs a
+bulk reminder run of ``--bulk-size`` rows, like a scheduler sending a batch.
+With a shared database every clinic's writes queue on the same write lock;
+with ``ClinicRouter`` shards each clinic has its own. Prints total bookings
+per second and the p99 booking latency for each clinic count.
+
+    python -m benchmarks.bench_clinic_shards --clinics 1,2,4,8
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.datagen import generate
+
+
+def write_loop(db_path, doctor_id, first_day, seconds, bulk_every, bulk_size, go):
+    # Runs in its own process: booking latencies
+    from clinic_app import Appointment, DatabaseManager
+    db = DatabaseManager(db_path, cache_size=0)
+    with db.pool.connection() as conn:
+        patient_id, = conn.execute("SELECT MIN(id) FROM patients").fetchone()
+    start = datetime.now() + timedelta(days=first_day)
+    latencies, n = [], 0
+    go.wait()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        began = time.perf_counter()
+        appointment_id = db.add_appointment(Appointment(
+            patient_id, doctor_id, (start + timedelta(minutes=30 * n)).strftime('%Y-%m-%d %H:%M:%S'),
+            "Consultation", "scheduled", False,
+        ), check_conflicts=True)
+        latencies.append(time.perf_counter() - began)
+        n += 1
+        if n % bulk_every == 0:
+            db.log_reminders_bulk((appointment_id, "SMS", "sent") for _ in range(bulk_size))
+    db.close()
+    return latencies
+
+
+def run(writers, first_day, seconds, bulk_every, bulk_size, context):
+    # One process per (database, doctor id) in ``writers``, booking from ``first_day`` days out;
+    # (bookings/s, p99 seconds)
+    with context.Manager() as manager, context.Pool(len(writers)) as pool:
+        go = manager.Event()
+        results = [
+            pool.apply_async(write_loop, (path, doctor_id, first_day, seconds, bulk_every, bulk_size, go))
+            for path, doctor_id in writers
+        ]
+        time.sleep(1)  # let every writer open its database first
+        go.set()
+        latencies = [latency for result in results for latency in result.get()]
+    return len(latencies) / seconds, statistics.quantiles(latencies, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clinics", default="1,2,4,8", help="comma-separated clinic counts")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--bulk-every", type=int, default=20)
+    parser.add_argument("--bulk-size", type=int, default=2000)
+    args = parser.parse_args()
+    counts = [int(count) for count in args.clinics.split(",")]
+
+    from clinic_app.tenancy import ClinicDirectory, ClinicRouter
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = os.path.join(tmp, "shared.db")
+        generate(shared, max(counts), 1_000, 10_000)
+        directory = ClinicDirectory(os.path.join(tmp, "clinics"))
+        for index in range(max(counts)):
+            clinic = directory.add(f"clinic-{index}", f"Clinic {index}")
+            generate(clinic.db_path, 1, 1_000, 10_000)
+        router = ClinicRouter(directory)
+        shards = [router.database(clinic.slug).db_path for clinic in directory.clinics()]
+        router.close()
+
+        print(f"Each clinic books for {args.seconds:.0f}s, logging {args.bulk_size} reminders every "
+              f"{args.bulk_every} bookings")
+        first_day = 0
+        for count in counts:
+            # On the shared database each clinic books its own doctor; each shard has just one
+            scenarios = (
+                ("shared database", [(shared, doctor_id) for doctor_id in range(1, count + 1)]),
+                ("one per clinic", [(shard, 1) for shard in shards[:count]]),
+            )
+            for label, writers in scenarios:
+                # A fresh stretch of days per run, so bookings never collide with an earlier run's
+                first_day += 1000
+                rate, p99 = run(writers, first_day, args.seconds, args.bulk_every, args.bulk_size, context)
+                print(f"  {count} clinics  {label:<16} {rate:8.0f} bookings/s  p99 {p99 * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Reminder delivery throughput: the old sequential loop vs. ReminderDispatcher.
+
+Both sides use the simulated ReminderService senders (0.5 s per call). The
+sequential loop is timed on a small sample and reported as a rate.
+
+    python -m benchmarks.bench_dispatch --jobs 300
+"""
+import argparse
+import time
+
+from clinic_app import ReminderService, ReminderJob, ReminderDispatcher
+from clinic_app.dispatch import CHANNELS
+
+
+def make_jobs(count):
+    return [
+        ReminderJob(n, CHANNELS[n % len(CHANNELS)], f"+1555{n:07d}",
+                    f"Clinic Reminder: appointment #{n}", subject="Appointment Reminder")
+        for n in range(count)
+    ]
+
+
+def sequential(jobs):
+    start = time.perf_counter()
+    for job in jobs:
+        ReminderService.send(job.channel, job.recipient, job.message, job.subject)
+    return len(jobs) / (time.perf_counter() - start)
+
+
+def concurrent(jobs):
+    dispatcher = ReminderDispatcher(ReminderService)
+    start = time.perf_counter()
+    results = dispatcher.dispatch(jobs)
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+    assert all(result.sent for result in results)
+    return len(jobs) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--sequential-sample", type=int, default=10)
+    args = parser.parse_args()
+
+    sequential_rate = sequential(make_jobs(args.sequential_sample))
+    concurrent_rate = concurrent(make_jobs(args.jobs))
+    ceiling = sum(ReminderDispatcher().limits[channel].rate_per_second for channel in CHANNELS)
+
+    print(f"{args.jobs} reminders across {', '.join(CHANNELS)}")
+    print(f"  sequential loop   {sequential_rate:8.1f} reminders/sec")
+    print(f"  dispatcher        {concurrent_rate:8.1f} reminders/sec")
+    print(f"  rate-limit cap    {ceiling:8.1f} reminders/sec")
+    print(f"  2,000 reminders   {2000 / sequential_rate / 60:6.1f} min -> {2000 / concurrent_rate / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
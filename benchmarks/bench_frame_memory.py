@@ -0,0 +1,78 @@
+"""Resident memory per loaded appointment frame: object columns vs Arrow/categorical.
+
+Generates ``--appointments`` rows with ``benchmarks.datagen``, then in a
+fresh process per variant loads ``--copies`` independent copies of each
+frame (the query cache is off, as if every session had its own) and
+reports the growth in resident set size per copy, next to pandas' own
+``memory_usage(deep=True)``. The "object" variant is the old
+``pd.read_sql_query`` path. Resident size is read from /proc, so Linux only.
+
+    python -m benchmarks.bench_frame_memory --appointments 1000000
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.datagen import generate
+
+FRAMES = {
+    "get_appointments": lambda db: db.get_appointments(),
+    "get_upcoming_appointments": lambda db: db.get_upcoming_appointments(days_ahead=56),
+}
+
+
+def resident_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(db_path, variant, frame, copies):
+    # Runs in its own process: (RSS growth per copy, deep memory_usage, seconds per load)
+    import clinic_app.database
+    from clinic_app import DatabaseManager
+    if variant == "object":
+        clinic_app.database.read_frame = lambda conn, query, params=(): pd.read_sql_query(query, conn, params=params)
+    db = DatabaseManager(db_path, cache_size=0)
+    FRAMES[frame](db)  # warm up the connection and page cache
+    gc.collect()
+    before = resident_bytes()
+    start = time.perf_counter()
+    frames = [FRAMES[frame](db) for _ in range(copies)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    rss = (resident_bytes() - before) / copies
+    deep = frames[0].memory_usage(deep=True).sum()
+    db.close()
+    return rss, deep, elapsed / copies, len(frames[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--copies", type=int, default=5)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "clinic.db")
+        generate(db_path, max(10, args.appointments // 1000), max(1000, args.appointments // 10), args.appointments)
+        print(f"{args.appointments} appointments, {args.copies} copies of each frame")
+        for frame in FRAMES:
+            results = {}
+            for variant in ("object", "compact"):
+                with context.Pool(1) as pool:
+                    results[variant] = pool.apply(measure, (db_path, variant, frame, args.copies))
+            for variant, (rss, deep, seconds, rows) in results.items():
+                print(f"  {frame:<26} {variant:<8} {rows:9d} rows  {rss / 1e6:8.1f} MB resident  "
+                      f"{deep / 1e6:8.1f} MB deep  {seconds * 1000:8.1f} ms/load")
+            print(f"  {frame:<26} resident {results['object'][0] / results['compact'][0]:.1f}x smaller, "
+                  f"deep {results['object'][1] / results['compact'][1]:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Streaming import/export throughput for clinic_app.bulk_io.
+
+Writes N-row patients, doctors and appointments files (CSV and Parquet),
+imports them in that order into a fresh database and exports them back out,
+reporting rows/sec for each step and table. Appointments reference the
+imported patients and doctors and never overlap, so every row goes through
+the full validation.
+
+    python -m benchmarks.bench_import_export --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from clinic_app import DatabaseManager
+from clinic_app.bulk_io import import_file, export_table
+
+# Appointments are spread over the first this many doctors
+DOCTORS = 100
+
+
+def patient_columns(numbers):
+    return {
+        "name": [f"Patient {n}" for n in numbers],
+        "phone": [f"+1555{n:07d}" for n in numbers],
+        "email": [f"p{n}@mail.com" for n in numbers],
+        "whatsapp_number": [f"+1555{n:07d}" for n in numbers],
+    }
+
+
+def doctor_columns(numbers):
+    return {
+        "name": [f"Doctor {n}" for n in numbers],
+        "phone": [f"+1987{n:07d}" for n in numbers],
+        "email": [f"d{n}@clinic.com" for n in numbers],
+        "specialty": ["General" for _ in numbers],
+    }
+
+
+def appointment_columns(numbers, patients):
+    # Each doctor sees one patient every 30 minutes, round the clock
+    start = datetime(2030, 1, 1)
+    return {
+        "patient_id": [str(n % patients + 1) for n in numbers],
+        "doctor_id": [str(n % DOCTORS + 1) for n in numbers],
+        "appointment_date": [(start + timedelta(minutes=30 * (n // DOCTORS))).strftime('%Y-%m-%d %H:%M')
+                             for n in numbers],
+    }
+
+
+def write_file(path, rows, columns, chunk=500_000):
+    writer = None
+    for start in range(0, rows, chunk):
+        batch = pa.RecordBatch.from_pydict(columns(range(start, min(rows, start + chunk))))
+        if writer is None:
+            writer = pq.ParquetWriter(path, batch.schema) if path.endswith(".parquet") else pa_csv.CSVWriter(
+                path, batch.schema)
+        writer.write_batch(batch)
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    tables = (
+        ("patients", args.rows, patient_columns),
+        ("doctors", args.rows, doctor_columns),
+        ("appointments", args.rows, lambda numbers: appointment_columns(numbers, args.rows)),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in ("csv", "parquet"):
+            db = DatabaseManager(os.path.join(tmp, f"{extension}.db"))
+            for kind, rows, columns in tables:
+                source = os.path.join(tmp, f"{kind}.{extension}")
+                write_file(source, rows, columns)
+                report = import_file(db, kind, source)
+                start = time.perf_counter()
+                exported = export_table(db, kind, os.path.join(tmp, f"export.{extension}"))
+                export_seconds = time.perf_counter() - start
+                print(f"{extension:>8} {kind:<13} import {report.imported:>10} rows {report.seconds:7.1f} s "
+                      f"{report.imported / report.seconds:10.0f} rows/sec  ({report.rejected} rejected)")
+                print(f"{extension:>8} {kind:<13} export {exported:>10} rows {export_seconds:7.1f} s "
+                      f"{exported / export_seconds:10.0f} rows/sec")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Startup cost of the core package and the Streamlit entry point, from ``python -X importtime``.
+
+Each target runs in a fresh interpreter, ``--repeat`` times (median
+reported). The core targets must not pull in streamlit or plotly, and
+the UI entry point, run in bare mode against a copy of the database, must
+not pull in plotly.express until the Analytics page renders; the run
+fails if they do.
+
+    python -m benchmarks.bench_import_time --repeat 5
+"""
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, code, modules that must not be imported)
+TARGETS = [
+    ("import clinic_app", "import clinic_app", ("pandas", "streamlit", "plotly")),
+    ("models + ReminderService", "from clinic_app import Patient, ReminderService", ("pandas", "streamlit", "plotly")),
+    ("DatabaseManager", "from clinic_app import DatabaseManager", ("streamlit", "plotly")),
+    ("scheduler", "import clinic_app.scheduler", ("streamlit", "plotly")),
+    # streamlit itself loads plotly's lazy package stub; plotly.express is the expensive part
+    ("main.py (Dashboard)", None, ("plotly.express",)),
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(code, cwd):
+    # {top-level module: cumulative microseconds} and every module imported
+    command = [sys.executable, "-X", "importtime"]
+    command += ["-c", code] if code else [os.path.join(cwd, "main.py")]
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    stderr = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True, check=True).stderr
+    top_level, modules = {}, set()
+    for self_us, cumulative_us, indent, name in LINE.findall(stderr):
+        modules.add(name)
+        if len(indent) == 1:
+            top_level[name] = int(cumulative_us)
+    return top_level, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, "main.py"), tmp)
+        if os.path.exists(os.path.join(ROOT, "clinic_app.db")):
+            shutil.copy(os.path.join(ROOT, "clinic_app.db"), tmp)
+        for label, code, forbidden in TARGETS:
+            runs = [import_profile(code, tmp) for _ in range(args.repeat)]
+            total_ms = statistics.median(sum(top.values()) for top, _ in runs) / 1000
+            top, modules = runs[-1]
+            heaviest = sorted(top.items(), key=lambda item: -item[1])[:3]
+            print(f"  {label:<26} {total_ms:8.1f} ms   "
+                  + ", ".join(f"{name} {us / 1000:.0f}" for name, us in heaviest))
+            leaked = sorted({module for module in forbidden
+                             if any(name == module or name.startswith(module + ".") for name in modules)})
+            if leaked:
+                failures.append(f"{label} imports {', '.join(leaked)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
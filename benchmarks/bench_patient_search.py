@@ -0,0 +1,68 @@
+"""Patient type-ahead search latency over a large patients table.
+
+Loads N synthetic patients and times ``search_patients`` for name
+prefixes, emails and phone-number fragments against a LIKE scan.
+
+    python -m benchmarks.bench_patient_search --patients 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from clinic_app import Patient, DatabaseManager
+
+FIRST = ["John", "Mary", "Ahmed", "Fatima", "Wei", "Olga", "José", "Priya", "Liam", "Amara", "Noah", "Zara"]
+LAST = ["Smith", "Garcia", "Khan", "Okafor", "Chen", "Ivanova", "Müller", "Patel", "Brown", "Silva", "Nguyen"]
+
+QUERIES = ["j", "jo", "smi", "john smi", "fatima kh", "zara nguyen", "patel.12", "555 0123", "(555) 01", "4567"]
+
+
+def seed(db, count, chunk=100_000):
+    rng = random.Random(0)
+    for start in range(0, count, chunk):
+        db.add_patients_bulk([
+            Patient(f"{rng.choice(FIRST)} {rng.choice(LAST)}", f"+1 (555) {n % 10000:04d}-{n // 10000:04d}",
+                    f"{rng.choice(LAST).lower()}.{n}@mail.com", f"+1555{n:07d}")
+            for n in range(start, min(count, start + chunk))
+        ])
+
+
+def median_ms(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "search.db"), cache_size=0)
+        start = time.perf_counter()
+        seed(db, args.patients)
+        print(f"Loaded {args.patients} patients in {time.perf_counter() - start:.1f}s")
+
+        for query in QUERIES:
+            elapsed = median_ms(lambda: db.search_patients(query), args.repeat)
+            matches = len(db.search_patients(query))
+            print(f"  {query!r:<14} {elapsed:8.2f} ms  {matches:3d} results")
+
+        with db._connection() as conn:
+            like = median_ms(lambda: conn.execute(
+                "SELECT * FROM patients WHERE name LIKE ? OR phone LIKE ? LIMIT 20", ("%nobody%",) * 2
+            ).fetchall(), 3)
+        print(f"  LIKE scan, no match      {like:8.2f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
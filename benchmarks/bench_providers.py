@@ -0,0 +1,97 @@
+"""Provider I/O against the local mock servers: connection reuse and batching.
+
+Starts ``MockGatewayServer`` and ``MockSmtpServer`` in-process with a fixed
+per-request latency and error rate, then pushes the same jobs through
+ReminderDispatcher with:
+
+- a fresh HTTP client (new TCP connection) per message;
+- one pooled keep-alive client;
+- the batch endpoint;
+
+and, for email, a new authenticated SMTP session per message against
+``SmtpProvider``'s reused per-thread sessions. Rate limits are lifted so the
+numbers show the I/O path, not the token buckets.
+
+    python -m benchmarks.bench_providers --jobs 2000 --latency 0.02 --error-rate 0.01
+"""
+import argparse
+import time
+
+import httpx
+
+from clinic_app import ChannelLimits, ReminderDispatcher, ReminderJob
+from clinic_app.providers import HttpProvider, ProviderService, ReminderProvider, SmtpProvider
+from clinic_app.providers.mock import MockGatewayServer, MockSmtpServer
+
+
+class ConnectionPerMessageHttp(ReminderProvider):
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, recipient, message, subject=""):
+        with httpx.Client() as client:
+            response = client.post(self.url, json={"to": recipient, "message": message, "subject": subject})
+        if response.is_server_error:
+            response.raise_for_status()
+        return response.is_success
+
+
+class ConnectionPerMessageSmtp(SmtpProvider):
+    def send_batch(self, messages):
+        return [SmtpProvider.send_batch(self, [item])[0] for item in messages]
+
+    def _connection(self):
+        # Drop the previous session so every message logs in again
+        self._discard()
+        return super()._connection()
+
+
+def run(channel, provider, jobs, mock):
+    before = (mock.stats.connections, mock.stats.requests)
+    dispatcher = ReminderDispatcher(
+        ProviderService({channel: provider}),
+        limits={channel: ChannelLimits(concurrency=16, rate_per_second=1e9, burst=1_000_000)},
+        backoff=0.01,
+    )
+    start = time.perf_counter()
+    results = dispatcher.dispatch([job for job in jobs if job.channel == channel])
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+    sent = sum(result.sent for result in results)
+    return (len(results) / elapsed, sent, len(results),
+            mock.stats.connections - before[0], mock.stats.requests - before[1])
+
+
+def report(label, outcome):
+    rate, sent, total, connections, requests = outcome
+    print(f"  {label:<30} {rate:9.1f} msg/s  {sent}/{total} sent  {connections:5d} connections  {requests:5d} requests")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    sms = [ReminderJob(n, "SMS", f"+1555{n:07d}", f"Clinic Reminder: appointment #{n}") for n in range(args.jobs)]
+    email = [ReminderJob(n, "Email", f"patient.{n}@mail.com", f"Appointment #{n}", "Appointment Reminder")
+             for n in range(args.jobs // 4)]
+
+    with MockGatewayServer(latency=args.latency, error_rate=args.error_rate, seed=0) as gateway, \
+            MockSmtpServer(latency=args.latency / 4, error_rate=args.error_rate, seed=0) as smtp:
+        url = gateway.url("sms")
+        print(f"{len(sms)} SMS, {args.latency * 1000:.0f} ms per request, {args.error_rate:.0%} injected errors")
+        report("connection per message", run("SMS", ConnectionPerMessageHttp(url), sms, gateway))
+        report("pooled keep-alive client", run("SMS", HttpProvider(url), sms, gateway))
+        report(f"batch endpoint ({args.batch}/request)", run("SMS", HttpProvider(url, batch_size=args.batch), sms, gateway))
+
+        print(f"{len(email)} emails, {args.latency * 250:.0f} ms per message")
+        options = dict(host="127.0.0.1", port=smtp.port, username="clinic", password="secret", starttls=False)
+        report("SMTP session per message", run("Email", ConnectionPerMessageSmtp(**options), email, smtp))
+        report("reused SMTP sessions", run("Email", SmtpProvider(**options), email, smtp))
+
+
+if __name__ == "__main__":
+    main()
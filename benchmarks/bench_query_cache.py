@@ -0,0 +1,83 @@
+"""Dashboard read latency with and without DatabaseManager's query cache.
+
+Times the four queries the Dashboard issues on every rerun, first with the
+cache disabled and then warm, and checks that a write made through a second
+manager (its own connections, as another process would have) is visible
+on the next read.
+
+    python -m benchmarks.bench_query_cache --appointments 50000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from clinic_app import Patient, Doctor, Appointment, DatabaseManager
+
+
+def dashboard(db):
+    db.get_patients()
+    db.get_doctors()
+    db.get_appointments()
+    db.get_upcoming_appointments()
+
+
+def seed(db, appointments):
+    doctor_ids = db.add_doctors_bulk(
+        [Doctor(f"Doctor {n}", "+100000", f"d{n}@clinic.com", "General Practice") for n in range(20)]
+    )
+    patient_ids = db.add_patients_bulk(
+        [Patient(f"Patient {n}", f"+1555{n:07d}", f"p{n}@mail.com", "") for n in range(appointments // 5)]
+    )
+    start = datetime.now() - timedelta(days=180)
+    db.add_appointments_bulk([
+        Appointment(patient_ids[n % len(patient_ids)], doctor_ids[n % len(doctor_ids)],
+                    (start + timedelta(minutes=15 * n)).strftime('%Y-%m-%d %H:%M:%S'),
+                    "Consultation", "scheduled", False)
+        for n in range(appointments)
+    ])
+
+
+def time_calls(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        seed(DatabaseManager(path, cache_size=0), args.appointments)
+
+        uncached = DatabaseManager(path, cache_size=0)
+        cached = DatabaseManager(path)
+        other = DatabaseManager(path)
+        cold = time_calls(lambda: dashboard(uncached), args.repeat)
+        dashboard(cached)
+        warm = time_calls(lambda: dashboard(cached), args.repeat)
+
+        before = len(cached.get_patients())
+        other.add_patient(Patient("New Patient", "+15550000000", "", ""))
+        after = len(cached.get_patients())
+
+        print(f"Dashboard queries over {args.appointments} appointments (median of {args.repeat})")
+        print(f"  uncached {cold:10.3f} ms")
+        print(f"  cached   {warm:10.3f} ms   {cold / warm:8.0f}x")
+        print(f"  hits {cached.cache.hits}, misses {cached.cache.misses}")
+        print(f"  write from another manager seen: {'yes' if after == before + 1 else 'NO'}")
+        for db in (uncached, cached, other):
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Conflict checks and free-slot search against a busy doctor's calendar.
+
+Books ``--bookings`` 30-minute appointments for one doctor over the next
+year, then times ``find_conflicts`` and ``find_free_slots`` (R*Tree
+lookups) against the naive approach of scanning ``get_appointments()``.
+
+    python -m benchmarks.bench_slots --bookings 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from clinic_app import Patient, Doctor, Appointment, DatabaseManager
+
+
+def book_year(db, doctor_id, patient_id, bookings):
+    # Fill working hours (Mon-Fri 09:00-17:00, 16 slots a day) from tomorrow on
+    day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    appointments = []
+    while len(appointments) < bookings:
+        if day.weekday() < 5:
+            for slot in range(16):
+                when = day + timedelta(hours=9, minutes=30 * slot)
+                appointments.append(Appointment(patient_id, doctor_id, when.strftime('%Y-%m-%d %H:%M:%S'),
+                                                "Consultation", "scheduled", False))
+        day += timedelta(days=1)
+    db.add_appointments_bulk(appointments[:bookings])
+    return day
+
+
+def naive_conflicts(db, doctor_id, start, duration):
+    frame = db.get_appointments()
+    starts = pd.to_datetime(frame['appointment_date'])
+    ends = starts + pd.to_timedelta(frame['duration_minutes'], unit='m')
+    return frame.loc[(frame['doctor_id'] == doctor_id) & (starts < start + timedelta(minutes=duration))
+                     & (ends > start), 'id'].tolist()
+
+
+def median_ms(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "slots.db"), cache_size=0)
+        doctor_id = db.add_doctor(Doctor("Sarah Smith", "+1987654321", "dr.smith@clinic.com", "Cardiology"))
+        patient_id = db.add_patient(Patient("John Doe", "+1234567890", "john@email.com", "+1234567890"))
+        last_day = book_year(db, doctor_id, patient_id, args.bookings)
+        probe = last_day - timedelta(days=3) + timedelta(hours=10)
+
+        print(f"{args.bookings} bookings for one doctor (median of {args.repeat})")
+        rtree = median_ms(lambda: db.find_conflicts(doctor_id, probe, 30), args.repeat)
+        naive = median_ms(lambda: naive_conflicts(db, doctor_id, probe, 30), max(1, args.repeat // 4))
+        print(f"  conflict check, R*Tree          {rtree:10.3f} ms")
+        print(f"  conflict check, DataFrame scan  {naive:10.3f} ms   {naive / rtree:6.0f}x slower")
+        soon = median_ms(lambda: db.find_free_slots(doctor_id, count=10), args.repeat)
+        print(f"  next 10 free slots              {soon:10.3f} ms")
+        free = db.find_free_slots(doctor_id, count=10)
+        print(f"  first free slot: {free[0] if free else 'none within 60 days'}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Booking and reminder-logging latency while reports run, with and without the snapshot.
+
+Generates ``--appointments`` rows with ``benchmarks.datagen``. For each
+scenario a separate process (like the scheduler next to the web app) books
+appointments and logs reminders for ``--seconds``, while this process runs
+reports: the appointments export and the full appointment listing, either
+against the live database or against a ``SnapshotDatabase`` taken every
+``--max-age`` seconds. Prints write latency percentiles and how large the
+WAL grew, which long reads on the live file keep from being checkpointed.
+
+    python -m benchmarks.bench_snapshot_reads --appointments 1000000
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.datagen import generate
+from clinic_app.bulk_io import export_table
+
+
+def write_loop(db_path, seconds, first_day):
+    # Runs in its own process: (add_appointment + log_reminder latencies, peak WAL bytes)
+    from clinic_app import Appointment, DatabaseManager
+    db = DatabaseManager(db_path, cache_size=0)
+    with db.pool.connection() as conn:
+        patient_id, doctor_id = conn.execute("SELECT MIN(patients.id), MIN(doctors.id) FROM patients, doctors").fetchone()
+    start = datetime.now() + timedelta(days=first_day)
+    latencies, wal_peak, n = [], 0, 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        began = time.perf_counter()
+        appointment_id = db.add_appointment(Appointment(
+            patient_id, doctor_id, (start + timedelta(minutes=30 * n)).strftime('%Y-%m-%d %H:%M:%S'),
+            "Consultation", "scheduled", False,
+        ), check_conflicts=True)
+        db.log_reminder(appointment_id, "SMS", "sent")
+        latencies.append(time.perf_counter() - began)
+        wal_peak = max(wal_peak, os.path.getsize(f"{db_path}-wal"))
+        n += 1
+        time.sleep(0.005)
+    db.close()
+    return latencies, wal_peak
+
+
+def report_loop(db):
+    export_table(db, "appointments", io.BytesIO(), name="appointments.parquet")
+    db.get_appointments()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--max-age", type=float, default=5.0, help="snapshot refresh interval")
+    args = parser.parse_args()
+
+    from clinic_app.database import DatabaseManager, SnapshotDatabase
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "clinic.db")
+        generate(db_path, max(10, args.appointments // 1000), max(1000, args.appointments // 10), args.appointments)
+        print(f"{args.appointments} appointments, writing for {args.seconds:.0f}s per scenario")
+        live = DatabaseManager(db_path, cache_size=0)
+        snapshot = SnapshotDatabase(live, max_age=args.max_age, cache_size=0)
+        scenarios = (("no reports", None), ("reports on live db", live), ("reports on snapshot", snapshot))
+        for index, (scenario, reader) in enumerate(scenarios):
+            with live.pool.connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            reports = 0
+            with context.Pool(1) as pool:
+                # Each scenario books its own stretch of days, past everything datagen made
+                writer = pool.apply_async(write_loop, (db_path, args.seconds, 400 + 1000 * index))
+                while not writer.ready():
+                    if reader is None:
+                        time.sleep(0.05)
+                        continue
+                    report_loop(reader)
+                    reports += 1
+                latencies, wal_peak = writer.get()
+            cuts = statistics.quantiles(latencies, n=100)
+            print(f"  {scenario:<20} {len(latencies):5d} writes  p50 {cuts[49] * 1000:6.2f} ms  "
+                  f"p99 {cuts[98] * 1000:7.2f} ms  max {max(latencies) * 1000:7.2f} ms  "
+                  f"WAL peak {wal_peak / 1e6:6.1f} MB  {reports} reports")
+        snapshot.close()
+        live.close()
+
+
+if __name__ == "__main__":
+    main()
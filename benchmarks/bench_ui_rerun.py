@@ -0,0 +1,115 @@
+"""Rerun time after a click on a busy Send Reminders page, via Streamlit's AppTest.
+
+Seeds a temporary database with ``--upcoming`` appointments in the next
+week, then times one click on an individual reminder button:
+
+- the old page, which rendered an expander with three buttons per appointment;
+- the whole new page (what AppTest reruns on any click);
+- the individual-reminders fragment alone (what the browser reruns on a click).
+
+    python -m benchmarks.bench_ui_rerun --upcoming 2000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from streamlit.testing.v1 import AppTest
+
+from clinic_app import Appointment, DatabaseManager, Doctor, Patient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(path, upcoming):
+    db = DatabaseManager(path)
+    doctor_id = db.add_doctor(Doctor("Sarah Smith", "+1987654321", "dr.smith@clinic.com", "Cardiology"))
+    patient_ids = db.add_patients_bulk(
+        Patient(f"Patient {n}", f"+1555{n:07d}", f"patient.{n}@mail.com", f"+1555{n:07d}") for n in range(upcoming)
+    )
+    start = datetime.now().replace(second=0, microsecond=0) + timedelta(days=1)
+    db.add_appointments_bulk(
+        Appointment(patient_id, doctor_id, (start + timedelta(minutes=n)).strftime('%Y-%m-%d %H:%M:%S'),
+                    "Consultation", "scheduled", False)
+        for n, patient_id in enumerate(patient_ids)
+    )
+    db.close()
+
+
+def old_page():
+    # The Send Reminders list before it was paginated
+    import streamlit as st
+    from clinic_app.ui.common import get_db
+    db = get_db()
+    upcoming_df = db.get_upcoming_appointments(days_ahead=7)
+    for _, apt in upcoming_df.iterrows():
+        with st.expander(f"📅 {apt['patient_name']} - {apt['appointment_date']}"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**Patient:** {apt['patient_name']}")
+                st.write(f"**Doctor:** Dr. {apt['doctor_name']}")
+                st.write(f"**Type:** {apt['appointment_type']}")
+                st.write(f"**Date:** {apt['appointment_date']}")
+            with col2:
+                st.write(f"**Phone:** {apt['patient_phone']}")
+                st.write(f"**Email:** {apt['patient_email']}")
+                st.write(f"**WhatsApp:** {apt['whatsapp_number']}")
+            btn_col1, btn_col2, btn_col3 = st.columns(3)
+            with btn_col1:
+                st.button("📱 WhatsApp", key=f"wa_{apt['id']}")
+            with btn_col2:
+                if st.button("📨 SMS", key=f"sms_{apt['id']}"):
+                    st.success("SMS sent!")
+            with btn_col3:
+                st.button("📧 Email", key=f"email_{apt['id']}")
+
+
+def reminder_fragment():
+    from clinic_app.ui.common import get_db
+    from clinic_app.ui.reminders import individual_reminders
+    individual_reminders(get_db().get_dashboard_summary(days_ahead=7)['upcoming'])
+
+
+def time_click(app, setup, repeat):
+    # Median seconds for the rerun after clicking the first SMS button
+    app.run()
+    setup(app)
+    timings = []
+    for _ in range(repeat):
+        button = next(button for button in app.button if button.key and button.key.startswith("sms_"))
+        start = time.perf_counter()
+        button.click().run()
+        timings.append(time.perf_counter() - start)
+        assert not app.exception, app.exception
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upcoming", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed(os.path.join(tmp, "clinic_app.db"), args.upcoming)
+        # The UI opens clinic_app.db in the working directory
+        os.chdir(tmp)
+        sys.path.insert(0, ROOT)
+
+        def select_page(app):
+            next(box for box in app.sidebar.selectbox if box.label == "Choose a page:").select("Send Reminders").run()
+
+        print(f"{args.upcoming} upcoming appointments, one reminder button click (median of {args.repeat})")
+        old = time_click(AppTest.from_function(old_page, default_timeout=600), lambda app: None, max(1, args.repeat // 2))
+        print(f"  old page, every expander         {old * 1000:9.1f} ms")
+        page = time_click(AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=600), select_page, args.repeat)
+        print(f"  new page, full rerun             {page * 1000:9.1f} ms")
+        fragment = time_click(AppTest.from_function(reminder_fragment, default_timeout=600), lambda app: None, args.repeat)
+        print(f"  individual reminders fragment    {fragment * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Bulk writes through an instrumented DatabaseManager must cost about what they do without it.
+
+Statement tracing for the Performance page used to record every trigger
+statement of a multi-row INSERT with the whole statement text, which grows
+with the square of the batch size. Times ``add_patients_bulk`` (FTS5,
+change log and cache generation triggers) and ``add_appointments_bulk`` with
+and without ``instrument_database``, and measures the statement text the
+slow call log keeps. Fails (exit status 1) if instrumentation more than doubles the
+time or keeps more than ``--max-mb``.
+
+    python -m benchmarks.check_instrumented_writes --rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from clinic_app import Appointment, DatabaseManager, Doctor, Patient
+from clinic_app.metrics import SlowCallLog, instrument_database
+
+
+def bulk_writes(db, rows, first_day):
+    doctor_id = db.add_doctor(Doctor("Check Doctor", "+19870000000", "check@clinic.com", "Cardiology"))
+    patient_ids = db.add_patients_bulk(
+        Patient(f"Patient {n}", f"+1555{n:07d}", f"p{n}@mail.com", "") for n in range(rows)
+    )
+    start = datetime.now() + timedelta(days=first_day)
+    db.add_appointments_bulk(
+        Appointment(patient_ids[n], doctor_id, (start + timedelta(minutes=30 * n)).strftime('%Y-%m-%d %H:%M:%S'),
+                    "Consultation", "scheduled", False)
+        for n in range(rows)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--max-mb", type=float, default=5.0)
+    args = parser.parse_args()
+
+    seconds = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, wrap in (("plain", None), ("instrumented", instrument_database)):
+            db = DatabaseManager(os.path.join(tmp, f"{label}.db"), cache_size=0)
+            slow_calls = SlowCallLog()
+            if wrap:
+                wrap(db, slow_calls)
+            start = time.perf_counter()
+            bulk_writes(db, args.rows, 400)
+            seconds[label] = time.perf_counter() - start
+            kept = sum(len(sql) for _, _, _, statements in slow_calls.slowest() for sql in statements)
+            db.close()
+            print(f"  {label:<13} {args.rows} patients + appointments  {seconds[label]:6.2f} s  "
+                  f"slow call log {kept / 1e6:6.2f} MB")
+    ratio = seconds["instrumented"] / seconds["plain"]
+    failed = ratio > 2 or kept / 1e6 > args.max_mb
+    print(f"[{'FAIL' if failed else 'ok':>4}] instrumented / plain = {ratio:.2f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
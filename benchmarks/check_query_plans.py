@@ -0,0 +1,145 @@
+"""EXPLAIN QUERY PLAN regression check for DatabaseManager queries.
+
+Each DatabaseManager method below is run against a small scratch database
+with a trace callback attached, and every query it issues (SELECTs and the
+lookups inside UPDATE/DELETE/INSERT ... SELECT) is explained.
+The check fails (exit status 1) if a plan falls back to a full table SCAN.
+Methods that return a whole table by design may scan it, but only in index
+order, so that at least the ORDER BY is served without a sort.
+
+    python -m benchmarks.check_query_plans
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+from clinic_app import Patient, Doctor, Appointment, DatabaseManager, ReminderJob, DispatchResult
+
+
+class TracingDatabaseManager(DatabaseManager):
+    def __init__(self, *args, **kwargs):
+        self.statements = []
+        super().__init__(*args, **kwargs)
+
+    @contextmanager
+    def _connection(self):
+        with super()._connection() as conn:
+            conn.set_trace_callback(self.statements.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+
+def seed(db):
+    doctor_id = db.add_doctor(Doctor("Sarah Smith", "+1987654321", "dr.smith@clinic.com", "Cardiology"))
+    patient_id = db.add_patient(Patient("John Doe", "+1234567890", "john@email.com", "+1234567890"))
+    when = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+    appointment_id = db.add_appointment(
+        Appointment(patient_id, doctor_id, when, "Consultation", "scheduled", False)
+    )
+    db.log_reminder(appointment_id, "SMS", "sent")
+    return appointment_id
+
+
+def outbox_round_trip(db, appointment_id):
+    db.enqueue_reminders([ReminderJob(appointment_id, "Email", "john@email.com", "Reminder")], "7d")
+    db.count_pending_reminders("7d", "Email")
+    db.get_reminder_state(appointment_id, "Email", "7d")
+    jobs = db.claim_reminders("plans", 10, "7d", "Email")
+    db.complete_reminders([DispatchResult(job, False, 1, "timeout") for job in jobs], "7d")
+    db.requeue_failed_reminders()
+
+
+# (method name, call, may scan in index order: whole-table listings, and
+# pages/counts whose scan is bounded by LIMIT or answered from an index)
+QUERIES = [
+    ("get_patients", lambda db: db.get_patients(), True),
+    ("get_doctors", lambda db: db.get_doctors(), True),
+    ("search_patients (name)", lambda db: db.search_patients("jo do"), False),
+    ("search_patients (phone)", lambda db: db.search_patients("(123) 456"), False),
+    ("get_appointments", lambda db: db.get_appointments(), True),
+    ("get_appointments_page", lambda db: db.get_appointments_page(50, after=(4102444800, 1)), True),
+    ("get_appointments_page (filtered)",
+     lambda db: db.get_appointments_page(50, status="scheduled", doctor_id=1,
+                                         start_date=date.today(), end_date=date.today()), False),
+    ("count_appointments", lambda db: db.count_appointments(), False),
+    ("count_appointments (filtered)", lambda db: db.count_appointments(status="scheduled"), False),
+    ("get_upcoming_appointments", lambda db: db.get_upcoming_appointments(days_ahead=7), False),
+    ("get_upcoming_appointments page", lambda db: db.get_upcoming_appointments(days_ahead=7, limit=20, offset=40), False),
+    ("get_dashboard_summary", lambda db: db.get_dashboard_summary(), False),
+    ("get_recent_appointments", lambda db: db.get_recent_appointments(5), True),
+    ("find_conflicts", lambda db: db.find_conflicts(1, datetime.now(), 30), False),
+    ("find_free_slots", lambda db: db.find_free_slots(1, count=5), False),
+    ("check_appointments_bulk", lambda db: db.check_appointments_bulk(
+        [Appointment(1, 1, datetime.now(), "Consultation", "scheduled", False)]), False),
+    ("get_working_hours", lambda db: db.get_working_hours(1), False),
+    ("get_appointment_stats", lambda db: db.get_appointment_stats(), True),
+    ("reminder outbox", lambda db: outbox_round_trip(db, 1), False),
+    ("log_reminders_bulk", lambda db: db.log_reminders_bulk([(1, "SMS", "sent")]), False),
+    ("acquire_lock", lambda db: db.acquire_lock("plans", "owner", 60), False),
+    ("release_lock", lambda db: db.release_lock("plans", "owner"), False),
+    ("archive_rows (reminder_log)",
+     lambda db: db.archive_rows("reminder_log", datetime.now(timezone.utc) - timedelta(days=365), list), False),
+    ("archive_rows (appointments)",
+     lambda db: db.archive_rows("appointments", datetime.now(timezone.utc) - timedelta(days=365), list), False),
+    ("read_changes", lambda db: db.read_changes(db.last_change_seq() - 10, 10, ["appointments", "patients"]), False),
+    ("get_changed_upcoming_appointments", lambda db: db.get_changed_upcoming_appointments(7, [1, 2], [1], [1]), False),
+    ("save_change_checkpoint", lambda db: db.save_change_checkpoint("plans", 1), False),
+    ("get_change_checkpoint", lambda db: db.get_change_checkpoint("plans"), False),
+    ("prune_changes", lambda db: db.prune_changes(), False),
+]
+
+
+def plan_violations(conn, sql, full_listing):
+    violations = []
+    for _, _, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        if not detail.startswith("SCAN ") or detail == "SCAN CONSTANT ROW":
+            continue
+        # One row per AUTOINCREMENT table, read back by the *_bulk inserts
+        if detail == "SCAN sqlite_sequence":
+            continue
+        # Id lists bound as JSON, and the CTE of ids built from them, are the (small) input
+        if detail.startswith("SCAN json_each ") or detail == "SCAN changed":
+            continue
+        if full_listing and " USING " in detail and "INDEX" in detail:
+            continue
+        # R*Tree lookups show their constraints after the index number; none means a full scan
+        if " VIRTUAL TABLE INDEX " in detail and not detail.endswith(":"):
+            continue
+        # The WITHOUT ROWID rollup is stored in primary key order and is small by design
+        if full_listing and detail == "SCAN appointment_monthly_stats":
+            continue
+        violations.append(detail)
+    return violations
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TracingDatabaseManager(os.path.join(tmp, "plans.db"), pool_size=1, cache_size=0)
+        # No ANALYZE: without sqlite_stat1 the planner assumes large tables,
+        # which is what the app itself runs with.
+        seed(db)
+        for name, call, full_listing in QUERIES:
+            db.statements.clear()
+            call(db)
+            queries = [sql for sql in db.statements
+                       if sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT"))]
+            with db._connection() as conn:
+                violations = [detail for sql in queries for detail in plan_violations(conn, sql, full_listing)]
+            print(f"[{'FAIL' if violations else 'ok':>4}] {name}")
+            for detail in violations:
+                print(f"         {detail}")
+            failures += bool(violations)
+        db.close()
+
+    if failures:
+        print(f"{failures} method(s) fall back to a table scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Deterministic synthetic clinic data for the benchmark suite.
+
+Fills a database with ``doctors`` doctors (with working hours),
+``patients`` patients and ``appointments`` appointments spread over the
+year before ``anchor`` and the eight weeks after it, through the bulk
+APIs. Every past appointment gets a reminder_log entry in the legacy
+window, as history from before the outbox would have. The same seed,
+sizes and anchor date always give the same rows.
+
+    python -m benchmarks.datagen clinic-1m.db --scale 1m
+    python -m benchmarks.datagen clinic.db --doctors 50 --patients 20000 --appointments 200000
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from clinic_app import Appointment, DatabaseManager, Doctor, Patient, WorkingHours
+
+# (doctors, patients, appointments) per named scale
+SCALES = {
+    "10k": (10, 1_000, 10_000),
+    "1m": (200, 100_000, 1_000_000),
+    "10m": (1_000, 1_000_000, 10_000_000),
+}
+
+CHUNK = 200_000
+PAST_DAYS = 365
+FUTURE_DAYS = 56
+SPECIALTIES = ["General Practice", "Cardiology", "Dermatology", "Pediatrics", "Orthopedics", "Neurology"]
+APPOINTMENT_TYPES = ["Consultation", "Follow-up", "Check-up", "Emergency"]
+PAST_STATUSES = (["completed", "missed", "cancelled"], [0.8, 0.1, 0.1])
+PREFERENCES = ["", "", "", "SMS", "Email", "WhatsApp", "Email,SMS", "WhatsApp,SMS", "SMS,Email,WhatsApp"]
+CHANNELS = (["SMS", "Email", "WhatsApp"], [0.5, 0.3, 0.2])
+LOG_STATUSES = (["sent", "failed"], [0.95, 0.05])
+
+
+def _chunks(total):
+    for start in range(0, total, CHUNK):
+        yield start, min(total, start + CHUNK)
+
+
+def generate(db_path, doctors, patients, appointments, seed=0, anchor=None, on_progress=None):
+    """Fill ``db_path`` and return {table: rows written}."""
+    rng = np.random.default_rng(seed)
+    anchor = datetime.combine(anchor or date.today(), datetime.min.time())
+    db = DatabaseManager(db_path, cache_size=0)
+    try:
+        doctor_ids = db.add_doctors_bulk(
+            Doctor(f"Doctor {n}", f"+1987{n:07d}", f"doctor.{n}@clinic.com", SPECIALTIES[n % len(SPECIALTIES)])
+            for n in range(doctors)
+        )
+        for doctor_id in doctor_ids:
+            db.set_working_hours(doctor_id, [WorkingHours(doctor_id, day, "09:00", "17:00") for day in range(5)])
+
+        patient_ids = []
+        for start, end in _chunks(patients):
+            preferences = rng.choice(PREFERENCES, end - start)
+            patient_ids += db.add_patients_bulk(
+                Patient(f"Patient {n}", f"+1555{n:07d}", f"patient.{n}@mail.com",
+                        f"+1555{n:07d}" if n % 4 else "", preference)
+                for n, preference in zip(range(start, end), preferences)
+            )
+            if on_progress:
+                on_progress("patients", end)
+        patient_ids = np.asarray(patient_ids)
+        doctor_ids = np.asarray(doctor_ids)
+
+        logged = 0
+        for start, end in _chunks(appointments):
+            size = end - start
+            # Quarter-hour start times between 08:00 and 17:45
+            days = rng.integers(-PAST_DAYS, FUTURE_DAYS, size)
+            minutes = rng.integers(32, 72, size) * 15
+            past = days < 0
+            statuses = np.where(past, rng.choice(PAST_STATUSES[0], size, p=PAST_STATUSES[1]), "scheduled")
+            rows = zip(
+                rng.choice(patient_ids, size).tolist(), rng.choice(doctor_ids, size).tolist(),
+                days.tolist(), minutes.tolist(), rng.choice(APPOINTMENT_TYPES, size).tolist(),
+                statuses.tolist(), (rng.random(size) < 0.2).tolist(),
+            )
+            appointment_ids = np.asarray(db.add_appointments_bulk(
+                Appointment(patient_id, doctor_id,
+                            (anchor + timedelta(days=day, minutes=minute)).strftime('%Y-%m-%d %H:%M:%S'),
+                            appointment_type, status, follow_up)
+                for patient_id, doctor_id, day, minute, appointment_type, status, follow_up in rows
+            ))
+            # Reminder history for appointments that have already happened, logged
+            # as sent before the outbox existed
+            history = appointment_ids[past]
+            db.log_reminders_bulk(zip(
+                history.tolist(),
+                rng.choice(CHANNELS[0], len(history), p=CHANNELS[1]).tolist(),
+                rng.choice(LOG_STATUSES[0], len(history), p=LOG_STATUSES[1]).tolist(),
+            ), reminder_window="legacy")
+            logged += len(history)
+            if on_progress:
+                on_progress("appointments", end)
+    finally:
+        db.close()
+    return {"doctors": doctors, "patients": patients, "appointments": appointments, "reminder_log": logged}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db_path")
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--doctors", type=int)
+    parser.add_argument("--patients", type=int)
+    parser.add_argument("--appointments", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--anchor", type=date.fromisoformat, help="YYYY-MM-DD the data is centred on (default today)")
+    args = parser.parse_args()
+
+    doctors, patients, appointments = SCALES[args.scale]
+    start = time.perf_counter()
+    counts = generate(
+        args.db_path, args.doctors or doctors, args.patients or patients, args.appointments or appointments,
+        seed=args.seed, anchor=args.anchor,
+        on_progress=lambda table, rows: print(f"  {table}: {rows}", flush=True),
+    )
+    print(f"{args.db_path}: {counts} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
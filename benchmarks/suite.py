@@ -0,0 +1,382 @@
+"""Benchmark suite: every DatabaseManager method, page data loads and reminder dispatch.
+
+Generates (or reuses) a ``benchmarks.datagen`` database for the chosen
+scale, times each case on a scratch copy with the query cache off, writes
+the results as JSON and compares them with a saved baseline. A case is a
+regression when its fastest run is more than ``--tolerance`` slower than
+the baseline's fastest run and at least ``--min-delta`` seconds slower;
+any regression makes the exit status 1. The fastest run is compared
+because scheduler and cache noise only ever add time, so it moves far
+less between runs than the median does.
+
+Whole-table listings are skipped on tables above ``--max-listing-rows``,
+since they would only measure how long it takes to run out of memory.
+Dispatch goes through the mock HTTP gateway and SMTP server with rate
+limits lifted, so it times our side of delivery.
+
+    python -m benchmarks.suite --scale 10k
+    python -m benchmarks.suite --scale 1m --output results.json
+    python -m benchmarks.suite --scale 10k --save-baseline
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from benchmarks.datagen import SCALES, generate
+from clinic_app import (
+    Appointment, ChannelLimits, DatabaseManager, DispatchResult, Doctor, Patient, ReminderDispatcher, ReminderJob,
+    WorkingHours, drain_outbox, plan_reminder_jobs,
+)
+from clinic_app.page_limits import (
+    APPOINTMENTS_PAGE_SIZE, DASHBOARD_UPCOMING_LIMIT, FREE_SLOT_CHOICES, PATIENT_SEARCH_RESULTS,
+)
+from clinic_app.providers import HttpProvider, ProviderService, SmtpProvider
+from clinic_app.providers.mock import MockGatewayServer, MockSmtpServer
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+LIFTED = ChannelLimits(concurrency=16, rate_per_second=1e9, burst=1_000_000)
+
+_windows = itertools.count()
+
+
+def new_window():
+    # A reminder window nothing has been sent for yet
+    return f"bench-{os.getpid()}-{next(_windows)}"
+
+
+def fixture(db):
+    """Ids and values the cases reuse, looked up once per run."""
+    with db.pool.connection() as conn:
+        doctor_id, = conn.execute("SELECT MIN(id) FROM doctors").fetchone()
+        patient_id, = conn.execute("SELECT MIN(id) FROM patients").fetchone()
+        appointment_id, appointment_date = conn.execute(
+            "SELECT id, appointment_date FROM appointments ORDER BY appointment_ts DESC, id DESC LIMIT 1"
+        ).fetchone()
+        recent_ids = [row[0] for row in conn.execute("SELECT id FROM appointments ORDER BY id DESC LIMIT 1000")]
+        rows = {table: conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+                for table in ("patients", "doctors", "appointments", "reminder_log")}
+    page = db.get_appointments_page(50)
+    return SimpleNamespace(
+        doctor_id=doctor_id, patient_id=patient_id, appointment_id=appointment_id,
+        appointment_date=appointment_date, rows=rows,
+        cursor=(page['appointment_ts'].iloc[-1], page['id'].iloc[-1]),
+        start_date=date.today() - timedelta(days=30), end_date=date.today(),
+        jobs=[ReminderJob(recent_id, "Email", f"bench.{recent_id}@mail.com", "Reminder", "Appointment Reminder")
+              for recent_id in recent_ids],
+        owner=f"bench:{os.getpid()}",
+    )
+
+
+def _outbox_round_trip(db, data, claim=None, complete=False):
+    # Enqueue up to 1000 jobs under a fresh window, then optionally claim and complete them
+    window = new_window()
+    db.enqueue_reminders(data.jobs, window)
+    if claim:
+        jobs = db.claim_reminders(data.owner, claim, window)
+        if complete:
+            db.complete_reminders([DispatchResult(job, True, 1) for job in jobs], window)
+    return window
+
+
+def _consume(iterator):
+    for _ in iterator:
+        pass
+
+
+def _new_patients(n):
+    return [Patient(f"Bench Patient {n}-{i}", "+15550000000", f"bench.{n}.{i}@mail.com", "") for i in range(1000)]
+
+
+_batches = itertools.count()
+
+# (name, table a whole-table listing reads or None, call). Each call may
+# write; writes only add rows, so later cases see at most a few more.
+METHOD_CASES = [
+    ("get_patients", "patients", lambda db, data: db.get_patients()),
+    ("get_doctors", "doctors", lambda db, data: db.get_doctors()),
+    ("get_appointments", "appointments", lambda db, data: db.get_appointments()),
+    ("iter_table", None, lambda db, data: _consume(db.iter_table("appointments"))),
+    ("get_table_columns", None, lambda db, data: db.get_table_columns("appointments")),
+    ("search_patients", None, lambda db, data: db.search_patients("patient 12")),
+    ("get_appointments_page", None, lambda db, data: db.get_appointments_page(50)),
+    ("get_appointments_page (next)", None, lambda db, data: db.get_appointments_page(50, after=data.cursor)),
+    ("get_appointments_page (filtered)", None, lambda db, data: db.get_appointments_page(
+        50, status="completed", doctor_id=data.doctor_id, start_date=data.start_date, end_date=data.end_date)),
+    ("count_appointments", None, lambda db, data: db.count_appointments()),
+    ("count_appointments (filtered)", None, lambda db, data: db.count_appointments(
+        status="completed", start_date=data.start_date, end_date=data.end_date)),
+    ("get_dashboard_summary", None, lambda db, data: db.get_dashboard_summary()),
+    ("get_recent_appointments", None, lambda db, data: db.get_recent_appointments(5)),
+    ("get_upcoming_appointments", None, lambda db, data: db.get_upcoming_appointments()),
+    ("get_upcoming_appointments (page)", None, lambda db, data: db.get_upcoming_appointments(limit=20, offset=20)),
+    ("get_appointment_stats", None, lambda db, data: db.get_appointment_stats()),
+    ("find_conflicts", None, lambda db, data: db.find_conflicts(data.doctor_id, data.appointment_date)),
+    ("find_free_slots", None, lambda db, data: db.find_free_slots(data.doctor_id)),
+    ("get_working_hours", None, lambda db, data: db.get_working_hours(data.doctor_id)),
+    ("set_working_hours", None, lambda db, data: db.set_working_hours(
+        data.doctor_id, [WorkingHours(data.doctor_id, day, "09:00", "17:00") for day in range(5)])),
+    ("add_patient", None, lambda db, data: db.add_patient(
+        Patient("Bench Patient", "+15550000000", "bench@mail.com", "+15550000000"))),
+    ("add_doctor", None, lambda db, data: db.add_doctor(
+        Doctor("Bench Doctor", "+19870000000", "bench@clinic.com", "Cardiology"))),
+    ("add_appointment", None, lambda db, data: db.add_appointment(Appointment(
+        data.patient_id, data.doctor_id,
+        (datetime.now() + timedelta(days=400 + next(_batches))).strftime('%Y-%m-%d %H:%M:%S'), "Consultation", "scheduled", False,
+    ), check_conflicts=True)),
+    ("add_patients_bulk (1000)", None, lambda db, data: db.add_patients_bulk(_new_patients(next(_batches)))),
+    ("add_doctors_bulk (1000)", None, lambda db, data: db.add_doctors_bulk(
+        Doctor(f"Bench Doctor {n}", "+19870000000", "bench@clinic.com", "Cardiology") for n in range(1000))),
+    ("add_appointments_bulk (1000)", None, lambda db, data: db.add_appointments_bulk(
+        Appointment(data.patient_id, data.doctor_id,
+                    (datetime.now() + timedelta(days=500, minutes=n)).strftime('%Y-%m-%d %H:%M:%S'),
+                    "Consultation", "scheduled", False) for n in range(1000))),
+    ("check_appointments_bulk (1000)", None, lambda db, data: db.check_appointments_bulk(
+        Appointment(data.patient_id, data.doctor_id,
+                    (datetime.now() + timedelta(days=500, minutes=30 * n)).strftime('%Y-%m-%d %H:%M:%S'),
+                    "Consultation", "scheduled", False) for n in range(1000))),
+    ("log_reminder", None, lambda db, data: db.log_reminder(data.appointment_id, "SMS", "sent")),
+    ("log_reminders_bulk (1000)", None, lambda db, data: db.log_reminders_bulk(
+        (data.appointment_id, "SMS", "sent") for _ in range(1000))),
+    ("enqueue_reminders (1000)", None, lambda db, data: _outbox_round_trip(db, data)),
+    ("enqueue + claim_reminders (1000)", None, lambda db, data: _outbox_round_trip(db, data, claim=1000)),
+    ("enqueue + claim + complete_reminders (1000)", None,
+     lambda db, data: _outbox_round_trip(db, data, claim=1000, complete=True)),
+    ("count_pending_reminders", None, lambda db, data: db.count_pending_reminders()),
+    ("get_reminder_state", None, lambda db, data: db.get_reminder_state(1, "Email", "7d")),
+    ("requeue_failed_reminders", None, lambda db, data: db.requeue_failed_reminders()),
+    ("acquire_lock + release_lock", None, lambda db, data: (
+        db.acquire_lock("bench", data.owner, 60), db.release_lock("bench", data.owner))),
+    ("init_database", None, lambda db, data: db.init_database()),
+    # Retention with nothing past the horizon: one walk of each table's primary key
+    ("archive_rows (nothing due)", None, lambda db, data: [
+        db.archive_rows(table, datetime.now(timezone.utc) - timedelta(days=3650), list)
+        for table in ("reminder_log", "appointments")]),
+    ("compact", None, lambda db, data: db.compact()),
+    ("read_changes (1000)", None, lambda db, data: db.read_changes(db.last_change_seq() - 1000)),
+    ("get_changed_upcoming_appointments (1000 ids)", None, lambda db, data: db.get_changed_upcoming_appointments(
+        7, [job.appointment_id for job in data.jobs], [data.patient_id], [data.doctor_id])),
+    ("save + get_change_checkpoint", None, lambda db, data: (
+        db.save_change_checkpoint("bench", db.last_change_seq()), db.get_change_checkpoint("bench"))),
+    ("prune_changes", None, lambda db, data: db.prune_changes()),
+]
+
+# Methods timed together with another one
+COVERED_ELSEWHERE = {
+    "acquire_lock", "release_lock", "claim_reminders", "complete_reminders", "close",
+    "last_change_seq", "save_change_checkpoint", "get_change_checkpoint",
+}
+
+
+def dashboard_page(db, data):
+    db.get_dashboard_summary(days_ahead=7)
+    db.get_recent_appointments(5)
+    db.get_upcoming_appointments(days_ahead=7, limit=DASHBOARD_UPCOMING_LIMIT)
+
+
+def appointments_page(db, data):
+    # Schedule form, then the first page of the list
+    db.get_dashboard_summary()
+    db.get_doctors()
+    db.search_patients("patient 12", limit=PATIENT_SEARCH_RESULTS)
+    db.find_free_slots(data.doctor_id, count=FREE_SLOT_CHOICES)
+    db.get_doctors()
+    db.count_appointments()
+    db.get_appointments_page(APPOINTMENTS_PAGE_SIZE)
+
+
+def analytics_page(db, data):
+    stats_df = db.get_appointment_stats()
+    stats_df.groupby('status', observed=True)['appointments'].sum().sort_values(ascending=False)
+    stats_df.groupby('doctor_name', observed=True)['appointments'].sum().sort_values(ascending=False)
+    stats_df.groupby('month')['appointments'].sum()
+
+
+PAGE_CASES = [
+    ("page: Dashboard", None, dashboard_page),
+    ("page: Appointments", None, appointments_page),
+    ("page: Analytics", None, analytics_page),
+]
+
+
+def dispatch_end_to_end(db, gateway, smtp):
+    """{stage: seconds} for one scheduler pass over the next week, into a fresh window."""
+    service = ProviderService({
+        "WhatsApp": HttpProvider(gateway.url("whatsapp"), batch_size=100),
+        "SMS": HttpProvider(gateway.url("sms"), batch_size=100),
+        "Email": SmtpProvider("127.0.0.1", smtp.port, starttls=False, batch_size=50),
+    })
+    dispatcher = ReminderDispatcher(service, limits={channel: LIFTED for channel in ("WhatsApp", "SMS", "Email")},
+                                    backoff=0.01)
+    window = new_window()
+    stages = {}
+    start = time.perf_counter()
+    upcoming_df = db.get_upcoming_appointments(days_ahead=7)
+    stages["dispatch: load upcoming"] = time.perf_counter() - start
+    mark = time.perf_counter()
+    jobs = plan_reminder_jobs(upcoming_df)
+    stages["dispatch: plan jobs"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+    db.enqueue_reminders(jobs, window)
+    stages["dispatch: enqueue"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+    results = drain_outbox(db, dispatcher, f"bench:{os.getpid()}", window)
+    stages["dispatch: drain outbox"] = time.perf_counter() - mark
+    stages["dispatch: end to end"] = time.perf_counter() - start
+    dispatcher.close()
+    if len(results) != len(jobs):
+        raise RuntimeError(f"Dispatched {len(results)} of {len(jobs)} reminders")
+    return stages, len(jobs)
+
+
+def time_case(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return {"median": statistics.median(timings), "min": min(timings), "runs": repeat}
+
+
+def run(db_path, repeat, max_listing_rows, on_result=None):
+    """{case name: timings} for the database at ``db_path`` (which it writes to)."""
+    db = DatabaseManager(db_path, cache_size=0)
+    results = {}
+    try:
+        data = fixture(db)
+        for name, table, call in METHOD_CASES + PAGE_CASES:
+            if table and data.rows[table] > max_listing_rows:
+                results[name] = {"skipped": f"{table} has {data.rows[table]} rows"}
+            else:
+                results[name] = time_case(lambda: call(db, data), repeat)
+            if on_result:
+                on_result(name, results[name])
+
+        stages = {}
+        with MockGatewayServer() as gateway, MockSmtpServer() as smtp:
+            for _ in range(repeat):
+                timings, jobs = dispatch_end_to_end(db, gateway, smtp)
+                for stage, seconds in timings.items():
+                    stages.setdefault(stage, []).append(seconds)
+        for stage, timings in stages.items():
+            results[stage] = {"median": statistics.median(timings), "min": min(timings), "runs": repeat, "jobs": jobs}
+            if on_result:
+                on_result(stage, results[stage])
+    finally:
+        db.close()
+    return results, data.rows
+
+
+def uncovered_methods():
+    """Public DatabaseManager methods with no case of their own."""
+    names = {name.split(" ")[0] for name, _, _ in METHOD_CASES}
+    return sorted(
+        name for name in dir(DatabaseManager)
+        if not name.startswith("_") and callable(getattr(DatabaseManager, name))
+        and name not in names | COVERED_ELSEWHERE
+    )
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """[(case, baseline fastest run, new fastest run)] for the cases that got slower beyond both thresholds."""
+    regressions = []
+    for name, timing in results.items():
+        before = baseline.get(name, {})
+        if "min" in timing and "min" in before:
+            if timing["min"] > before["min"] * (1 + tolerance) and timing["min"] - before["min"] > min_delta:
+                regressions.append((name, before["min"], timing["min"]))
+    return regressions
+
+
+def prepare(scale, data_dir, seed):
+    # Generated databases are cached per scale, seed and day (upcoming is relative to today)
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"clinic-{scale}-seed{seed}-{date.today():%Y%m%d}.db")
+    if not os.path.exists(path):
+        print(f"Generating {scale} data in {path}...", flush=True)
+        generate(path + ".tmp", *SCALES[scale], seed=seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "clinic-bench"))
+    parser.add_argument("--output", help="results JSON (default results-<scale>.json)")
+    parser.add_argument("--baseline", help="baseline JSON (default benchmarks/baselines/<scale>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.002)
+    parser.add_argument("--max-listing-rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    source = prepare(args.scale, args.data_dir, args.seed)
+    with tempfile.TemporaryDirectory(dir=args.data_dir) as tmp:
+        # Cases write, so each run gets its own copy of the generated data
+        db_path = os.path.join(tmp, "clinic.db")
+        shutil.copyfile(source, db_path)
+        print(f"{args.scale}: median and fastest of {args.repeat} runs")
+        results, rows = run(
+            db_path, args.repeat, args.max_listing_rows,
+            on_result=lambda name, timing: print(
+                f"  {name:<44} " + (f"{timing['median'] * 1000:10.2f} ms {timing['min'] * 1000:10.2f} ms"
+                                    if "median" in timing
+                                    else f"  skipped ({timing['skipped']})"), flush=True),
+        )
+    missing = uncovered_methods()
+    if missing:
+        print(f"No case for: {', '.join(missing)}")
+
+    report = {
+        "scale": args.scale,
+        "seed": args.seed,
+        "rows": rows,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                        "platform": platform.platform(), "processor": platform.machine()},
+        "results": results,
+    }
+    output = args.output or f"results-{args.scale}.json"
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+    baseline_path = args.baseline or os.path.join(BASELINES, f"{args.scale}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        shutil.copyfile(output, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+        return
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    if baseline["scale"] != args.scale:
+        sys.exit(f"Baseline {baseline_path} is for scale {baseline['scale']}, not {args.scale}")
+    regressions = compare(results, baseline["results"], args.tolerance, args.min_delta)
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({after / before:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    new = [name for name, timing in results.items() if "min" in timing and name not in baseline["results"]]
+    if new:
+        print(f"Not in the baseline: {', '.join(new)}")
+    print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%}, "
+          f"min delta {args.min_delta * 1000:g} ms)")
+
+
+if __name__ == "__main__":
+    main()
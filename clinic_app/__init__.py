@@ -0,0 +1,38 @@
+"""Clinic scheduling and reminder core, usable without Streamlit.
+
+Names are imported on first use, so ``from clinic_app import Patient`` or
+``ReminderService`` doesn't pay for pandas and the database layer.
+"""
+import importlib
+
+_EXPORTS = {
+    "Patient": "clinic_app.models",
+    "Doctor": "clinic_app.models",
+    "Appointment": "clinic_app.models",
+    "WorkingHours": "clinic_app.models",
+    "SlotConflictError": "clinic_app.availability",
+    "ConnectionPool": "clinic_app.database",
+    "DatabaseManager": "clinic_app.database",
+    "ReminderService": "clinic_app.reminders",
+    "ReminderJob": "clinic_app.dispatch",
+    "DispatchResult": "clinic_app.dispatch",
+    "ChannelLimits": "clinic_app.dispatch",
+    "ReminderDispatcher": "clinic_app.dispatch",
+    "build_reminder_jobs": "clinic_app.dispatch",
+    "plan_reminder_jobs": "clinic_app.dispatch",
+    "drain_outbox": "clinic_app.dispatch",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'clinic_app' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,180 @@
+"""Retention: move old reminder_log (and finished appointment) rows out to Parquet.
+
+    python -m clinic_app.archive run --db clinic_app.db --dir archive --older-than 365 --appointments
+    python -m clinic_app.archive query reminder_log --dir archive --where appointment_id=42
+
+``run`` moves ``reminder_log`` rows sent before the horizon, and with
+``--appointments`` completed or cancelled appointments that took place
+before it, prunes the change log, then compacts the database file. Run it from cron or a
+systemd timer. Archives are partitioned by month, e.g.
+``archive/reminder_log/month=2025-05/part-000000000001-000000010000.parquet``,
+and each file is named after the ids it holds, so re-running a batch that
+was interrupted after its file was written replaces the file instead of
+duplicating it. ``ArchiveReader`` reads them back for audits without
+touching the database. Appointment rollups for the Analytics page keep
+counting archived appointments.
+"""
+import argparse
+import functools
+import operator
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from clinic_app.bulk_io import _arrow_array, _arrow_schema
+from clinic_app.database import DatabaseManager
+
+# Archivable tables and the column their month partition is taken from
+PARTITION_COLUMNS = {"reminder_log": "sent_date", "appointments": "appointment_date"}
+
+
+@dataclass
+class ArchiveReport:
+    rows: dict = field(default_factory=dict)  # table -> rows moved
+    files: int = 0
+    changes_pruned: int = 0
+    bytes_freed: int = 0
+    seconds: float = 0.0
+
+
+class _PartitionWriter:
+    # Sink for DatabaseManager.archive_rows: one Parquet file per month in each batch
+    def __init__(self, directory, table, schema):
+        self.directory = os.path.join(directory, table)
+        self.schema = schema
+        self.month_column = schema.get_field_index(PARTITION_COLUMNS[table])
+        self.id_column = schema.get_field_index("id")
+        self.files = 0
+
+    def write(self, rows):
+        months = {}
+        for row in rows:
+            months.setdefault(str(row[self.month_column])[:7], []).append(row)
+        for month, group in months.items():
+            columns = list(zip(*group))
+            table = pa.Table.from_arrays(
+                [_arrow_array(values, column.type) for values, column in zip(columns, self.schema)],
+                schema=self.schema,
+            )
+            partition = os.path.join(self.directory, f"month={month}")
+            os.makedirs(partition, exist_ok=True)
+            name = f"part-{group[0][self.id_column]:012d}-{group[-1][self.id_column]:012d}.parquet"
+            # Written aside and renamed, so a crash never leaves a half-written file behind
+            # (readers skip names starting with "_")
+            pq.write_table(table, os.path.join(partition, f"_{name}"))
+            os.replace(os.path.join(partition, f"_{name}"), os.path.join(partition, name))
+            self.files += 1
+
+
+def archive(db, directory, older_than_days=365, appointments=False, batch_size=10000, vacuum=True, now=None):
+    """Move rows older than ``older_than_days`` into Parquet under ``directory``, then compact the database."""
+    start = time.perf_counter()
+    before = (now or datetime.now(timezone.utc)) - timedelta(days=older_than_days)
+    report = ArchiveReport()
+    for table in ("reminder_log", "appointments") if appointments else ("reminder_log",):
+        writer = _PartitionWriter(directory, table, _arrow_schema(db, table))
+        report.rows[table] = db.archive_rows(table, before, writer.write, batch_size)
+        report.files += writer.files
+    # Change-log entries every consumer has read, including the deletes just logged if none are registered
+    report.changes_pruned = db.prune_changes()
+    if vacuum:
+        report.bytes_freed = db.compact()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+class ArchiveReader:
+    """Read-only access to the archived rows under ``directory``."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def tables(self):
+        return [table for table in PARTITION_COLUMNS if os.path.isdir(os.path.join(self.directory, table))]
+
+    def months(self, table):
+        """The archived months of ``table``, as "YYYY-MM", oldest first."""
+        path = os.path.join(self.directory, table)
+        if not os.path.isdir(path):
+            return []
+        return sorted(name.partition("=")[2] for name in os.listdir(path) if name.startswith("month="))
+
+    def read(self, table, start_month=None, end_month=None, columns=None, **equals):
+        """Archived rows of ``table`` in id order, as a DataFrame.
+
+        Only the partitions from ``start_month`` to ``end_month`` ("YYYY-MM",
+        both inclusive) are opened; ``equals`` keeps rows whose columns equal
+        the given values, e.g. ``read("reminder_log", appointment_id=42)``.
+        """
+        if table not in PARTITION_COLUMNS:
+            raise ValueError(f"Unknown archive table: {table}")
+        if not self.months(table):
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(
+            os.path.join(self.directory, table), format="parquet",
+            partitioning=ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive"),
+        )
+        conditions = [ds.field(name) == value for name, value in equals.items()]
+        if start_month:
+            conditions.append(ds.field("month") >= start_month)
+        if end_month:
+            conditions.append(ds.field("month") <= end_month)
+        result = dataset.to_table(
+            columns=None if columns is None else list(dict.fromkeys(["id", *columns])),
+            filter=functools.reduce(operator.and_, conditions) if conditions else None,
+        )
+        frame = result.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+        # A batch archived twice (crash between file and commit) appears twice if its file name changed
+        frame = frame.drop_duplicates("id").sort_values("id", ignore_index=True)
+        return frame if columns is None else frame[list(columns)]
+
+
+def _condition(text):
+    name, _, value = text.partition("=")
+    return name, int(value) if value.lstrip("-").isdigit() else value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old reminder and appointment rows to Parquet.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="move rows past the horizon out of the database")
+    run.add_argument("--db", default="clinic_app.db", help="path to the clinic database")
+    run.add_argument("--dir", default="archive", help="archive directory")
+    run.add_argument("--older-than", type=int, default=365, help="retention horizon in days")
+    run.add_argument("--appointments", action="store_true",
+                     help="also archive completed and cancelled appointments")
+    run.add_argument("--batch-size", type=int, default=10000)
+    run.add_argument("--no-vacuum", action="store_true", help="skip compacting the database afterwards")
+    query = commands.add_parser("query", help="print archived rows as CSV")
+    query.add_argument("table", choices=tuple(PARTITION_COLUMNS))
+    query.add_argument("--dir", default="archive", help="archive directory")
+    query.add_argument("--from", dest="start_month", help="first month, YYYY-MM")
+    query.add_argument("--to", dest="end_month", help="last month, YYYY-MM")
+    query.add_argument("--where", action="append", default=[], type=_condition, metavar="COLUMN=VALUE")
+    args = parser.parse_args(argv)
+
+    if args.command == "query":
+        frame = ArchiveReader(args.dir).read(args.table, args.start_month, args.end_month, **dict(args.where))
+        frame.to_csv(sys.stdout, index=False)
+        return 0
+
+    db = DatabaseManager(args.db)
+    try:
+        report = archive(db, args.dir, args.older_than, args.appointments, args.batch_size, not args.no_vacuum)
+    finally:
+        db.close()
+    moved = ", ".join(f"{rows} {table}" for table, rows in report.rows.items())
+    print(f"Archived {moved} into {report.files} files in {report.seconds:.1f}s, "
+          f"pruned {report.changes_pruned} change-log entries, freed {report.bytes_freed / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Doctor availability: working-hours templates, booked intervals and free slots.
+
+Booked appointments are indexed in the ``appointment_slots`` R*Tree as
+``[start, end)`` intervals in epoch *minutes* (rtree_i32 coordinates are
+32-bit, which epoch seconds would overflow in 2038), with the doctor id
+as a second dimension. See ``DatabaseManager.find_conflicts`` and
+``DatabaseManager.find_free_slots``.
+"""
+from datetime import timedelta
+
+from clinic_app.timestamps import day_start
+
+# Used for doctors without a saved template: Monday to Friday, 09:00-17:00
+DEFAULT_WORKING_HOURS = [(weekday, 9 * 60, 17 * 60) for weekday in range(5)]
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+class SlotConflictError(ValueError):
+    """The doctor already has an appointment overlapping the requested time."""
+
+    def __init__(self, doctor_id, appointment_ids):
+        self.doctor_id = doctor_id
+        self.appointment_ids = appointment_ids
+        super().__init__(
+            f"Doctor {doctor_id} is already booked at that time "
+            f"(appointment {', '.join(map(str, appointment_ids))})"
+        )
+
+
+def clock_minutes(value):
+    """Minutes after midnight for ``"HH:MM"`` text or a ``datetime.time``; ``"24:00"`` is end of day."""
+    if hasattr(value, "hour"):
+        return value.hour * 60 + value.minute
+    hours, minutes = str(value).strip().split(":")[:2]
+    total = int(hours) * 60 + int(minutes)
+    if not 0 <= total <= 24 * 60 or not 0 <= int(minutes) < 60:
+        raise ValueError(f"Not a time of day: {value!r}")
+    return total
+
+
+def merge_intervals(intervals):
+    """Sorted, non-overlapping union of ``(start, end)`` pairs."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def iter_free_slots(working_hours, busy, first_day, days, duration, step, tz, not_before):
+    """Yield the epoch-minute start of every free ``duration``-minute slot, in order.
+
+    ``working_hours`` are ``(weekday, start minute, end minute)`` rows,
+    ``busy`` the merged booked intervals covering the searched days.
+    Candidates start every ``step`` minutes from the start of each block.
+    """
+    blocks = {}
+    for weekday, start, end in working_hours:
+        blocks.setdefault(weekday, []).append((start, end))
+    position = 0
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        for block_start, block_end in sorted(blocks.get(day.weekday(), ())):
+            for minute in range(block_start, block_end - duration + 1, step):
+                start = day_start(day, tz, minute) // 60
+                end = start + duration
+                if start < not_before:
+                    continue
+                while position < len(busy) and busy[position][1] <= start:
+                    position += 1
+                if position < len(busy) and busy[position][0] < end:
+                    continue
+                yield start
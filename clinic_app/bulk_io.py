@@ -0,0 +1,222 @@
+"""Streaming CSV/Parquet import and export for patients, doctors and appointments.
+
+    python -m clinic_app.bulk_io import patients patients.csv
+    python -m clinic_app.bulk_io export appointments appointments.parquet
+
+Imports read the file in record batches, validate each batch against the
+matching model dataclass in vectorised form and insert it with the
+``*_bulk`` DatabaseManager APIs, one transaction per batch, so memory stays
+bounded by the batch size. Exports stream the table out of SQLite with
+``fetchmany`` straight into a Parquet (or CSV) writer.
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field, fields
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from clinic_app.database import DatabaseManager
+from clinic_app.models import Patient, Doctor, Appointment
+
+MODELS = {"patients": Patient, "doctors": Doctor, "appointments": Appointment}
+
+# Values every row must carry (the NOT NULL columns and required form fields)
+REQUIRED = {
+    "patients": ("name", "phone"),
+    "doctors": ("name", "phone", "email"),
+    "appointments": ("patient_id", "doctor_id", "appointment_date"),
+}
+
+# What a missing optional column or blank value is imported as
+DEFAULTS = {
+    "patients": {"email": "", "whatsapp_number": "", "preferred_channels": ""},
+    "doctors": {"specialty": ""},
+    "appointments": {"appointment_type": "", "status": "scheduled", "follow_up_required": False, "notes": "",
+                     "duration_minutes": 30},
+}
+
+# Local date/time text, stored by DatabaseManager as UTC epoch seconds
+DATETIME_FIELDS = {"appointment_date"}
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", ""}
+
+SQLITE_TYPES = {"INTEGER": pa.int64(), "REAL": pa.float64(), "BOOLEAN": pa.bool_()}
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    imported: int = 0
+    rejected: int = 0
+    errors: list = field(default_factory=list)  # (row number, reason), first few only
+    seconds: float = 0.0
+
+
+def _check_kind(kind):
+    if kind not in MODELS:
+        raise ValueError(f"Unknown table {kind!r}; expected one of {', '.join(MODELS)}")
+
+
+def _is_parquet(name):
+    return str(name).lower().endswith((".parquet", ".pq"))
+
+
+def iter_batches(source, name=None, batch_size=100_000):
+    """Yield the file as pandas DataFrames of strings, one per record batch."""
+    if _is_parquet(name or source):
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas().astype("string[pyarrow]")
+    else:
+        # Everything as text: phone numbers must keep their leading '+' and zeros
+        for frame in pd.read_csv(source, dtype="string[pyarrow]", keep_default_na=False, chunksize=batch_size):
+            yield frame
+
+
+def validate_batch(kind, frame, db=None):
+    """Split a batch into rows ready for the model dataclass and (row, reason) rejects.
+
+    Field names, order and types come from the dataclass; integer and
+    boolean fields are parsed, everything else is kept as text. With ``db``,
+    appointments are also checked against it: the patient and doctor must
+    exist and the slot must be free (``DatabaseManager.check_appointments_bulk``).
+    """
+    model = MODELS[kind]
+    reasons = pd.Series("", index=frame.index, dtype="string[pyarrow]")
+    columns = {}
+
+    for model_field in fields(model):
+        name = model_field.name
+        if name in frame.columns:
+            values = frame[name].fillna("").str.strip()
+        elif name in DEFAULTS[kind]:
+            values = pd.Series("", index=frame.index, dtype="string[pyarrow]")
+        else:
+            raise ValueError(f"{kind} file is missing the required column {name!r}")
+
+        blank = values == ""
+        if name in REQUIRED[kind]:
+            reasons = reasons.mask(blank, reasons + f"missing {name}; ")
+
+        if model_field.type is int:
+            parsed = pd.to_numeric(values, errors="coerce")
+            invalid = ~blank & (parsed.isna() | (parsed % 1 != 0))
+            reasons = reasons.mask(invalid, reasons + f"{name} is not an integer; ")
+            values = parsed.fillna(DEFAULTS[kind].get(name, 0)).astype("int64")
+        elif model_field.type is bool:
+            lowered = values.str.lower()
+            invalid = ~lowered.isin(TRUE_VALUES | FALSE_VALUES)
+            reasons = reasons.mask(invalid, reasons + f"{name} is not a boolean; ")
+            values = lowered.isin(TRUE_VALUES)
+            if name in DEFAULTS[kind]:
+                values = values.mask(blank, DEFAULTS[kind][name])
+        elif name in DATETIME_FIELDS:
+            parsed = pd.to_datetime(values, format="ISO8601", errors="coerce", utc=True)
+            reasons = reasons.mask(~blank & parsed.isna(), reasons + f"{name} is not a date and time; ")
+        elif name in DEFAULTS[kind]:
+            values = values.mask(blank, DEFAULTS[kind][name])
+        columns[name] = values
+
+    ok = reasons == ""
+    valid = pd.DataFrame(columns)[ok]
+    rejects = list(zip(frame.index[~ok], reasons[~ok].str.rstrip("; ")))
+    if db is not None and kind == "appointments" and len(valid):
+        records = map(model, *(valid[model_field.name].tolist() for model_field in fields(model)))
+        conflicts = db.check_appointments_bulk(records)
+        rows = valid.index[[position for position, _ in conflicts]]
+        rejects = sorted(rejects + list(zip(rows, (reason for _, reason in conflicts))))
+        valid = valid.drop(rows)
+    return valid, rejects
+
+
+def import_file(db, kind, source, name=None, batch_size=100_000, max_errors=50, on_progress=None):
+    """Stream ``source`` (a path or file object) into ``kind``; returns an ``ImportReport``."""
+    _check_kind(kind)
+    model = MODELS[kind]
+    field_names = [model_field.name for model_field in fields(model)]
+    bulk_insert = getattr(db, f"add_{kind}_bulk")
+    report = ImportReport(kind)
+    start = time.perf_counter()
+    offset = 0
+
+    for frame in iter_batches(source, name, batch_size):
+        frame.index = pd.RangeIndex(offset + 1, offset + 1 + len(frame))  # 1-based data row numbers
+        offset += len(frame)
+        valid, rejects = validate_batch(kind, frame, db)
+        if len(valid):
+            records = map(model, *(valid[column].tolist() for column in field_names))
+            report.imported += len(bulk_insert(records))
+        report.rejected += len(rejects)
+        report.errors.extend(rejects[:max(0, max_errors - len(report.errors))])
+        if on_progress:
+            on_progress(report)
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _arrow_schema(db, table):
+    return pa.schema([
+        (name, SQLITE_TYPES.get(declared.upper(), pa.string()))
+        for name, declared in db.get_table_columns(table)
+    ])
+
+
+def _arrow_array(values, arrow_type):
+    # SQLite keeps BOOLEAN columns as 0/1 integers
+    if arrow_type == pa.bool_():
+        return pa.array(values, type=pa.int64()).cast(arrow_type)
+    return pa.array(values, type=arrow_type)
+
+
+def export_table(db, kind, destination, name=None, batch_size=100_000):
+    """Stream every row of ``kind`` into a Parquet or CSV file; returns the row count."""
+    _check_kind(kind)
+    schema = _arrow_schema(db, kind)
+    parquet = _is_parquet(name or destination)
+    writer = pq.ParquetWriter(destination, schema) if parquet else pa_csv.CSVWriter(destination, schema)
+    rows = 0
+    try:
+        for batch in db.iter_table(kind, batch_size):
+            columns = list(zip(*batch))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [_arrow_array(values, column.type) for values, column in zip(columns, schema)],
+                schema=schema,
+            ))
+            rows += len(batch)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export clinic data as CSV or Parquet.")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("kind", choices=tuple(MODELS))
+    parser.add_argument("path", help="CSV or Parquet file (by extension)")
+    parser.add_argument("--db", default="clinic_app.db", help="path to the clinic database")
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(args.db)
+    try:
+        if args.action == "import":
+            report = import_file(db, args.kind, args.path, batch_size=args.batch_size)
+            print(f"Imported {report.imported} {args.kind} in {report.seconds:.1f}s, rejected {report.rejected}")
+            for row, reason in report.errors:
+                print(f"  row {row}: {reason}", file=sys.stderr)
+            return 1 if report.rejected else 0
+        start = time.perf_counter()
+        rows = export_table(db, args.kind, args.path, batch_size=args.batch_size)
+        print(f"Exported {rows} {args.kind} in {time.perf_counter() - start:.1f}s")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""In-process cache for DatabaseManager read queries.
+
+Entries are tagged with the generation of every table the query reads.
+Triggers bump those generations on every write to the table, from any
+connection or process, so a lookup only hits while none of the tables has
+changed since the result was stored. Size (LRU) and age (TTL) bound the cache on top of that.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class QueryCache:
+    def __init__(self, maxsize=128, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored at, generations, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, generations):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != generations or time.monotonic() - entry[0] > self.ttl:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, generations, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), generations, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
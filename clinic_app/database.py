@@ -0,0 +1,1020 @@
+import functools
+import json
+import math
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from clinic_app.cache import MISSING, QueryCache
+from clinic_app.availability import (
+    DEFAULT_WORKING_HOURS, SlotConflictError, clock_minutes, iter_free_slots, merge_intervals,
+)
+from clinic_app.models import Patient, Doctor, Appointment, WorkingHours
+from clinic_app.dispatch import ReminderJob
+from clinic_app.frames import read_frame
+from clinic_app.migrations import migrate
+from clinic_app.timestamps import CLINIC_TIMEZONE, day_start, localize, normalize
+
+# Read-side settings, also used for read-only snapshot connections
+READ_PRAGMAS = (
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+)
+# Applied to every pooled connection. WAL lets readers run alongside a writer,
+# and synchronous=NORMAL only fsyncs at checkpoints instead of every commit.
+# auto_vacuum only takes effect on a new file (``compact`` converts old ones).
+CONNECTION_PRAGMAS = (
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+) + READ_PRAGMAS
+
+# Rows past a retention horizon, per table: WHERE clause and the cutoff as the column stores it
+RETENTION = {
+    "reminder_log": (
+        "sent_date < ?", lambda before: before.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+    ),
+    "appointments": (
+        "status IN ('completed', 'cancelled') AND appointment_ts < ?", lambda before: int(before.timestamp()),
+    ),
+}
+
+# Column values of an appointments INSERT, in column order
+_AppointmentRow = namedtuple("_AppointmentRow", (
+    "patient_id", "doctor_id", "appointment_date", "appointment_type", "status",
+    "follow_up_required", "notes", "appointment_ts", "timezone", "duration_minutes",
+))
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections.
+
+    Connections are created on demand and up to ``size`` idle ones are kept
+    around for reuse; extra connections opened under load are closed when
+    they are handed back.
+    """
+
+    def __init__(self, db_path, size=8, timeout=30.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            # Never hand a half-finished transaction to the next caller
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ReadOnlyPool(ConnectionPool):
+    """``ConnectionPool`` over a database file that is replaced, never modified, once written."""
+
+    def _connect(self):
+        # immutable: SQLite skips locking and change detection entirely
+        uri = f"{Path(self.db_path).resolve().as_uri()}?immutable=1"
+        conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+
+def _cached(*tables):
+    """Serve a read method from ``self.cache`` until one of ``tables`` is written to."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            generations = self._table_generations(tables)
+            result = self.cache.get(key, generations)
+            if result is MISSING:
+                result = method(self, *args, **kwargs)
+                self.cache.put(key, generations, result)
+            # Callers may add columns to the frame they get back, so don't hand out the cached one
+            return result.copy(deep=False) if isinstance(result, pd.DataFrame) else result
+        return wrapper
+    return decorator
+
+
+class DatabaseManager:
+    def __init__(self, db_path="clinic_app.db", pool_size=8, cache_size=128, cache_ttl=60.0,
+                 timezone=CLINIC_TIMEZONE):
+        self.db_path = db_path
+        self.timezone = ZoneInfo(timezone)
+        self.pool = ConnectionPool(db_path, size=pool_size)
+        self.cache = QueryCache(cache_size, cache_ttl)
+        self.init_database()
+        # Never writes, so its data_version moves whenever any other connection
+        # (pooled or in another process) commits
+        self._watcher = self.pool._connect()
+        self._watch_lock = threading.Lock()
+        self._data_version = None
+        self._generations = {}
+
+    def _connection(self):
+        return self.pool.connection()
+
+    def close(self):
+        self.pool.close()
+        self._watcher.close()
+
+    def _table_generations(self, tables):
+        with self._watch_lock:
+            version = self._watcher.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                self._data_version = version
+                self._generations = dict(self._watcher.execute("SELECT name, generation FROM table_generations"))
+            return tuple(self._generations.get(table, 0) for table in tables)
+
+    @staticmethod
+    def _insert_many(conn, table, columns, rows):
+        # Multi-row INSERTs, as many rows per statement as the bound-parameter
+        # limit allows; returns the ids they were given, in order. Far fewer
+        # statements than executemany, which matters most for tables whose
+        # triggers write to FTS5 (it flushes its pending terms per statement).
+        # AUTOINCREMENT hands out consecutive ids while we hold the write lock,
+        # so they can be read back from sqlite_sequence instead of row by row.
+        rows = list(rows)
+        if not rows:
+            return []
+        per_statement = max(1, conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // len(columns))
+        placeholders = f"({', '.join('?' * len(columns))})"
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([placeholders] * len(chunk))}",
+                [value for row in chunk for value in row],
+            )
+        last_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def init_database(self):
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            # Create tables
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS patients (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    phone TEXT NOT NULL,
+                    email TEXT,
+                    whatsapp_number TEXT,
+                    created_date TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS doctors (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    phone TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    specialty TEXT,
+                    created_date TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS appointments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    patient_id INTEGER,
+                    doctor_id INTEGER,
+                    appointment_date TEXT NOT NULL,
+                    appointment_type TEXT,
+                    status TEXT DEFAULT 'scheduled',
+                    follow_up_required BOOLEAN DEFAULT FALSE,
+                    notes TEXT,
+                    created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (patient_id) REFERENCES patients (id),
+                    FOREIGN KEY (doctor_id) REFERENCES doctors (id)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS reminder_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    appointment_id INTEGER,
+                    reminder_type TEXT,
+                    sent_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                    status TEXT,
+                    FOREIGN KEY (appointment_id) REFERENCES appointments (id)
+                )
+            ''')
+
+            conn.commit()
+
+            # Indexes and later schema changes
+            migrate(conn, self.timezone)
+
+    def add_patient(self, patient: Patient):
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO patients (name, phone, email, whatsapp_number, preferred_channels)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (patient.name, patient.phone, patient.email, patient.whatsapp_number, patient.preferred_channels))
+            patient_id = cursor.lastrowid
+            conn.commit()
+        return patient_id
+
+    def add_doctor(self, doctor: Doctor):
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO doctors (name, phone, email, specialty)
+                VALUES (?, ?, ?, ?)
+            ''', (doctor.name, doctor.phone, doctor.email, doctor.specialty))
+            doctor_id = cursor.lastrowid
+            conn.commit()
+        return doctor_id
+
+    def _appointment_row(self, appointment):
+        # Column values for the appointments INSERTs; raises ValueError for an unparseable date
+        appointment_ts, appointment_date = normalize(appointment.appointment_date, self.timezone)
+        return _AppointmentRow(appointment.patient_id, appointment.doctor_id, appointment_date,
+                               appointment.appointment_type, appointment.status, appointment.follow_up_required,
+                               appointment.notes, appointment_ts, self.timezone.key, appointment.duration_minutes)
+
+    def add_appointment(self, appointment: Appointment, check_conflicts=True):
+        """Insert ``appointment`` and return its id.
+
+        Raises SlotConflictError if the doctor already has an overlapping,
+        non-cancelled appointment (unless ``check_conflicts`` is False).
+        """
+        row = self._appointment_row(appointment)
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            # Check and insert under the write lock so two bookings can't both pass
+            conn.execute("BEGIN IMMEDIATE")
+            if check_conflicts and appointment.status != 'cancelled':
+                start = row.appointment_ts // 60
+                conflicts = self._booked_intervals(
+                    conn, appointment.doctor_id, start, start + appointment.duration_minutes
+                )
+                if conflicts:
+                    raise SlotConflictError(appointment.doctor_id, [slot_id for slot_id, _, _ in conflicts])
+            cursor.execute('''
+                INSERT INTO appointments
+                (patient_id, doctor_id, appointment_date, appointment_type,
+                 status, follow_up_required, notes, appointment_ts, timezone, duration_minutes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', row)
+            appointment_id = cursor.lastrowid
+            conn.commit()
+        return appointment_id
+
+    def add_patients_bulk(self, patients):
+        columns = ("name", "phone", "email", "whatsapp_number", "preferred_channels")
+        with self._connection() as conn:
+            patient_ids = self._insert_many(conn, "patients", columns, map(attrgetter(*columns), patients))
+            conn.commit()
+        return patient_ids
+
+    def add_doctors_bulk(self, doctors):
+        columns = ("name", "phone", "email", "specialty")
+        with self._connection() as conn:
+            doctor_ids = self._insert_many(conn, "doctors", columns, map(attrgetter(*columns), doctors))
+            conn.commit()
+        return doctor_ids
+
+    def add_appointments_bulk(self, appointments):
+        rows = [self._appointment_row(appointment) for appointment in appointments]
+        with self._connection() as conn:
+            appointment_ids = self._insert_many(conn, "appointments", _AppointmentRow._fields, rows)
+            conn.commit()
+        return appointment_ids
+
+    def check_appointments_bulk(self, appointments):
+        """(position, reason) for each of ``appointments`` that shouldn't be inserted.
+
+        Rejects unknown patients and doctors, and non-cancelled appointments
+        overlapping a stored booking of the same doctor or another one in
+        ``appointments`` (the one starting first is kept).
+        """
+        appointments = list(appointments)
+        rejects = {}
+        slots = []  # (position, doctor id, start minute, end minute)
+        for position, appointment in enumerate(appointments):
+            if appointment.status == 'cancelled':
+                continue
+            try:
+                start = int(localize(appointment.appointment_date, self.timezone).timestamp()) // 60
+            except ValueError:
+                rejects[position] = "appointment_date is not a date and time"
+                continue
+            slots.append((position, int(appointment.doctor_id), start, start + appointment.duration_minutes))
+
+        with self._connection() as conn:
+            for table, column in (("patients", "patient_id"), ("doctors", "doctor_id")):
+                ids = {int(getattr(appointment, column)) for appointment in appointments}
+                missing = {row[0] for row in conn.execute(f'''
+                    SELECT value FROM json_each(?) WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE id = value)
+                ''', (json.dumps(sorted(ids)),))}
+                for position, appointment in enumerate(appointments):
+                    if int(getattr(appointment, column)) in missing:
+                        rejects.setdefault(position, f"{column} {getattr(appointment, column)} does not exist")
+            # One R*Tree probe per slot, all in one statement
+            booked = {slots[row[0]][0] for row in conn.execute('''
+                SELECT key FROM json_each(?)
+                WHERE EXISTS (
+                    SELECT 1 FROM appointment_slots
+                    WHERE doctor_min <= value ->> 0 AND doctor_max >= value ->> 0
+                    AND start_minute < value ->> 2 AND end_minute > value ->> 1
+                )
+            ''', (json.dumps([slot[1:] for slot in slots]),))}
+        # Earlier rows of the same doctor, in start order, that end after this one starts
+        latest_end = {}
+        for position, doctor_id, start, end in sorted(slots, key=lambda slot: (slot[1], slot[2], slot[0])):
+            if position in booked:
+                rejects.setdefault(position, f"overlaps a booked appointment of doctor_id {doctor_id}")
+            elif start < latest_end.get(doctor_id, start):
+                rejects.setdefault(position, f"overlaps another appointment of doctor_id {doctor_id} in the file")
+            if position not in rejects:
+                latest_end[doctor_id] = max(end, latest_end.get(doctor_id, end))
+        return sorted(rejects.items())
+
+    @staticmethod
+    def _booked_intervals(conn, doctor_id, start_minute, end_minute):
+        # (appointment id, start, end) of bookings overlapping [start, end), in epoch minutes
+        return conn.execute('''
+            SELECT id, start_minute, end_minute FROM appointment_slots
+            WHERE doctor_min <= ?1 AND doctor_max >= ?1 AND start_minute < ?3 AND end_minute > ?2
+        ''', (int(doctor_id), start_minute, end_minute)).fetchall()
+
+    def find_conflicts(self, doctor_id, appointment_date, duration_minutes=30):
+        """Ids of ``doctor_id``'s appointments overlapping the given local start time and duration."""
+        start = normalize(appointment_date, self.timezone)[0] // 60
+        with self._connection() as conn:
+            return [slot_id for slot_id, _, _ in
+                    self._booked_intervals(conn, doctor_id, start, start + duration_minutes)]
+
+    def set_working_hours(self, doctor_id, hours):
+        """Replace ``doctor_id``'s weekly template with ``hours``, a list of ``WorkingHours``."""
+        rows = [(doctor_id, int(block.weekday), clock_minutes(block.start_time), clock_minutes(block.end_time))
+                for block in hours]
+        for _, weekday, start, end in rows:
+            if not 0 <= weekday <= 6 or end <= start:
+                raise ValueError(f"Invalid working hours block: weekday {weekday}, {start}-{end} minutes")
+        with self._connection() as conn:
+            conn.execute("DELETE FROM doctor_schedules WHERE doctor_id = ?", (doctor_id,))
+            conn.executemany('''
+                INSERT INTO doctor_schedules (doctor_id, weekday, start_minute, end_minute)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+
+    def get_working_hours(self, doctor_id):
+        """``doctor_id``'s weekly template as ``WorkingHours``; Monday-Friday 09:00-17:00 if none is saved."""
+        with self._connection() as conn:
+            rows = conn.execute('''
+                SELECT weekday, start_minute, end_minute FROM doctor_schedules
+                WHERE doctor_id = ? ORDER BY weekday, start_minute
+            ''', (doctor_id,)).fetchall()
+        return [
+            WorkingHours(doctor_id, weekday, f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}")
+            for weekday, start, end in rows or DEFAULT_WORKING_HOURS
+        ]
+
+    def find_free_slots(self, doctor_id, duration_minutes=30, count=10, after=None, step_minutes=None,
+                        max_days=60):
+        """The next ``count`` free start times for ``doctor_id`` as aware datetimes in the clinic's zone.
+
+        Searches the doctor's working hours from ``after`` (default: now) for
+        up to ``max_days`` days, a week of booked intervals at a time.
+        """
+        after = after or datetime.now(self.timezone)
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=self.timezone)
+        not_before = math.ceil(after.timestamp() / 60)
+        first_day = after.astimezone(self.timezone).date()
+        hours = [(block.weekday, clock_minutes(block.start_time), clock_minutes(block.end_time))
+                 for block in self.get_working_hours(doctor_id)]
+        slots = []
+        with self._connection() as conn:
+            for offset in range(0, max_days, 7):
+                day = first_day + timedelta(days=offset)
+                days = min(7, max_days - offset)
+                window_start = day_start(day, self.timezone) // 60
+                window_end = day_start(day + timedelta(days=days), self.timezone) // 60
+                busy = merge_intervals(
+                    (start, end) for _, start, end in self._booked_intervals(conn, doctor_id, window_start, window_end)
+                )
+                for start in iter_free_slots(hours, busy, day, days, duration_minutes,
+                                             step_minutes or duration_minutes, self.timezone, not_before):
+                    slots.append(datetime.fromtimestamp(start * 60, self.timezone))
+                    if len(slots) == count:
+                        return slots
+        return slots
+
+    @_cached('patients')
+    def get_patients(self):
+        with self._connection() as conn:
+            return read_frame(conn, "SELECT * FROM patients ORDER BY name")
+
+    @_cached('patients')
+    def search_patients(self, query, limit=20):
+        """Up to ``limit`` patients matching ``query``, newest first.
+
+        Text matches word prefixes of the name and email ("jo sm" finds
+        John Smith). A query that looks like a phone number (3+ digits, no
+        letters) matches anywhere in the phone or WhatsApp digits, ignoring
+        spaces, dashes, brackets and "+". An empty query returns the newest
+        patients. Results aren't ranked: walking the index in rowid order
+        lets a broad prefix like "j" stop after ``limit`` hits.
+        """
+        digits = re.sub(r"\D", "", query)
+        words = re.findall(r"\w+", query.lower())
+        if len(digits) >= 3 and not re.search(r"[^\d\s()+.\-]", query):
+            table, match = "patients_phone_fts", f'"{digits}"'
+        elif words:
+            table, match = "patients_fts", " ".join(f'"{word}"*' for word in words)
+        else:
+            with self._connection() as conn:
+                return read_frame(conn, "SELECT * FROM patients ORDER BY id DESC LIMIT ?", (limit,))
+        query_sql = f'''
+            SELECT p.* FROM {table} f
+            JOIN patients p ON p.id = f.rowid
+            WHERE {table} MATCH ?
+            ORDER BY f.rowid DESC
+            LIMIT ?
+        '''
+        with self._connection() as conn:
+            return read_frame(conn, query_sql, (match, limit))
+
+    @_cached('doctors')
+    def get_doctors(self):
+        with self._connection() as conn:
+            return read_frame(conn, "SELECT * FROM doctors ORDER BY name")
+
+    def _check_table(self, conn, table):
+        # Table names can't be bound as parameters, so only accept real ones
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if not exists:
+            raise ValueError(f"Unknown table: {table}")
+
+    def get_table_columns(self, table):
+        # (name, declared type) pairs in table order
+        with self._connection() as conn:
+            self._check_table(conn, table)
+            return [(row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def iter_table(self, table, batch_size=10000):
+        """Yield every row of ``table`` in id order, ``batch_size`` tuples at a time."""
+        with self._connection() as conn:
+            self._check_table(conn, table)
+            cursor = conn.execute(f"SELECT * FROM {table} ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+
+    @_cached('appointments', 'patients', 'doctors')
+    def get_appointments(self):
+        query = '''
+            SELECT a.*, p.name as patient_name, d.name as doctor_name, d.specialty
+            FROM appointments a
+            JOIN patients p ON a.patient_id = p.id
+            JOIN doctors d ON a.doctor_id = d.id
+            ORDER BY a.appointment_ts DESC, a.id DESC
+        '''
+        with self._connection() as conn:
+            return self._with_datetimes(read_frame(conn, query))
+
+    def _with_datetimes(self, frame):
+        # appointment_ts as a tz-aware datetime column in the clinic's time zone
+        frame['appointment_at'] = pd.to_datetime(frame['appointment_ts'], unit='s', utc=True).dt.tz_convert(self.timezone)
+        return frame
+
+    def _appointment_filters(self, status=None, doctor_id=None, start_date=None, end_date=None):
+        # WHERE clause for the appointment list filters; the date range is
+        # inclusive of both local days, queried half-open as [start, end + 1 day)
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("a.status = ?")
+            params.append(status)
+        if doctor_id is not None:
+            clauses.append("a.doctor_id = ?")
+            params.append(int(doctor_id))
+        if start_date is not None:
+            clauses.append("a.appointment_ts >= ?")
+            params.append(day_start(start_date, self.timezone))
+        if end_date is not None:
+            clauses.append("a.appointment_ts < ?")
+            params.append(day_start(end_date + timedelta(days=1), self.timezone))
+        return clauses, params
+
+    @_cached('appointments', 'patients', 'doctors')
+    def get_appointments_page(self, limit=50, after=None, **filters):
+        """One page of ``get_appointments``, newest first, filtered in SQL.
+
+        Pages are keyset-paginated on ``(appointment_ts, id)``: pass the
+        last row's pair as ``after`` to get the next page. ``filters`` are
+        ``status``, ``doctor_id``, ``start_date`` and ``end_date``.
+        """
+        clauses, params = self._appointment_filters(**filters)
+        if after is not None:
+            clauses.append("(a.appointment_ts, a.id) < (?, ?)")
+            params.extend((int(after[0]), int(after[1])))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f'''
+            SELECT a.*, p.name as patient_name, d.name as doctor_name, d.specialty
+            FROM appointments a
+            JOIN patients p ON a.patient_id = p.id
+            JOIN doctors d ON a.doctor_id = d.id
+            {where}
+            ORDER BY a.appointment_ts DESC, a.id DESC
+            LIMIT ?
+        '''
+        with self._connection() as conn:
+            return self._with_datetimes(read_frame(conn, query, (*params, limit)))
+
+    @_cached('appointments')
+    def count_appointments(self, **filters):
+        clauses, params = self._appointment_filters(**filters)
+        if not clauses:
+            # Unfiltered, the triggers' running total saves counting the whole table
+            query = "SELECT row_count FROM table_generations WHERE name = 'appointments'"
+        else:
+            query = f"SELECT COUNT(*) FROM appointments a WHERE {' AND '.join(clauses)}"
+        with self._connection() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def _upcoming_range(self, days_ahead):
+        # [start of today, start of the day after the last one), as local epoch seconds
+        today = datetime.now(self.timezone).date()
+        return day_start(today, self.timezone), day_start(today + timedelta(days=days_ahead + 1), self.timezone)
+
+    @_cached('appointments', 'patients', 'doctors')
+    def get_dashboard_summary(self, days_ahead=7):
+        """Row counts for the Dashboard metrics, in one query.
+
+        Table totals are the running counts the triggers keep in
+        ``table_generations``; only the upcoming week is counted.
+        """
+        query = '''
+            SELECT (SELECT row_count FROM table_generations WHERE name = 'patients') AS patients,
+                   (SELECT row_count FROM table_generations WHERE name = 'doctors') AS doctors,
+                   (SELECT row_count FROM table_generations WHERE name = 'appointments') AS appointments,
+                   (SELECT COUNT(*)
+                    FROM appointments a
+                    JOIN patients p ON a.patient_id = p.id
+                    JOIN doctors d ON a.doctor_id = d.id
+                    WHERE a.appointment_ts >= ? AND a.appointment_ts < ?
+                    AND a.status = 'scheduled') AS upcoming
+        '''
+        with self._connection() as conn:
+            cursor = conn.execute(query, self._upcoming_range(days_ahead))
+            return dict(zip((column[0] for column in cursor.description), cursor.fetchone()))
+
+    def get_recent_appointments(self, limit=5):
+        # The newest ``limit`` rows of get_appointments
+        return self.get_appointments_page(limit)
+
+    @_cached('appointments', 'patients', 'doctors')
+    def get_upcoming_appointments(self, days_ahead=7, limit=None, offset=0):
+        query = '''
+            SELECT a.*, p.name as patient_name, p.phone as patient_phone,
+                   p.email as patient_email, p.whatsapp_number, p.preferred_channels,
+                   d.name as doctor_name, d.phone as doctor_phone,
+                   d.email as doctor_email, d.specialty
+            FROM appointments a
+            JOIN patients p ON a.patient_id = p.id
+            JOIN doctors d ON a.doctor_id = d.id
+            WHERE a.appointment_ts >= ? AND a.appointment_ts < ?
+            AND a.status = 'scheduled'
+            ORDER BY a.appointment_ts, a.id
+            LIMIT ? OFFSET ?
+        ''', (*self._upcoming_range(days_ahead), -1 if limit is None else limit, offset)
+        with self._connection() as conn:
+            return self._with_datetimes(read_frame(conn, *query))
+
+    def get_changed_upcoming_appointments(self, days_ahead=7, appointment_ids=(), patient_ids=(), doctor_ids=()):
+        """``get_upcoming_appointments`` rows for just the given appointments and those of the given
+        patients and doctors, e.g. the ones ``read_changes`` reported."""
+        # CROSS JOIN keeps the (few) changed ids as the outer loop; otherwise the
+        # planner walks the whole window and rescans them for every appointment
+        query = '''
+            WITH changed (id) AS (
+                SELECT value FROM json_each(:appointment_ids)
+                UNION SELECT id FROM appointments WHERE patient_id IN (SELECT value FROM json_each(:patient_ids))
+                UNION SELECT id FROM appointments
+                WHERE doctor_id IN (SELECT value FROM json_each(:doctor_ids))
+                AND appointment_ts >= :start AND appointment_ts < :end
+            )
+            SELECT a.*, p.name as patient_name, p.phone as patient_phone,
+                   p.email as patient_email, p.whatsapp_number, p.preferred_channels,
+                   d.name as doctor_name, d.phone as doctor_phone,
+                   d.email as doctor_email, d.specialty
+            FROM changed
+            CROSS JOIN appointments a ON a.id = changed.id
+            JOIN patients p ON a.patient_id = p.id
+            JOIN doctors d ON a.doctor_id = d.id
+            WHERE a.appointment_ts >= :start AND a.appointment_ts < :end
+            AND a.status = 'scheduled'
+            ORDER BY a.appointment_ts, a.id
+        '''
+        start, end = self._upcoming_range(days_ahead)
+        params = {
+            "appointment_ids": json.dumps([int(i) for i in appointment_ids]),
+            "patient_ids": json.dumps([int(i) for i in patient_ids]),
+            "doctor_ids": json.dumps([int(i) for i in doctor_ids]),
+            "start": start, "end": end,
+        }
+        with self._connection() as conn:
+            return self._with_datetimes(read_frame(conn, query, params))
+
+    @_cached('appointments', 'doctors')
+    def get_appointment_stats(self):
+        """Appointment counts per month, doctor and status from the rollup table."""
+        query = '''
+            SELECT appointment_monthly_stats.month, appointment_monthly_stats.doctor_id,
+                   d.name as doctor_name, appointment_monthly_stats.status,
+                   appointment_monthly_stats.appointments
+            FROM appointment_monthly_stats
+            LEFT JOIN doctors d ON appointment_monthly_stats.doctor_id = d.id
+            ORDER BY appointment_monthly_stats.month
+        '''
+        with self._connection() as conn:
+            return read_frame(conn, query)
+
+    def log_reminder(self, appointment_id, reminder_type, status, reminder_window=None):
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO reminder_log (appointment_id, reminder_type, status, reminder_window)
+                VALUES (?, ?, ?, ?)
+            ''', (appointment_id, reminder_type, status, reminder_window))
+            conn.commit()
+
+    def log_reminders_bulk(self, entries, reminder_window=None):
+        # entries: (appointment_id, reminder_type, status) tuples
+        with self._connection() as conn:
+            log_ids = self._insert_many(
+                conn, "reminder_log", ("appointment_id", "reminder_type", "status", "reminder_window"),
+                ((appointment_id, reminder_type, status, reminder_window)
+                 for appointment_id, reminder_type, status in entries),
+            )
+            conn.commit()
+        return log_ids
+
+    def enqueue_reminders(self, jobs, reminder_window, max_attempts=5):
+        """Add ``jobs`` to the reminder outbox and return how many were new or retried.
+
+        A job that already failed in this window is set back to pending (with
+        the new message) while it has had fewer than ``max_attempts`` claims.
+        Other jobs the outbox already holds for this window are skipped, as are
+        those ``reminder_log`` records as sent for this window or before the
+        outbox existed (the 'legacy' window).
+        """
+        with self._connection() as conn:
+            before = conn.total_changes
+            conn.executemany('''
+                INSERT INTO reminder_outbox
+                (appointment_id, reminder_type, reminder_window, recipient, subject, message)
+                SELECT ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM reminder_log
+                    WHERE appointment_id = ?1 AND reminder_type = ?2 AND status = 'sent'
+                    AND reminder_window IN (?3, 'legacy')
+                )
+                ON CONFLICT (appointment_id, reminder_type, reminder_window) DO UPDATE
+                SET state = 'pending', recipient = excluded.recipient, subject = excluded.subject,
+                    message = excluded.message, updated_date = CURRENT_TIMESTAMP
+                WHERE state = 'failed' AND attempts < ?
+            ''', [
+                (job.appointment_id, job.channel, reminder_window, job.recipient, job.subject, job.message,
+                 max_attempts)
+                for job in jobs
+            ])
+            queued = conn.total_changes - before
+            conn.commit()
+        return queued
+
+    def claim_reminders(self, owner, limit=100, reminder_window=None, reminder_type=None, lease=300):
+        """Atomically move up to ``limit`` pending outbox rows to 'sending' and return them as jobs.
+
+        Rows left in 'sending' for longer than ``lease`` seconds belong to a
+        worker that died mid-batch and are handed out again.
+        """
+        now = time.time()
+        filters, params = "", []
+        if reminder_window is not None:
+            filters += " AND reminder_window = ?"
+            params.append(reminder_window)
+        if reminder_type is not None:
+            filters += " AND reminder_type = ?"
+            params.append(reminder_type)
+
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute('''
+                UPDATE reminder_outbox SET state = 'pending'
+                WHERE state = 'sending' AND claimed_at < ?
+            ''', (now - lease,))
+            rows = conn.execute(f'''
+                UPDATE reminder_outbox
+                SET state = 'sending', claimed_by = ?, claimed_at = ?, attempts = attempts + 1,
+                    updated_date = CURRENT_TIMESTAMP
+                WHERE id IN (
+                    SELECT id FROM reminder_outbox
+                    WHERE state = 'pending'{filters}
+                    ORDER BY id LIMIT ?
+                )
+                RETURNING id, appointment_id, reminder_type, recipient, message, subject
+            ''', (owner, now, *params, limit)).fetchall()
+            conn.commit()
+        return [
+            ReminderJob(appointment_id, reminder_type, recipient, message, subject or "", outbox_id=outbox_id)
+            for outbox_id, appointment_id, reminder_type, recipient, message, subject in sorted(rows)
+        ]
+
+    def complete_reminders(self, results, reminder_window):
+        # Record claimed jobs as sent/failed in the outbox and reminder_log in one transaction
+        with self._connection() as conn:
+            conn.executemany('''
+                UPDATE reminder_outbox
+                SET state = ?, last_error = ?, updated_date = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', [
+                ('sent' if result.sent else 'rejected' if result.rejected else 'failed',
+                 result.error or None, result.job.outbox_id)
+                for result in results
+            ])
+            self._insert_many(
+                conn, "reminder_log", ("appointment_id", "reminder_type", "status", "reminder_window"),
+                ((result.job.appointment_id, result.job.channel, 'sent' if result.sent else 'failed',
+                  reminder_window) for result in results),
+            )
+            conn.commit()
+
+    def requeue_failed_reminders(self, max_attempts=5):
+        with self._connection() as conn:
+            cursor = conn.execute('''
+                UPDATE reminder_outbox SET state = 'pending', updated_date = CURRENT_TIMESTAMP
+                WHERE state = 'failed' AND attempts < ?
+            ''', (max_attempts,))
+            conn.commit()
+        return cursor.rowcount
+
+    def count_pending_reminders(self, reminder_window=None, reminder_type=None):
+        query = "SELECT COUNT(*) FROM reminder_outbox WHERE state = 'pending'"
+        params = []
+        if reminder_window is not None:
+            query += " AND reminder_window = ?"
+            params.append(reminder_window)
+        if reminder_type is not None:
+            query += " AND reminder_type = ?"
+            params.append(reminder_type)
+        with self._connection() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def get_reminder_state(self, appointment_id, reminder_type, reminder_window):
+        """Outbox state of one reminder, or None if it was never queued."""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT state FROM reminder_outbox "
+                "WHERE appointment_id = ? AND reminder_type = ? AND reminder_window = ?",
+                (appointment_id, reminder_type, reminder_window),
+            ).fetchone()
+        return row[0] if row else None
+
+    def acquire_lock(self, name, owner, ttl):
+        """Take or renew the named lease for ``ttl`` seconds.
+
+        Returns True if ``owner`` holds the lease afterwards. An expired lease
+        can be taken over by anyone.
+        """
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO scheduler_locks (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE
+                SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE scheduler_locks.owner = excluded.owner OR scheduler_locks.expires_at < ?
+            ''', (name, owner, now + ttl, now))
+            acquired = cursor.rowcount == 1
+            conn.commit()
+        return acquired
+
+    def release_lock(self, name, owner):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM scheduler_locks WHERE name = ? AND owner = ?", (name, owner))
+            conn.commit()
+
+    def read_changes(self, since_seq=0, limit=1000, tables=None):
+        """Change-log entries after ``since_seq``, oldest first.
+
+        Columns are seq, table_name, row_id and op ("I", "U" or "D"); pass
+        the last seq back in to read the next page. Entries only hold the row
+        id, so read the row itself (if it still exists) for its values.
+        """
+        query = "SELECT seq, table_name, row_id, op FROM change_log WHERE seq > ?"
+        params = [since_seq]
+        if tables:
+            query += f" AND table_name IN ({', '.join('?' * len(tables))})"
+            params.extend(tables)
+        query += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+        with self._connection() as conn:
+            return read_frame(conn, query, params)
+
+    def last_change_seq(self):
+        # sqlite_sequence keeps the high-water mark even after pruning
+        with self._connection() as conn:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        return row[0] if row else 0
+
+    def get_change_checkpoint(self, consumer):
+        """The last seq ``consumer`` saved, or None if it never has."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT seq FROM change_consumers WHERE name = ?", (consumer,)).fetchone()
+        return row[0] if row else None
+
+    def save_change_checkpoint(self, consumer, seq):
+        # Checkpoints only move forward, so a slow duplicate consumer can't rewind one
+        with self._connection() as conn:
+            conn.execute('''
+                INSERT INTO change_consumers (name, seq) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE
+                SET seq = MAX(seq, excluded.seq), updated_date = CURRENT_TIMESTAMP
+            ''', (consumer, seq))
+            conn.commit()
+
+    def prune_changes(self):
+        """Delete the change-log entries every consumer has checkpointed past; returns how many."""
+        with self._connection() as conn:
+            cursor = conn.execute('''
+                DELETE FROM change_log WHERE seq <= IFNULL(
+                    (SELECT MIN(seq) FROM change_consumers),
+                    (SELECT seq FROM sqlite_sequence WHERE name = 'change_log')
+                )
+            ''')
+            conn.commit()
+        return cursor.rowcount
+
+    def archive_rows(self, table, before, sink, batch_size=10000):
+        """Delete the ``table`` rows ``RETENTION`` considers older than ``before``; returns how many.
+
+        Rows go ``batch_size`` at a time, in id order. Each batch is passed to
+        ``sink(rows)`` (tuples in table column order) inside the transaction
+        that deletes it, so if ``sink`` raises the batch stays in the database.
+        """
+        where, cutoff = RETENTION[table]
+        moved, last_id = 0, 0
+        while True:
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Walk the primary key: an index on the filter columns would re-sort every match per batch
+                cursor = conn.execute(f'''
+                    SELECT * FROM {table} NOT INDEXED
+                    WHERE id > ? AND {where}
+                    ORDER BY id LIMIT ?
+                ''', (last_id, cutoff(before), batch_size))
+                id_column = [column[0] for column in cursor.description].index("id")
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                sink(rows)
+                conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(row[id_column],) for row in rows])
+                conn.commit()
+            moved += len(rows)
+            last_id = rows[-1][id_column]
+        return moved
+
+    def compact(self, pages=None):
+        """Return free pages to the file system; returns the bytes the file shrank by.
+
+        Frees up to ``pages`` pages (default all) with an incremental vacuum. A
+        file created before auto_vacuum=INCREMENTAL gets one full VACUUM
+        instead, which rewrites it in incremental mode.
+        """
+        with self._connection() as conn:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            before = conn.execute("PRAGMA page_count").fetchone()[0]
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                conn.execute(f"PRAGMA incremental_vacuum({int(pages or 0)})").fetchall()
+            # Truncate the WAL too, or the freed pages just sit in it until the next checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            after = conn.execute("PRAGMA page_count").fetchone()[0]
+        # A full VACUUM of a small file can come out a page or two larger
+        return max(0, (before - after) * page_size)
+
+
+class SnapshotDatabase(DatabaseManager):
+    """Read-only copy of ``source``'s database, for reports and exports.
+
+    ``refresh`` copies the live file with the SQLite backup API into a new
+    file and swaps it in, so long reads never hold a read transaction on the
+    live database, where they keep WAL checkpoints from finishing and the log
+    grows under the writers. Reads refresh the copy first once it is more than
+    ``max_age`` seconds old, unless the change log shows no patient, doctor,
+    appointment or reminder changes since, in which case the copy is just
+    re-stamped; ``taken_at`` says when it was (last known to be) current.
+    Writes raise ``sqlite3.OperationalError``.
+    """
+
+    def __init__(self, source, path=None, max_age=300.0, pool_size=4, cache_size=32):
+        self.source = source
+        self.db_path = path or f"{source.db_path}.snapshot"
+        self.timezone = source.timezone
+        self.max_age = max_age
+        self.pool_size = pool_size
+        self.pool = None
+        # Entries are tagged with the snapshot they came from, so they never go stale within it
+        self.cache = QueryCache(cache_size, math.inf)
+        self.taken_at = None
+        self._snapshot = 0
+        self._change_seq = None
+        self._refresh_lock = threading.RLock()
+
+    def _connection(self):
+        self.refresh_if_stale()
+        return self.pool.connection()
+
+    def _table_generations(self, tables):
+        # Cached reads look here before opening a connection, so refresh here too
+        self.refresh_if_stale()
+        return (self._snapshot,) * len(tables)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+    def refresh(self):
+        """Take a new snapshot of the live database now; returns ``taken_at``."""
+        with self._refresh_lock:
+            staging = f"{self.db_path}.{os.getpid()}.tmp"
+            target = sqlite3.connect(staging)
+            try:
+                # Read first: a change made while copying only costs another refresh later
+                change_seq = self.source.last_change_seq()
+                with self.source._connection() as conn:
+                    # In one step, so the copy is a single consistent read of the live file
+                    conn.backup(target)
+                taken_at = datetime.now(self.timezone)
+                # A plain rollback-journal file, so readers need no -wal/-shm files next to it
+                target.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                target.close()
+            # Readers still on the old file keep its inode open until they finish
+            os.replace(staging, self.db_path)
+            previous, self.pool = self.pool, ReadOnlyPool(self.db_path, size=self.pool_size)
+            self._snapshot += 1
+            self.taken_at = taken_at
+            self._change_seq = change_seq
+            if previous is not None:
+                previous.close()
+            return taken_at
+
+    def refresh_if_stale(self):
+        """Refresh unless the snapshot is younger than ``max_age``; returns ``taken_at``."""
+        with self._refresh_lock:
+            if self.taken_at is None or (datetime.now(self.timezone) - self.taken_at).total_seconds() > self.max_age:
+                if self.taken_at is not None and self.source.last_change_seq() == self._change_seq:
+                    self.taken_at = datetime.now(self.timezone)
+                else:
+                    self.refresh()
+            return self.taken_at
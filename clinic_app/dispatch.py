@@ -0,0 +1,283 @@
+"""Concurrent reminder delivery on top of ``ReminderService`` or a ``ProviderService``.
+
+Each channel gets its own worker pool (its concurrency limit) and its own
+token bucket (the provider's rate limit), so a bulk run is bounded by what
+the providers accept rather than by the latency of a single call. Channels
+whose provider has a batch endpoint are sent ``batch_size`` jobs per call.
+Failed sends are retried with exponential backoff; messages the provider
+rejects for good are not.
+"""
+import random
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from clinic_app.reminders import ReminderService
+
+
+@dataclass
+class ReminderJob:
+    appointment_id: int
+    channel: str
+    recipient: str
+    message: str
+    subject: str = ""
+    outbox_id: int = None
+
+@dataclass
+class DispatchResult:
+    job: ReminderJob
+    sent: bool
+    attempts: int
+    error: str = ""
+    rejected: bool = False  # refused for good by the provider; don't retry
+
+@dataclass
+class ChannelLimits:
+    concurrency: int
+    rate_per_second: float
+    burst: int = 1
+
+
+CHANNELS = ("WhatsApp", "SMS", "Email")
+
+DEFAULT_LIMITS = {
+    "WhatsApp": ChannelLimits(concurrency=16, rate_per_second=20, burst=20),
+    "SMS": ChannelLimits(concurrency=16, rate_per_second=30, burst=30),
+    "Email": ChannelLimits(concurrency=8, rate_per_second=10, burst=10),
+}
+
+
+# Column of get_upcoming_appointments holding each channel's recipient
+CONTACT_COLUMNS = {"WhatsApp": "whatsapp_number", "SMS": "patient_phone", "Email": "patient_email"}
+
+# (message, subject) per channel; fields are get_upcoming_appointments columns
+TEMPLATES = {
+    "WhatsApp": ("🏥 Reminder: You have an appointment with Dr. {doctor_name} on {appointment_date}", ""),
+    "SMS": ("Clinic Reminder: Appointment with Dr. {doctor_name} on {appointment_date}", ""),
+    "Email": ("Dear {patient_name}, you have an appointment with Dr. {doctor_name} on {appointment_date}",
+              "Appointment Reminder - {appointment_date}"),
+}
+
+
+def render_template(template, frame):
+    """``template.format(**row)`` for every row of ``frame`` at once, as a Series of strings."""
+    rendered = pd.Series("", index=frame.index, dtype=object)
+    for literal, field, _, _ in string.Formatter().parse(template):
+        rendered += literal
+        if field:
+            values = frame[field]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                # Appointments share start times, so format each distinct one once
+                codes, uniques = pd.factorize(values, use_na_sentinel=False)
+                values = pd.Series(uniques.strftime('%Y-%m-%d %H:%M:%S').to_numpy(object)[codes], index=frame.index)
+            rendered += values.astype(str)
+    return rendered
+
+
+def reachable(frame, channel):
+    """Boolean mask of the rows with a non-blank recipient for ``channel``."""
+    contacts = frame[CONTACT_COLUMNS[channel]].astype("string[pyarrow]").str.strip().str.len()
+    return pd.Series(contacts.fillna(0).to_numpy(dtype=bool), index=frame.index)
+
+
+def choose_channels(frame, channels=CHANNELS):
+    """The channel to remind each row on, or None if the patient can't be reached on any of ``channels``.
+
+    Channels listed in the patient's ``preferred_channels`` (comma-separated,
+    most preferred first) come first, then the rest in ``channels`` order;
+    the first of those the patient has a contact for wins.
+    """
+    preferences = frame["preferred_channels"] if "preferred_channels" in frame else pd.Series("", index=frame.index)
+    # Patients share a handful of distinct preference lists, so rank channels once per list;
+    # a missing list ranks like an empty one
+    codes, lists = pd.factorize(preferences, use_na_sentinel=False)
+    fallback = len(channels)
+    order = np.array([
+        [ordered.index(channel) if channel in ordered else fallback + column
+         for column, channel in enumerate(channels)]
+        for ordered in ([name.strip() for name in str(value).split(",")] for value in lists)
+    ], dtype=float).reshape(len(lists), len(channels))
+    ranks = order[codes]
+    for column, channel in enumerate(channels):
+        ranks[~reachable(frame, channel).to_numpy(), column] = np.inf
+    chosen = np.array(channels, dtype=object)[ranks.argmin(axis=1)]
+    chosen[np.isinf(ranks.min(axis=1))] = None
+    return pd.Series(chosen, index=frame.index, dtype=object)
+
+
+def _channel_jobs(rows, channel):
+    message, subject = TEMPLATES[channel]
+    return list(map(
+        ReminderJob, rows["id"].tolist(), repeat(channel), rows[CONTACT_COLUMNS[channel]].astype(str).tolist(),
+        render_template(message, rows).tolist(), render_template(subject, rows).tolist(),
+    ))
+
+
+def build_reminder_jobs(upcoming_df, channel):
+    """Reminder jobs for every row of ``get_upcoming_appointments`` reachable on ``channel``."""
+    return _channel_jobs(upcoming_df[reachable(upcoming_df, channel)], channel)
+
+
+def plan_reminder_jobs(upcoming_df, channels=CHANNELS):
+    """One reminder job per appointment, on the channel ``choose_channels`` picks for it."""
+    chosen = choose_channels(upcoming_df, channels)
+    jobs = []
+    for channel in channels:
+        jobs.extend(_channel_jobs(upcoming_df[chosen == channel], channel))
+    return jobs
+
+
+class TokenBucket:
+    """Blocking token bucket; ``acquire`` returns once a token is available."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the tokens now and sleep off any debt outside the lock
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ReminderDispatcher:
+    def __init__(self, service=ReminderService, limits=None, max_attempts=3, backoff=0.5):
+        self.service = service
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._buckets = {
+            channel: TokenBucket(limit.rate_per_second, limit.burst)
+            for channel, limit in self.limits.items()
+        }
+        self._executors = {}
+        self._lock = threading.Lock()
+
+    def _executor(self, channel):
+        with self._lock:
+            if channel not in self._executors:
+                self._executors[channel] = ThreadPoolExecutor(
+                    max_workers=self.limits[channel].concurrency,
+                    thread_name_prefix=f"reminders-{channel.lower()}",
+                )
+            return self._executors[channel]
+
+    def _deliver(self, job):
+        error = ""
+        for attempt in range(1, self.max_attempts + 1):
+            self._buckets[job.channel].acquire()
+            try:
+                sent = self.service.send(job.channel, job.recipient, job.message, job.subject)
+                if sent:
+                    return DispatchResult(job, True, attempt)
+                if sent is False:
+                    return DispatchResult(job, False, attempt, "provider rejected the message", rejected=True)
+                error = "provider asked to retry"
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+            if attempt < self.max_attempts:
+                # Exponential backoff with jitter so retries don't arrive in lockstep
+                time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+        return DispatchResult(job, False, self.max_attempts, error)
+
+    def _deliver_batch(self, channel, jobs):
+        # Like _deliver, for one provider batch call; only the jobs that failed temporarily are retried
+        results = []
+        pending, error = jobs, ""
+        for attempt in range(1, self.max_attempts + 1):
+            self._buckets[channel].acquire(len(pending))
+            try:
+                accepted = list(self.service.send_batch(channel, pending))
+                error = "provider asked to retry"
+                # Jobs the provider returned no result for are retried, never dropped
+                accepted += [None] * (len(pending) - len(accepted))
+            except Exception as exc:
+                accepted = [None] * len(pending)
+                error = str(exc) or type(exc).__name__
+            results.extend(DispatchResult(job, True, attempt) for job, ok in zip(pending, accepted) if ok)
+            results.extend(DispatchResult(job, False, attempt, "provider rejected the message", rejected=True)
+                           for job, ok in zip(pending, accepted) if ok is False)
+            pending = [job for job, ok in zip(pending, accepted) if ok is None]
+            if not pending:
+                return results
+            if attempt < self.max_attempts:
+                time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+        return results + [DispatchResult(job, False, self.max_attempts, error) for job in pending]
+
+    def _batch_size(self, channel):
+        return self.service.batch_size(channel) if hasattr(self.service, "batch_size") else 1
+
+    def dispatch(self, jobs, on_progress=None):
+        """Send ``jobs`` concurrently and return one ``DispatchResult`` per job.
+
+        ``on_progress(done, total)`` is called from the calling thread after
+        each job finishes, so it is safe to update Streamlit elements from it.
+        """
+        by_channel = {}
+        for job in jobs:
+            by_channel.setdefault(job.channel, []).append(job)
+        futures = []
+        for channel, channel_jobs in by_channel.items():
+            executor, size = self._executor(channel), self._batch_size(channel)
+            if size > 1:
+                futures.extend(executor.submit(self._deliver_batch, channel, channel_jobs[start:start + size])
+                               for start in range(0, len(channel_jobs), size))
+            else:
+                futures.extend(executor.submit(self._deliver, job) for job in channel_jobs)
+        results = []
+        for future in as_completed(futures):
+            result = future.result()
+            results.extend(result if isinstance(result, list) else [result])
+            if on_progress:
+                on_progress(len(results), len(jobs))
+        return results
+
+    def close(self):
+        with self._lock:
+            for executor in self._executors.values():
+                executor.shutdown(wait=True)
+            self._executors.clear()
+        if hasattr(self.service, "close"):
+            self.service.close()
+
+
+def drain_outbox(db, dispatcher, owner, reminder_window, reminder_type=None, batch_size=200,
+                 on_progress=None, should_continue=None):
+    """Claim and deliver pending outbox rows until none are left.
+
+    Each batch is claimed atomically, so concurrent drains never send the
+    same row twice. ``should_continue()`` is checked before every claim.
+    Returns the ``DispatchResult`` of every job delivered.
+    """
+    total = db.count_pending_reminders(reminder_window, reminder_type)
+    results = []
+    while should_continue is None or should_continue():
+        jobs = db.claim_reminders(owner, batch_size, reminder_window, reminder_type)
+        if not jobs:
+            break
+        done_before = len(results)
+        batch = dispatcher.dispatch(
+            jobs,
+            on_progress=on_progress and (
+                lambda done, _: on_progress(done_before + done, max(total, done_before + done))
+            ),
+        )
+        db.complete_reminders(batch, reminder_window)
+        results.extend(batch)
+    return results
@@ -0,0 +1,90 @@
+"""Compact DataFrames straight from SQLite cursors.
+
+``read_frame`` fetches rows in batches and turns each batch into Arrow
+arrays as it arrives, so only one batch at a time exists as Python
+objects. In the frame it returns:
+
+- text columns are Arrow strings (``string[pyarrow]``), one buffer per column
+  instead of a Python object per cell;
+- the low-cardinality ``CATEGORICAL_COLUMNS`` are dictionary-encoded as
+  pandas categoricals;
+- the ``DATETIME_COLUMNS`` are ``datetime64`` (naive, as stored);
+- numbers come out as they do from ``pd.read_sql_query``.
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+CATEGORICAL_COLUMNS = frozenset({
+    "status", "appointment_type", "timezone", "specialty", "preferred_channels", "reminder_type",
+    "doctor_name", "doctor_phone", "doctor_email", "table_name", "op",
+})
+DATETIME_COLUMNS = {
+    "appointment_date": "%Y-%m-%d %H:%M:%S",
+    "created_date": "%Y-%m-%d %H:%M:%S",
+}
+
+FETCH_BATCH = 10_000
+
+
+def _column(values):
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # SQLite allows mixed types in one column; keep those as Python objects
+        return list(values)
+
+
+def _combine(chunks):
+    # One Arrow array per column, or a list of Python values if a batch held mixed types
+    if any(isinstance(chunk, list) for chunk in chunks):
+        return [value for chunk in chunks for value in (chunk if isinstance(chunk, list) else chunk.to_pylist())]
+    types = {chunk.type for chunk in chunks if chunk.type != pa.null()}
+    if len(types) > 1:
+        # An INTEGER column with a REAL in some batch, or similar
+        if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+            types = {pa.float64()}
+        else:
+            return [value for chunk in chunks for value in chunk.to_pylist()]
+    target = types.pop() if types else pa.null()
+    return pa.chunked_array([chunk.cast(target) for chunk in chunks], target)
+
+
+def _encode(name, array):
+    # Parse the datetime columns and dictionary-encode the categorical ones
+    if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+        return array
+    if name in DATETIME_COLUMNS:
+        try:
+            return pc.strptime(array, DATETIME_COLUMNS[name], unit="s")
+        except pa.ArrowInvalid:
+            pass  # not all in the stored format; keep the text
+    if name in CATEGORICAL_COLUMNS:
+        return array.dictionary_encode()
+    return array
+
+
+def _pandas_type(arrow_type):
+    return pd.StringDtype("pyarrow") if arrow_type in (pa.string(), pa.large_string()) else None
+
+
+def read_frame(conn, query, params=()):
+    """``pd.read_sql_query(query, conn, params=params)`` with compact column types."""
+    cursor = conn.execute(query, params)
+    names = [column[0] for column in cursor.description]
+    chunks = [[] for _ in names]
+    while rows := cursor.fetchmany(FETCH_BATCH):
+        for column, values in zip(chunks, zip(*rows)):
+            column.append(_column(values))
+    if not chunks or not chunks[0]:
+        return pd.DataFrame({name: pd.Series(dtype=object) for name in names})
+    columns = [_combine(column) for column in chunks]
+    arrow = [(name, column) for name, column in zip(names, columns) if not isinstance(column, list)]
+    # One conversion for the whole table is much cheaper than one per column on small results
+    frame = pa.table([_encode(name, column) for name, column in arrow], names=[name for name, _ in arrow]).to_pandas(
+        types_mapper=_pandas_type, coerce_temporal_nanoseconds=True,
+    )
+    for position, (name, column) in enumerate(zip(names, columns)):
+        if isinstance(column, list):
+            frame.insert(position, name, pd.Series(column, dtype=object))
+    return frame
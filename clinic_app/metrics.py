@@ -0,0 +1,226 @@
+"""Prometheus metrics for database calls, reminder sends and page reruns.
+
+    db = instrument_database(DatabaseManager())
+    dispatcher = ReminderDispatcher(instrument_service(ProviderService.from_env()))
+    start_http_server(9464)  # metrics at http://localhost:9464/metrics
+
+Every public ``DatabaseManager`` method records its latency, the rows it
+returned and whether it raised. The slowest calls are also kept in
+``SLOW_CALLS`` together with the queries they ran, for the Performance page.
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from prometheus_client import Counter, Histogram, start_http_server  # noqa: F401 (re-exported)
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+DB_CALL_SECONDS = Histogram(
+    "clinic_db_call_seconds", "DatabaseManager call latency, cache hits included", ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_ROWS = Counter("clinic_db_rows_returned", "Rows returned by DatabaseManager calls", ["method"])
+DB_ERRORS = Counter("clinic_db_errors", "DatabaseManager calls that raised", ["method"])
+SEND_SECONDS = Histogram(
+    "clinic_reminder_send_seconds", "Reminder provider call latency", ["channel"], buckets=LATENCY_BUCKETS,
+)
+SENDS = Counter("clinic_reminder_sends", "Reminder messages by outcome (sent, rejected, error)",
+                ["channel", "outcome"])
+# Per call, the slow call log keeps at most this many queries, each cut to this length
+MAX_TRACED_STATEMENTS = 20
+MAX_STATEMENT_CHARS = 4000
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+PAGE_SECONDS = Histogram(
+    "clinic_page_render_seconds", "Full Streamlit rerun time per page", ["page"], buckets=LATENCY_BUCKETS,
+)
+
+
+class SlowCallLog:
+    """The ``size`` slowest database calls seen, with the SQL statements each one ran."""
+
+    def __init__(self, size=20):
+        self.size = size
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def record(self, seconds, method, args, kwargs, statements):
+        with self._lock:
+            if len(self._heap) >= self.size and seconds <= self._heap[0][0]:
+                return
+        # Only calls that make the list pay for formatting their arguments
+        arguments = ", ".join([repr(value) for value in args] + [f"{key}={value!r}" for key, value in kwargs.items()])
+        if len(arguments) > 200:
+            arguments = arguments[:197] + "..."
+        entry = (seconds, next(self._counter), method, arguments, tuple(statements))
+        with self._lock:
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            elif seconds > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def slowest(self):
+        """[(seconds, method, arguments, statements)], slowest first."""
+        with self._lock:
+            entries = sorted(self._heap, reverse=True)
+        return [(seconds, method, args, statements) for seconds, _, method, args, statements in entries]
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+SLOW_CALLS = SlowCallLog()
+
+_local = threading.local()
+
+
+def _row_count(result):
+    if isinstance(result, (pd.DataFrame, list, tuple)):
+        return len(result)
+    return 0
+
+
+def _instrument_method(name, method, slow_calls):
+    histogram, rows, errors = DB_CALL_SECONDS.labels(name), DB_ROWS.labels(name), DB_ERRORS.labels(name)
+
+    def wrapper(*args, **kwargs):
+        # Only the outermost call on a thread collects statements; nested calls add to its list
+        outermost = getattr(_local, "statements", None) is None
+        if outermost:
+            _local.statements = []
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            histogram.observe(elapsed)
+            if outermost:
+                statements, _local.statements = _local.statements, None
+                slow_calls.record(elapsed, name, args, kwargs, statements)
+        rows.inc(_row_count(result))
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def instrument_database(db, slow_calls=SLOW_CALLS):
+    """Wrap every public method of ``db`` (in place) with timing, row and error metrics; returns ``db``."""
+    connection = db._connection
+
+    @contextmanager
+    def traced_connection():
+        # Capture the queries (with parameters filled in) run on behalf of the current call
+        with connection() as conn:
+            statements = getattr(_local, "statements", None)
+            if statements is None:
+                yield conn
+                return
+
+            def trace(sql):
+                head = sql.lstrip()[:7].upper()
+                if head.startswith(WRITE_STATEMENTS):
+                    # Writes aren't shown, and every trigger statement they fire is traced with the
+                    # whole (multi-row) statement text again, so stop tracing this connection
+                    conn.set_trace_callback(None)
+                elif (head.startswith(("SELECT", "WITH")) and "'main'." not in sql
+                      and len(statements) < MAX_TRACED_STATEMENTS):
+                    # 'main'. is the SQL SQLite runs inside virtual tables
+                    statements.append(sql if len(sql) <= MAX_STATEMENT_CHARS else sql[:MAX_STATEMENT_CHARS] + " ...")
+
+            conn.set_trace_callback(trace)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    db._connection = traced_connection
+    for name in dir(type(db)):
+        if not name.startswith("_") and callable(getattr(type(db), name)):
+            setattr(db, name, _instrument_method(name, getattr(db, name), slow_calls))
+    return db
+
+
+class InstrumentedService:
+    """Wraps a ``ReminderService``-like object, timing each send and counting outcomes per channel."""
+
+    def __init__(self, service):
+        self.service = service
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    def send(self, channel, recipient, message, subject=""):
+        start = time.perf_counter()
+        try:
+            sent = self.service.send(channel, recipient, message, subject)
+        except Exception:
+            SENDS.labels(channel, "error").inc()
+            raise
+        finally:
+            SEND_SECONDS.labels(channel).observe(time.perf_counter() - start)
+        SENDS.labels(channel, "sent" if sent else "error" if sent is None else "rejected").inc()
+        return sent
+
+    def send_batch(self, channel, messages):
+        start = time.perf_counter()
+        try:
+            results = self.service.send_batch(channel, messages)
+        except Exception:
+            SENDS.labels(channel, "error").inc(len(messages))
+            raise
+        finally:
+            SEND_SECONDS.labels(channel).observe(time.perf_counter() - start)
+        SENDS.labels(channel, "sent").inc(sum(map(bool, results)))
+        SENDS.labels(channel, "rejected").inc(sum(result is False for result in results))
+        SENDS.labels(channel, "error").inc(sum(result is None for result in results))
+        return results
+
+
+def instrument_service(service):
+    return InstrumentedService(service)
+
+
+def page_timer(page):
+    """Context manager timing one full rerun of ``page``."""
+    return PAGE_SECONDS.labels(page).time()
+
+
+def histogram_totals(histogram):
+    """{label value: (count, sum)} of a single-label histogram in this process."""
+    totals = {}
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            if sample.name.endswith(("_count", "_sum")):
+                label = next(iter(sample.labels.values()))
+                count, total = totals.get(label, (0, 0.0))
+                if sample.name.endswith("_count"):
+                    count = int(sample.value)
+                else:
+                    total = sample.value
+                totals[label] = (count, total)
+    return totals
+
+
+def counter_totals(counter):
+    """{label values: value} of a counter in this process."""
+    return {
+        tuple(sample.labels.values()) if len(sample.labels) > 1 else next(iter(sample.labels.values())): sample.value
+        for metric in counter.collect() for sample in metric.samples if sample.name.endswith("_total")
+    }
+
+
+def explain_query_plan(db, sql):
+    """EXPLAIN QUERY PLAN detail lines for a captured SELECT statement."""
+    with db.pool.connection() as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
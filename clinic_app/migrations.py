@@ -0,0 +1,363 @@
+"""Versioned schema migrations keyed off ``PRAGMA user_version``.
+
+The tables created by ``DatabaseManager.init_database`` are schema version 0.
+``MIGRATIONS[n - 1]`` upgrades a database from version ``n - 1`` to ``n``;
+each step is either a SQL string or a callable taking the connection and
+the clinic's time zone (a ``ZoneInfo``). A
+migration runs in a single ``BEGIN IMMEDIATE`` transaction together with the
+version bump, so a failed migration leaves the database untouched.
+"""
+from zoneinfo import ZoneInfo
+
+from clinic_app.timestamps import CLINIC_TIMEZONE, normalize
+
+
+def _rollup_triggers(month_expr):
+    """Triggers keeping the appointment rollup table in step with ``appointments``.
+
+    ``month_expr`` derives the bucket from a row, written with ``{row}`` in
+    place of NEW/OLD. Deletes are deliberately not subtracted: the rollup
+    keeps counting appointments that have been archived away.
+    """
+    def keys(row):
+        return f"{month_expr.format(row=row)}, IFNULL({row}.doctor_id, 0), IFNULL({row}.status, '')"
+
+    def add(row):
+        return f'''
+            INSERT INTO appointment_monthly_stats (month, doctor_id, status, appointments)
+            VALUES ({keys(row)}, 1)
+            ON CONFLICT (month, doctor_id, status) DO UPDATE SET appointments = appointments + 1;
+        '''
+
+    def remove(row):
+        monthly = keys(row)
+        return f'''
+            UPDATE appointment_monthly_stats SET appointments = appointments - 1
+            WHERE (month, doctor_id, status) = ({monthly});
+            DELETE FROM appointment_monthly_stats
+            WHERE (month, doctor_id, status) = ({monthly}) AND appointments <= 0;
+        '''
+
+    return (
+        "DROP TRIGGER IF EXISTS trg_appointments_stats_insert",
+        "DROP TRIGGER IF EXISTS trg_appointments_stats_update",
+        f"CREATE TRIGGER trg_appointments_stats_insert AFTER INSERT ON appointments BEGIN {add('NEW')} END",
+        f'''
+        CREATE TRIGGER trg_appointments_stats_update
+        AFTER UPDATE OF appointment_date, doctor_id, status ON appointments
+        BEGIN {remove('OLD')} {add('NEW')} END
+        ''',
+    )
+
+
+def _rebuild_rollups(month_expr):
+    # Recount the rollup table from scratch with the given bucket expression
+    month = month_expr.format(row="a")
+    return (
+        "DELETE FROM appointment_monthly_stats",
+        f'''
+        INSERT INTO appointment_monthly_stats (month, doctor_id, status, appointments)
+        SELECT {month}, IFNULL(a.doctor_id, 0), IFNULL(a.status, ''), COUNT(*)
+        FROM appointments a GROUP BY 1, 2, 3
+        ''',
+    )
+
+
+def _backfill_appointment_ts(conn, tz):
+    # Existing appointment_date text is clinic-local time. Rows that don't
+    # parse keep their text and a NULL appointment_ts.
+    updates = []
+    for appointment_id, appointment_date in conn.execute("SELECT id, appointment_date FROM appointments"):
+        try:
+            updates.append((*normalize(appointment_date, tz), tz.key, appointment_id))
+        except ValueError:
+            continue
+    conn.executemany(
+        "UPDATE appointments SET appointment_ts = ?, appointment_date = ?, timezone = ? WHERE id = ?",
+        updates,
+    )
+
+
+def _phone_digits(column):
+    # SQL for a phone column with the usual punctuation stripped, so "+1 (555) 123-4567" -> "15551234567"
+    expression = f"IFNULL({column}, '')"
+    for character in (" ", "-", "(", ")", "+", "."):
+        expression = f"REPLACE({expression}, '{character}', '')"
+    return expression
+
+
+def _patient_search_rows(row):
+    # (rowid, name, email) and (rowid, phones) values for the two search tables
+    phones = f"{_phone_digits(f'{row}.phone')} || ' ' || {_phone_digits(f'{row}.whatsapp_number')}"
+    return (
+        f"{row}.id, {row}.name, IFNULL({row}.email, '')",
+        f"{row}.id, {phones}",
+    )
+
+
+def _patient_search_triggers():
+    text, phones = _patient_search_rows("NEW")
+    insert = f'''
+        INSERT INTO patients_fts (rowid, name, email) VALUES ({text});
+        INSERT INTO patients_phone_fts (rowid, phones) VALUES ({phones});
+    '''
+    delete = '''
+        DELETE FROM patients_fts WHERE rowid = OLD.id;
+        DELETE FROM patients_phone_fts WHERE rowid = OLD.id;
+    '''
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS trg_patients_search_insert AFTER INSERT ON patients BEGIN {insert} END",
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_patients_search_update
+        AFTER UPDATE OF name, email, phone, whatsapp_number ON patients
+        BEGIN {delete} {insert} END
+        ''',
+        f"CREATE TRIGGER IF NOT EXISTS trg_patients_search_delete AFTER DELETE ON patients BEGIN {delete} END",
+    )
+
+
+def _change_log_triggers(tables):
+    # One change_log row per inserted, updated or deleted row of each table
+    for table in tables:
+        for event, op, row in (("insert", "I", "NEW"), ("update", "U", "NEW"), ("delete", "D", "OLD")):
+            yield f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{event} AFTER {event.upper()} ON {table}
+            BEGIN INSERT INTO change_log (table_name, row_id, op) VALUES ('{table}', {row}.id, '{op}'); END
+            '''
+
+
+def _generation_triggers(tables):
+    # Bump a table's table_generations row on every write, whichever connection or tool makes it,
+    # and keep its row count in step with inserts and deletes
+    for table in tables:
+        yield f'''
+        INSERT OR IGNORE INTO table_generations (name, generation, row_count)
+        VALUES ('{table}', 0, (SELECT COUNT(*) FROM {table}))
+        '''
+        for event, rows in (("insert", " + 1"), ("update", ""), ("delete", " - 1")):
+            yield f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_generation_{event} AFTER {event.upper()} ON {table}
+            BEGIN
+                UPDATE table_generations SET generation = generation + 1, row_count = row_count{rows}
+                WHERE name = '{table}';
+            END
+            '''
+
+
+MIGRATIONS = [
+    # 1: secondary indexes for the appointment, patient/doctor and reminder queries
+    (
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status_date ON appointments (status, appointment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_doctor_date ON appointments (doctor_id, appointment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments (patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_date ON appointments (appointment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_reminder_log_appointment_type ON reminder_log (appointment_id, reminder_type)",
+        "CREATE INDEX IF NOT EXISTS idx_patients_name ON patients (name)",
+        "CREATE INDEX IF NOT EXISTS idx_doctors_name ON doctors (name)",
+    ),
+    # 2: lease rows for leader election between scheduler processes
+    (
+        '''
+        CREATE TABLE IF NOT EXISTS scheduler_locks (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        ''',
+    ),
+    # 3: transactional reminder outbox, one row per reminder and window
+    (
+        '''
+        CREATE TABLE IF NOT EXISTS reminder_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            appointment_id INTEGER NOT NULL,
+            reminder_type TEXT NOT NULL,
+            reminder_window TEXT NOT NULL,
+            recipient TEXT NOT NULL,
+            subject TEXT,
+            message TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            claimed_by TEXT,
+            claimed_at REAL,
+            last_error TEXT,
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (appointment_id, reminder_type, reminder_window),
+            FOREIGN KEY (appointment_id) REFERENCES appointments (id)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_reminder_outbox_state ON reminder_outbox (state, id)",
+        "ALTER TABLE reminder_log ADD COLUMN reminder_window TEXT",
+        # Reminders logged before the outbox existed count as sent for every window
+        "UPDATE reminder_log SET reminder_window = 'legacy' WHERE reminder_window IS NULL",
+    ),
+    # 4: monthly appointment rollup for the Analytics page, maintained by triggers
+    (
+        '''
+        CREATE TABLE IF NOT EXISTS appointment_monthly_stats (
+            month TEXT NOT NULL,
+            doctor_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            appointments INTEGER NOT NULL,
+            PRIMARY KEY (month, doctor_id, status)
+        ) WITHOUT ROWID
+        ''',
+        *_rollup_triggers("substr({row}.appointment_date, 1, 7)"),
+        *_rebuild_rollups("substr({row}.appointment_date, 1, 7)"),
+    ),
+    # 5: per-table write counters for DatabaseManager's query cache, and row counts for the Dashboard
+    (
+        '''
+        CREATE TABLE IF NOT EXISTS table_generations (
+            name TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        ''',
+    ),
+    # 6: typed appointment times (UTC epoch seconds + time zone), range indexes moved onto them
+    (
+        "ALTER TABLE appointments ADD COLUMN appointment_ts INTEGER",
+        "ALTER TABLE appointments ADD COLUMN timezone TEXT",
+        _backfill_appointment_ts,
+        "DROP INDEX IF EXISTS idx_appointments_status_date",
+        "DROP INDEX IF EXISTS idx_appointments_doctor_date",
+        "DROP INDEX IF EXISTS idx_appointments_date",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status_ts ON appointments (status, appointment_ts)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_doctor_ts ON appointments (doctor_id, appointment_ts)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_ts ON appointments (appointment_ts)",
+    ),
+    # 7: appointment durations, weekly working hours and an R*Tree of booked intervals
+    (
+        "ALTER TABLE appointments ADD COLUMN duration_minutes INTEGER NOT NULL DEFAULT 30",
+        '''
+        CREATE TABLE IF NOT EXISTS doctor_schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            doctor_id INTEGER NOT NULL,
+            weekday INTEGER NOT NULL CHECK (weekday BETWEEN 0 AND 6),
+            start_minute INTEGER NOT NULL,
+            end_minute INTEGER NOT NULL CHECK (end_minute > start_minute),
+            FOREIGN KEY (doctor_id) REFERENCES doctors (id)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_doctor_schedules_doctor ON doctor_schedules (doctor_id, weekday)",
+        # [start, end) in epoch minutes x doctor id; cancelled appointments don't occupy a slot
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS appointment_slots
+        USING rtree_i32(id, start_minute, end_minute, doctor_min, doctor_max)
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_slots_insert AFTER INSERT ON appointments
+        BEGIN
+            INSERT INTO appointment_slots (id, start_minute, end_minute, doctor_min, doctor_max)
+            SELECT NEW.id, NEW.appointment_ts / 60, NEW.appointment_ts / 60 + NEW.duration_minutes,
+                   IFNULL(NEW.doctor_id, 0), IFNULL(NEW.doctor_id, 0)
+            WHERE NEW.appointment_ts IS NOT NULL AND IFNULL(NEW.status, '') <> 'cancelled';
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_slots_update
+        AFTER UPDATE OF appointment_ts, duration_minutes, doctor_id, status ON appointments
+        BEGIN
+            DELETE FROM appointment_slots WHERE id = OLD.id;
+            INSERT INTO appointment_slots (id, start_minute, end_minute, doctor_min, doctor_max)
+            SELECT NEW.id, NEW.appointment_ts / 60, NEW.appointment_ts / 60 + NEW.duration_minutes,
+                   IFNULL(NEW.doctor_id, 0), IFNULL(NEW.doctor_id, 0)
+            WHERE NEW.appointment_ts IS NOT NULL AND IFNULL(NEW.status, '') <> 'cancelled';
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_appointments_slots_delete AFTER DELETE ON appointments
+        BEGIN
+            DELETE FROM appointment_slots WHERE id = OLD.id;
+        END
+        ''',
+        '''
+        INSERT INTO appointment_slots (id, start_minute, end_minute, doctor_min, doctor_max)
+        SELECT id, appointment_ts / 60, appointment_ts / 60 + duration_minutes,
+               IFNULL(doctor_id, 0), IFNULL(doctor_id, 0)
+        FROM appointments
+        WHERE appointment_ts IS NOT NULL AND IFNULL(status, '') <> 'cancelled'
+        ''',
+    ),
+    # 8: full-text patient search: word prefixes of name/email, substrings of phone digits
+    (
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts
+        USING fts5(name, email, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3 4 5 6')
+        ''',
+        "CREATE VIRTUAL TABLE IF NOT EXISTS patients_phone_fts USING fts5(phones, tokenize = 'trigram')",
+        *_patient_search_triggers(),
+        f"INSERT INTO patients_fts (rowid, name, email) SELECT {_patient_search_rows('p')[0]} FROM patients p",
+        f"INSERT INTO patients_phone_fts (rowid, phones) SELECT {_patient_search_rows('p')[1]} FROM patients p",
+    ),
+    # 9: reminder channels in the patient's order of preference, e.g. "WhatsApp,Email"
+    (
+        "ALTER TABLE patients ADD COLUMN preferred_channels TEXT NOT NULL DEFAULT ''",
+    ),
+    # 10: change data capture. AUTOINCREMENT so a sequence number is never
+    # reused after pruning; op is I(nsert), U(pdate) or D(elete)
+    (
+        '''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS change_consumers (
+            name TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            updated_date TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        *_change_log_triggers(("patients", "doctors", "appointments", "reminder_log")),
+    ),
+    # 11: query cache generations and row counts kept by triggers on the tables it caches reads of
+    (
+        *_generation_triggers(("patients", "doctors", "appointments")),
+    ),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, tz=None):
+    """Apply every pending migration and return the resulting schema version.
+
+    ``tz`` (a ``ZoneInfo``, default ``CLINIC_TIMEZONE``) is the zone existing
+    local appointment times were entered in.
+    """
+    tz = tz or ZoneInfo(CLINIC_TIMEZONE)
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this code supports ({SCHEMA_VERSION})"
+        )
+
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the write lock
+            if schema_version(conn) >= target:
+                conn.rollback()
+                continue
+            for step in MIGRATIONS[target - 1]:
+                if callable(step):
+                    step(conn, tz)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return schema_version(conn)
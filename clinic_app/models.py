@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Patient:
+    name: str
+    phone: str
+    email: str
+    whatsapp_number: str
+    preferred_channels: str = ""  # comma-separated, most preferred first; empty uses the default order
+
+@dataclass
+class Doctor:
+    name: str
+    phone: str
+    email: str
+    specialty: str
+
+@dataclass
+class Appointment:
+    patient_id: int
+    doctor_id: int
+    appointment_date: str
+    appointment_type: str
+    status: str
+    follow_up_required: bool
+    notes: str = ""
+    duration_minutes: int = 30
+
+@dataclass
+class WorkingHours:
+    doctor_id: int
+    weekday: int  # Monday is 0
+    start_time: str  # "HH:MM", clinic local time
+    end_time: str
@@ -0,0 +1,10 @@
+"""How many rows each Streamlit page asks the database for.
+
+Kept out of ``clinic_app.ui`` so the benchmark suite can replay the pages'
+queries without importing Streamlit.
+"""
+APPOINTMENTS_PAGE_SIZE = 50
+DASHBOARD_UPCOMING_LIMIT = 20
+FREE_SLOT_CHOICES = 10
+PATIENT_SEARCH_RESULTS = 20
+REMINDERS_PAGE_SIZE = 20
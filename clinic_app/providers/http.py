@@ -0,0 +1,62 @@
+"""JSON-over-HTTP messaging providers (WhatsApp and SMS gateways).
+
+One ``httpx.Client`` per provider keeps a pool of keep-alive connections
+shared by all dispatcher threads, so a bulk run pays the TCP/TLS handshake
+once per connection instead of once per message.
+
+    POST {url}        {"to": ..., "message": ..., "subject": ...}
+    POST {url}/batch  {"messages": [{...}, ...]} -> {"results": [{"ok": true}, ...]}
+
+429 and 5xx replies are temporary and retried; other 4xx replies (for a
+batch, every message in it) and batch results ``{"ok": false}`` reject the
+message for good. A batch result
+``{"ok": false, "retry": true}`` is a temporary failure of that message.
+"""
+import httpx
+
+from clinic_app.providers import ReminderProvider, register_provider
+
+
+@register_provider("http")
+class HttpProvider(ReminderProvider):
+    def __init__(self, url, token=None, batch_size=1, timeout=10.0, max_connections=32):
+        self.url = url.rstrip("/")
+        self.batch_size = max(1, batch_size)
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.client = httpx.Client(
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    @staticmethod
+    def _payload(recipient, message, subject):
+        return {"to": recipient, "message": message, "subject": subject}
+
+    @staticmethod
+    def _check(response):
+        # Transient: raise so the dispatcher's retry records why
+        if response.status_code == 429 or response.is_server_error:
+            response.raise_for_status()
+
+    def send(self, recipient, message, subject=""):
+        response = self.client.post(self.url, json=self._payload(recipient, message, subject))
+        self._check(response)
+        return response.is_success
+
+    def send_batch(self, messages):
+        if self.batch_size == 1:
+            return super().send_batch(messages)
+        response = self.client.post(self.url + "/batch", json={
+            "messages": [self._payload(item.recipient, item.message, item.subject) for item in messages],
+        })
+        self._check(response)
+        if not response.is_success:
+            return [False] * len(messages)
+        return [
+            True if result.get("ok") else None if result.get("retry") else False
+            for result in response.json()["results"]
+        ]
+
+    def close(self):
+        self.client.close()
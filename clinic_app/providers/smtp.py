@@ -0,0 +1,109 @@
+"""Email over SMTP on long-lived, already-authenticated connections.
+
+Each dispatcher thread keeps its own connection (an SMTP session can only
+carry one transaction at a time) and reuses it for every message it sends,
+instead of connecting, saying EHLO, negotiating TLS and logging in per email.
+A dropped connection is discarded and reopened on the next send.
+"""
+import smtplib
+import threading
+from email.message import EmailMessage
+from types import SimpleNamespace
+
+from clinic_app.providers import ReminderProvider, register_provider
+
+
+def _temporary(exc):
+    # 4xx replies mean "try again later"; 5xx ones are permanent
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+    else:
+        codes = [exc.smtp_code]
+    return all(400 <= code < 500 for code in codes)
+
+
+@register_provider("smtp")
+class SmtpProvider(ReminderProvider):
+    def __init__(self, host, port=587, username=None, password=None, sender="clinic@localhost",
+                 starttls=True, ssl=False, timeout=10.0, batch_size=50):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.starttls = starttls
+        self.ssl = ssl
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        smtp_class = smtplib.SMTP_SSL if self.ssl else smtplib.SMTP
+        connection = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.starttls and not self.ssl:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _discard(self):
+        connection = self._local.__dict__.pop("connection", None)
+        if connection is not None:
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            try:
+                connection.close()
+            except OSError:
+                pass
+
+    def _message(self, recipient, message, subject):
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = recipient
+        email["Subject"] = subject
+        email.set_content(message)
+        return email
+
+    def send(self, recipient, message, subject=""):
+        return self.send_batch([SimpleNamespace(recipient=recipient, message=message, subject=subject)])[0]
+
+    def send_batch(self, messages):
+        connection = self._connection()
+        results = []
+        try:
+            for item in messages:
+                try:
+                    connection.send_message(self._message(item.recipient, item.message, item.subject))
+                    results.append(True)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as exc:
+                    # Rejected message; the session is still usable after a reset
+                    connection.rset()
+                    results.append(None if _temporary(exc) else False)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._discard()
+            if not results:
+                raise
+            # Report what went through; the rest are retried
+            results.extend([None] * (len(messages) - len(results)))
+        return results
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
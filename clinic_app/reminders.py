@@ -0,0 +1,31 @@
+import time
+
+
+class ReminderService:
+    @staticmethod
+    def send_whatsapp(phone, message):
+        # Simulate WhatsApp sending
+        time.sleep(0.5)  # Simulate API call
+        return True
+    
+    @staticmethod
+    def send_sms(phone, message):
+        # Simulate SMS sending
+        time.sleep(0.5)  # Simulate API call
+        return True
+    
+    @staticmethod
+    def send_email(email, subject, message):
+        # Simulate Email sending
+        time.sleep(0.5)  # Simulate API call
+        return True
+    
+    @classmethod
+    def send(cls, channel, recipient, message, subject=""):
+        if channel == "WhatsApp":
+            return cls.send_whatsapp(recipient, message)
+        if channel == "SMS":
+            return cls.send_sms(recipient, message)
+        if channel == "Email":
+            return cls.send_email(recipient, subject, message)
+        raise ValueError(f"Unknown reminder channel: {channel}")
@@ -0,0 +1,225 @@
+"""Headless reminder scheduler, run outside the Streamlit process.
+
+    python -m clinic_app.scheduler --db clinic_app.db --interval 300 --days-ahead 1
+    python -m clinic_app.scheduler --clinics clinics --interval 300
+
+
+Every ``interval`` seconds the leader looks up due appointments and adds a
+reminder per channel to the ``reminder_outbox`` table (after the first scan
+of the day, only appointments the change log says changed since the last), and a worker thread
+drains the outbox through ``ReminderDispatcher``. Any number of instances
+can run against the same database: they compete for a lease row in
+``scheduler_locks`` and only the current holder enqueues or sends. Because
+the outbox is keyed per appointment, channel and window, a restart picks up
+exactly the reminders that are still outstanding. With ``--clinics`` one
+scheduler runs per clinic in the directory (or per ``--clinic``), each on
+its own thread, database and leader lease.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import uuid
+from datetime import datetime
+
+import schedule
+
+from clinic_app.database import DatabaseManager
+from clinic_app.dispatch import CHANNELS, ReminderDispatcher, drain_outbox, plan_reminder_jobs
+from clinic_app.metrics import instrument_database, instrument_service, start_http_server
+from clinic_app.providers import ProviderService
+from clinic_app.tenancy import ClinicDirectory, ClinicRouter
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "reminder-scheduler"
+
+# Tables whose changes can make an appointment due (or change its reminder)
+CHANGE_TABLES = ("appointments", "patients", "doctors")
+# Past this many changes since the last scan, rescanning everything is cheaper
+FULL_SCAN_CHANGES = 5000
+
+
+class ReminderScheduler:
+    def __init__(self, db, dispatcher, channels=CHANNELS, days_ahead=1, interval=300,
+                 lock_ttl=60, batch_size=200, max_attempts=5, name="reminder"):
+        self.db = db
+        self.dispatcher = dispatcher
+        self.channels = channels
+        self.days_ahead = days_ahead
+        self.interval = interval
+        self.lock_ttl = lock_ttl
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.name = name
+        self.reminder_window = f"{days_ahead}d"
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._scanned_day = None
+        self._change_seq = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._schedule = schedule.Scheduler()
+
+    def heartbeat(self):
+        # Take or renew the lease; renewing every ttl/3 keeps it from lapsing
+        try:
+            leader = self.db.acquire_lock(LOCK_NAME, self.owner, self.lock_ttl)
+        except Exception:
+            # The lease may lapse before the next renewal, so stop sending until it is renewed
+            logger.exception("Could not renew the leader lease")
+            leader = False
+        if leader != self.is_leader:
+            logger.info("%s leadership as %s", "Acquired" if leader else "Lost", self.owner)
+        self.is_leader = leader
+
+    def enqueue_due(self):
+        if not self.is_leader:
+            return 0
+        requeued = self.db.requeue_failed_reminders(self.max_attempts)
+        upcoming_df = self.due_appointments()
+        # One reminder per appointment, on the patient's preferred reachable channel
+        jobs = plan_reminder_jobs(upcoming_df, self.channels)
+        queued = self.db.enqueue_reminders(jobs, self.reminder_window)
+        logger.info("Queued %d new reminders (%d retries) for %d due appointments",
+                    queued, requeued, len(upcoming_df))
+        if queued or requeued:
+            self._wake.set()
+        return queued
+
+    def _enqueue_tick(self):
+        try:
+            self.enqueue_due()
+        except Exception:
+            logger.exception("Queuing due reminders failed; retrying next interval")
+
+    def due_appointments(self):
+        """Upcoming appointments to (re)plan reminders for.
+
+        All of them on the first scan and whenever the day, and with it the
+        window, moves on; in between only those changed since the previous
+        scan, or whose patient or doctor changed. Queuing is idempotent, so
+        seeing a change twice is harmless.
+        """
+        head = self.db.last_change_seq()
+        today = datetime.now(self.db.timezone).date()
+        changes = None
+        if today == self._scanned_day:
+            changes = self.db.read_changes(self._change_seq, FULL_SCAN_CHANGES + 1, CHANGE_TABLES)
+        if changes is None or len(changes) > FULL_SCAN_CHANGES:
+            upcoming_df = self.db.get_upcoming_appointments(days_ahead=self.days_ahead)
+        else:
+            ids = {table: changes.loc[changes["table_name"] == table, "row_id"].unique() for table in CHANGE_TABLES}
+            upcoming_df = self.db.get_changed_upcoming_appointments(
+                self.days_ahead, ids["appointments"], ids["patients"], ids["doctors"],
+            )
+        # Changes committed after ``head`` may already be in this scan; they are read again next time
+        self._scanned_day, self._change_seq = today, head
+        self.db.save_change_checkpoint(LOCK_NAME, head)
+        return upcoming_df
+
+    def _dispatch_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=5)
+            self._wake.clear()
+            if not self.is_leader:
+                continue
+            try:
+                results = drain_outbox(
+                    self.db, self.dispatcher, self.owner, self.reminder_window,
+                    batch_size=self.batch_size,
+                    # A deposed leader stops claiming; its claimed rows are re-issued after the lease
+                    should_continue=lambda: self.is_leader and not self._stop.is_set(),
+                )
+            except Exception:
+                # Rows claimed before the error are handed out again once their claim expires
+                logger.exception("Sending reminders failed; retrying")
+                self._stop.wait(5)
+                continue
+            if results:
+                logger.info("Sent %d of %d reminders", sum(r.sent for r in results), len(results))
+
+    def run(self):
+        self._schedule.every(max(1, self.lock_ttl // 3)).seconds.do(self.heartbeat)
+        self._schedule.every(self.interval).seconds.do(self._enqueue_tick)
+        self.heartbeat()
+        self._enqueue_tick()
+
+        worker = threading.Thread(target=self._dispatch_loop, name=f"{self.name}-dispatch", daemon=True)
+        worker.start()
+        try:
+            while not self._stop.is_set():
+                if not worker.is_alive():
+                    # Renewing the lease without a worker would keep every other instance from sending
+                    logger.error("Dispatch thread died; giving up the leader lease")
+                    break
+                self._schedule.run_pending()
+                self._stop.wait(1)
+        finally:
+            self._stop.set()
+            worker.join()
+            if self.is_leader:
+                self.db.release_lock(LOCK_NAME, self.owner)
+            self.dispatcher.close()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send appointment reminders on a schedule.")
+    parser.add_argument("--db", default="clinic_app.db", help="path to the clinic database")
+    parser.add_argument("--clinics", default=os.environ.get("CLINIC_DIRECTORY"),
+                        help="clinic directory; schedules every clinic in it instead of --db")
+    parser.add_argument("--clinic", action="append", help="only this clinic of --clinics (repeatable)")
+    parser.add_argument("--interval", type=int, default=300, help="seconds between scans for due appointments")
+    parser.add_argument("--days-ahead", type=int, default=1, help="remind appointments this many days ahead")
+    parser.add_argument("--channels", default=",".join(CHANNELS), help="comma-separated reminder channels")
+    parser.add_argument("--lock-ttl", type=int, default=60, help="leader lease length in seconds")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(threadName)s %(name)s: %(message)s")
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    if args.clinics:
+        router = ClinicRouter(ClinicDirectory(args.clinics), wrap=instrument_database)
+        databases = {slug: router.database(slug) for slug in args.clinic or [c.slug for c in router.clinics()]}
+    else:
+        databases = {"reminder": instrument_database(DatabaseManager(args.db))}
+    if not databases:
+        parser.error(f"no clinics in {args.clinics}")
+    schedulers = [
+        ReminderScheduler(
+            db,
+            # Per clinic, so one clinic's backlog doesn't hold up another's sends
+            ReminderDispatcher(instrument_service(ProviderService.from_env())),
+            channels=tuple(channel.strip() for channel in args.channels.split(",") if channel.strip()),
+            days_ahead=args.days_ahead,
+            interval=args.interval,
+            lock_ttl=args.lock_ttl,
+            name=name,
+        )
+        for name, db in databases.items()
+    ]
+    signal.signal(signal.SIGTERM, lambda *_: [scheduler.stop() for scheduler in schedulers])
+    threads = [threading.Thread(target=scheduler.run, name=scheduler.name) for scheduler in schedulers]
+    for thread in threads:
+        thread.start()
+    try:
+        # Joined with a timeout so Ctrl-C still reaches the main thread
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(1)
+    except KeyboardInterrupt:
+        for scheduler in schedulers:
+            scheduler.stop()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
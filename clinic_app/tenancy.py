@@ -0,0 +1,213 @@
+"""One SQLite database per clinic, and routing to them.
+
+A clinic directory is a folder with a small ``clinics.db`` listing every
+clinic's slug, name, time zone and database file (by default ``<slug>.db``
+next to it). Each clinic's database has its own write lock, so a bulk
+reminder run at one clinic never blocks bookings at another.
+
+    python -m clinic_app.tenancy --dir clinics add downtown "Downtown Clinic" --timezone Europe/London
+    python -m clinic_app.tenancy --dir clinics add uptown "Uptown Clinic" --db clinic_app.db
+    python -m clinic_app.tenancy --dir clinics list
+
+``ClinicRouter`` opens a ``DatabaseManager`` (with its own connection pool
+and query cache) per clinic on first use, and runs cross-clinic reports on
+every clinic at once with ``fan_out`` and ``merge_frames``.
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from clinic_app.database import DatabaseManager, SnapshotDatabase
+from clinic_app.timestamps import CLINIC_TIMEZONE
+
+SLUG_PATTERN = re.compile(r"[a-z0-9][a-z0-9_-]*")
+
+
+@dataclass
+class Clinic:
+    slug: str
+    name: str
+    db_path: str
+    timezone: str = CLINIC_TIMEZONE
+
+
+class ClinicDirectory:
+    def __init__(self, root):
+        self.root = root
+        self.path = os.path.join(root, "clinics.db")
+        os.makedirs(root, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS clinics (
+                    slug TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    db_file TEXT NOT NULL,
+                    timezone TEXT NOT NULL,
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.path, timeout=30.0))
+
+    def _clinic(self, slug, name, db_file, timezone):
+        # Relative database files live in the directory itself
+        return Clinic(slug, name, os.path.join(self.root, db_file), timezone)
+
+    def clinics(self):
+        with self._connect() as conn:
+            return [self._clinic(*row) for row in conn.execute(
+                "SELECT slug, name, db_file, timezone FROM clinics ORDER BY name"
+            )]
+
+    def get(self, slug):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT slug, name, db_file, timezone FROM clinics WHERE slug = ?", (slug,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown clinic: {slug}")
+        return self._clinic(*row)
+
+    def add(self, slug, name, timezone=CLINIC_TIMEZONE, db_file=None):
+        """Register a clinic; ``db_file`` defaults to a new ``<slug>.db`` in the directory."""
+        if not SLUG_PATTERN.fullmatch(slug):
+            raise ValueError(f"Clinic slugs are lowercase letters, digits, '-' and '_': {slug!r}")
+        with self._connect() as conn:
+            try:
+                conn.execute(
+                    "INSERT INTO clinics (slug, name, db_file, timezone) VALUES (?, ?, ?, ?)",
+                    (slug, name, db_file or f"{slug}.db", timezone),
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Clinic already exists: {slug}") from None
+            conn.commit()
+        return self.get(slug)
+
+
+class ClinicRouter:
+    """Per-clinic databases from a ``ClinicDirectory``, opened on first use.
+
+    ``wrap`` is applied to each new database (and snapshot), e.g.
+    ``instrument_database``; other keyword arguments go to ``DatabaseManager``.
+    """
+
+    def __init__(self, directory, wrap=None, max_workers=8, snapshot_max_age=300.0, **db_options):
+        self.directory = directory
+        self.wrap = wrap or (lambda db: db)
+        self.max_workers = max_workers
+        self.snapshot_max_age = snapshot_max_age
+        self.db_options = db_options
+        self._databases = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def clinics(self):
+        return self.directory.clinics()
+
+    def database(self, slug):
+        with self._lock:
+            db = self._databases.get(slug)
+            if db is None:
+                clinic = self.directory.get(slug)
+                db = self._databases[slug] = self.wrap(
+                    DatabaseManager(clinic.db_path, timezone=clinic.timezone, **self.db_options)
+                )
+            return db
+
+    def snapshot(self, slug):
+        """The clinic's ``SnapshotDatabase``, for reports."""
+        db = self.database(slug)
+        with self._lock:
+            snapshot = self._snapshots.get(slug)
+            if snapshot is None:
+                snapshot = self._snapshots[slug] = self.wrap(SnapshotDatabase(db, max_age=self.snapshot_max_age))
+            return snapshot
+
+    def fan_out(self, call, slugs=None, snapshots=False):
+        """Run ``call(db)`` on each clinic's database (or snapshot) in parallel; returns {slug: result}."""
+        slugs = [clinic.slug for clinic in self.clinics()] if slugs is None else list(slugs)
+        open_database = self.snapshot if snapshots else self.database
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="clinic-fan-out")
+        futures = {slug: self._executor.submit(lambda slug=slug: call(open_database(slug))) for slug in slugs}
+        return {slug: future.result() for slug, future in futures.items()}
+
+    def merge_frames(self, call, slugs=None, snapshots=False):
+        """``fan_out`` for calls returning DataFrames: one frame, with a leading ``clinic`` column."""
+        results = self.fan_out(call, slugs, snapshots)
+        frames = {slug: frame for slug, frame in results.items() if not frame.empty} or results
+        if not frames:
+            return pd.DataFrame(columns=["clinic"])
+        # Align the categories of categorical columns, or concat falls back to object columns
+        categories = {}
+        for column in next(iter(frames.values())).columns:
+            dtypes = [frame[column].dtype for frame in frames.values() if column in frame]
+            if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+                categories[column] = pd.api.types.union_categoricals(
+                    [pd.Categorical([], categories=dtype.categories) for dtype in dtypes]
+                ).categories
+        frames = {
+            slug: frame.assign(**{name: frame[name].cat.set_categories(values) for name, values in categories.items()})
+            for slug, frame in frames.items()
+        }
+        merged = pd.concat(frames.values(), ignore_index=True)
+        codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames.values()])
+        merged.insert(0, "clinic", pd.Categorical.from_codes(codes, categories=list(frames)))
+        return merged
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            for db in (*self._snapshots.values(), *self._databases.values()):
+                db.close()
+            self._databases.clear()
+            self._snapshots.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the clinic directory.")
+    parser.add_argument("--dir", default=os.environ.get("CLINIC_DIRECTORY", "clinics"),
+                        help="clinic directory (default $CLINIC_DIRECTORY or ./clinics)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="register a clinic and create its database")
+    add.add_argument("slug")
+    add.add_argument("name")
+    add.add_argument("--timezone", default=CLINIC_TIMEZONE)
+    add.add_argument("--db", help="use this existing database file instead of <slug>.db")
+    commands.add_parser("list", help="list the clinics")
+    args = parser.parse_args(argv)
+
+    directory = ClinicDirectory(args.dir)
+    if args.command == "add":
+        try:
+            clinic = directory.add(args.slug, args.name, args.timezone,
+                                   os.path.abspath(args.db) if args.db else None)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        # Creates (or migrates) the clinic's schema
+        DatabaseManager(clinic.db_path, timezone=clinic.timezone).close()
+        print(f"Added {clinic.name} ({clinic.slug}) at {clinic.db_path}")
+        return 0
+    for clinic in directory.clinics():
+        print(f"{clinic.slug}\t{clinic.name}\t{clinic.timezone}\t{clinic.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Appointment times: clinic wall-clock text in, UTC epoch seconds stored.
+
+Appointments are entered as local times (``'YYYY-MM-DD HH:MM[:SS]'``) in
+the clinic's time zone, ``CLINIC_TIMEZONE`` (an IANA name; the host's own
+zone unless set in the environment). They are stored as ``appointment_ts``, integer
+seconds since the epoch, next to the ``timezone`` they were entered in;
+``appointment_date`` keeps the normalised local text for display.
+"""
+import os
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+def host_timezone():
+    """The IANA name of the host's local time zone, or ``UTC`` if it can't be told."""
+    candidates = [os.environ.get("TZ", "").lstrip(":")]
+    try:
+        with open("/etc/timezone") as f:
+            candidates.append(f.read().strip())
+    except OSError:
+        pass
+    candidates.append(os.path.realpath("/etc/localtime").partition("/zoneinfo/")[2])
+    for name in filter(None, candidates):
+        try:
+            ZoneInfo(name)
+        except (ValueError, ZoneInfoNotFoundError):
+            continue
+        return name
+    return "UTC"
+
+
+# Appointment text was always entered in the server's local time, so that is the default
+CLINIC_TIMEZONE = os.environ.get("CLINIC_TIMEZONE") or host_timezone()
+
+
+def localize(value, tz):
+    """An aware datetime in ``tz`` for a local time string or datetime.
+
+    Naive values are taken to be in ``tz``; aware ones are converted to it.
+    Raises ValueError for text that isn't an ISO-8601 date/time.
+    """
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).strip())
+    return moment.replace(tzinfo=tz) if moment.tzinfo is None else moment.astimezone(tz)
+
+
+def normalize(value, tz):
+    """Return ``(epoch seconds, 'YYYY-MM-DD HH:MM:SS' in tz)`` for a local time string or datetime (see ``localize``)."""
+    moment = localize(value, tz)
+    return int(moment.timestamp()), moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def day_start(day, tz, minutes=0):
+    """Epoch seconds of local midnight at the start of ``day`` (a date), plus ``minutes`` of wall-clock time."""
+    return int((datetime.combine(day, time(), tz) + timedelta(minutes=minutes)).timestamp())
@@ -0,0 +1,22 @@
+"""Streamlit pages for ``main.py``.
+
+Each page is its own module with a ``render()`` function, imported only when
+the page is first shown. Widgets that only affect their own part of a page
+live in ``st.fragment`` functions, so clicking them reruns that fragment
+instead of the whole script.
+"""
+import importlib
+
+PAGES = {
+    "Dashboard": "dashboard",
+    "Patients": "patients",
+    "Doctors": "doctors",
+    "Appointments": "appointments",
+    "Send Reminders": "reminders",
+    "Analytics": "analytics",
+    "Performance": "performance",
+}
+
+
+def render_page(name):
+    importlib.import_module(f"clinic_app.ui.{PAGES[name]}").render()
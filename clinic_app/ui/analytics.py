@@ -0,0 +1,83 @@
+import streamlit as st
+
+from clinic_app.ui.common import get_router, snapshot_status
+
+
+def render():
+    st.header("📊 Analytics & Reports")
+
+    # plotly takes longer to import than the rest of the app; only this page needs it
+    import plotly.express as px
+
+    # Monthly counts per doctor and status, kept up to date by the rollup triggers
+    snapshot = snapshot_status("analytics")
+    router = get_router()
+    if router is not None and st.toggle("All clinics", key="analytics_all_clinics"):
+        # Every clinic's snapshot queried in parallel; doctors are told apart by clinic
+        stats_df = router.merge_frames(lambda db: db.get_appointment_stats(), snapshots=True)
+        if not stats_df.empty:
+            stats_df['doctor_name'] = stats_df['doctor_name'].astype('string') + " (" + stats_df['clinic'].astype('string') + ")"
+    else:
+        stats_df = snapshot.get_appointment_stats()
+
+    if stats_df.empty:
+        st.info("No data available for analytics. Add some appointments first!")
+    else:
+        # Appointment status distribution
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📈 Appointment Status Distribution")
+            status_counts = stats_df.groupby('status', observed=True)['appointments'].sum().sort_values(ascending=False)
+            fig_pie = px.pie(
+                values=status_counts.values,
+                names=status_counts.index,
+                title="Appointment Status Breakdown"
+            )
+            st.plotly_chart(fig_pie, use_container_width=True)
+
+        with col2:
+            st.subheader("👨‍⚕️ Appointments by Doctor")
+            doctor_counts = stats_df.groupby('doctor_name', observed=True)['appointments'].sum().sort_values(ascending=False)
+            fig_bar = px.bar(
+                x=doctor_counts.index,
+                y=doctor_counts.values,
+                title="Appointments per Doctor"
+            )
+            fig_bar.update_xaxes(title_text="Doctor")
+            fig_bar.update_yaxes(title_text="Number of Appointments")
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+        # Monthly trend
+        st.subheader("📅 Monthly Appointment Trend")
+        monthly_counts = stats_df.groupby('month')['appointments'].sum()
+
+        fig_line = px.line(
+            x=monthly_counts.index,
+            y=monthly_counts.values,
+            title="Appointments Over Time"
+        )
+        fig_line.update_xaxes(title_text="Month")
+        fig_line.update_yaxes(title_text="Number of Appointments")
+        st.plotly_chart(fig_line, use_container_width=True)
+
+        # Summary statistics
+        st.subheader("📋 Summary Statistics")
+        col1, col2, col3, col4 = st.columns(4)
+        total = int(stats_df['appointments'].sum())
+
+        with col1:
+            st.metric("Total Appointments", total)
+
+        with col2:
+            completed = int(status_counts.get('completed', 0))
+            st.metric("Completed", completed)
+
+        with col3:
+            missed = int(status_counts.get('missed', 0))
+            st.metric("Missed", missed)
+
+        with col4:
+            if total > 0:
+                completion_rate = (completed / total) * 100
+                st.metric("Completion Rate", f"{completion_rate:.1f}%")
@@ -0,0 +1,158 @@
+from datetime import date
+
+import streamlit as st
+
+from clinic_app.availability import SlotConflictError
+from clinic_app.models import Appointment
+from clinic_app.page_limits import APPOINTMENTS_PAGE_SIZE, FREE_SLOT_CHOICES, PATIENT_SEARCH_RESULTS
+from clinic_app.ui.common import current_clinic, get_db, import_export_tab
+
+
+@st.fragment
+def schedule_appointment():
+    # Typing a search or picking a doctor reruns only this form
+    db = get_db()
+    st.subheader("➕ Schedule New Appointment")
+
+    patient_count = db.get_dashboard_summary()['patients']
+    doctors_df = db.get_doctors()
+
+    if patient_count == 0 or doctors_df.empty:
+        st.warning("⚠️ Please add at least one patient and one doctor before scheduling appointments.")
+        return
+
+    # Patient lookup goes through the search index instead of listing every patient
+    col1, col2 = st.columns(2)
+
+    with col1:
+        patient_query = st.text_input("Search Patient *", placeholder="Name, phone or email")
+
+    with col2:
+        matches_df = db.search_patients(patient_query, limit=PATIENT_SEARCH_RESULTS)
+        patient_options = {f"{row.name} - {row.phone} (ID: {row.id})": row.id for row in matches_df.itertuples()}
+        selected_patient = st.selectbox("Select Patient *", patient_options.keys())
+        patient_id = patient_options.get(selected_patient)
+
+    # Doctor, length and time live outside the form so the free slots follow the doctor picked
+    col1, col2 = st.columns(2)
+
+    with col1:
+        doctor_options = {f"Dr. {row.name} - {row.specialty} (ID: {row.id})": row.id
+                          for row in doctors_df.itertuples()}
+        selected_doctor = st.selectbox("Select Doctor *", doctor_options.keys())
+        doctor_id = doctor_options[selected_doctor]
+        duration = st.selectbox("Duration (minutes) *", [15, 30, 45, 60, 90, 120], index=1)
+
+    with col2:
+        free_slots = db.find_free_slots(doctor_id, duration_minutes=duration, count=FREE_SLOT_CHOICES)
+        slot_options = {slot.strftime('%a %d %b %Y, %H:%M'): slot for slot in free_slots}
+        slot_options["Other time..."] = None
+        selected_slot = st.selectbox("Next Free Slots *", slot_options.keys())
+        if slot_options[selected_slot] is None:
+            appointment_date = st.date_input("Appointment Date *", min_value=date.today())
+            appointment_time = st.time_input("Appointment Time *")
+            appointment_datetime = f"{appointment_date} {appointment_time}"
+        else:
+            appointment_datetime = slot_options[selected_slot].strftime('%Y-%m-%d %H:%M:%S')
+
+    with st.form("add_appointment_form"):
+        appointment_type = st.selectbox("Appointment Type *", [
+            "Consultation", "Follow-up", "Check-up", "Emergency",
+            "Surgery", "Therapy", "Vaccination", "Other"
+        ])
+
+        follow_up_required = st.checkbox("Follow-up Required")
+        notes = st.text_area("Notes", placeholder="Any special instructions or notes...")
+
+        submitted = st.form_submit_button("Schedule Appointment", type="primary")
+
+        if submitted and patient_id is None:
+            st.error("❌ No patient matches that search")
+        elif submitted:
+            appointment = Appointment(
+                patient_id, doctor_id, appointment_datetime,
+                appointment_type, "scheduled", follow_up_required, notes, duration
+            )
+            try:
+                appointment_id = db.add_appointment(appointment)
+            except SlotConflictError:
+                st.error("❌ The doctor is already booked at that time. Please pick a free slot.")
+            else:
+                st.success(f"✅ Appointment scheduled successfully! (ID: {appointment_id})")
+                st.rerun()
+
+
+@st.fragment
+def appointment_list():
+    # Filters and paging rerun only the list
+    db = get_db()
+    st.subheader("📋 All Appointments")
+    doctors_df = db.get_doctors()
+
+    # Filter options (applied in SQL, one page of rows at a time)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        status_filter = st.selectbox("Filter by Status",
+                                     ["All", "scheduled", "completed", "missed", "cancelled"])
+    with col2:
+        doctor_options = {"All": None}
+        doctor_options.update({f"Dr. {row.name} (ID: {row.id})": int(row.id) for row in doctors_df.itertuples()})
+        doctor_filter = st.selectbox("Filter by Doctor", doctor_options.keys())
+    with col3:
+        date_range = st.date_input("Filter by Date", value=())
+
+    filters = {
+        "status": None if status_filter == "All" else status_filter,
+        "doctor_id": doctor_options[doctor_filter],
+        "start_date": date_range[0] if len(date_range) > 0 else None,
+        "end_date": date_range[1] if len(date_range) > 1 else None,
+    }
+
+    # Keyset pagination: remember the cursor each visited page started after
+    if st.session_state.get("appointment_filters") != (current_clinic(), filters):
+        st.session_state.appointment_filters = (current_clinic(), filters)
+        st.session_state.appointment_cursors = [None]
+    cursors = st.session_state.appointment_cursors
+
+    total = db.count_appointments(**filters)
+    page_df = db.get_appointments_page(APPOINTMENTS_PAGE_SIZE, after=cursors[-1], **filters)
+
+    if not page_df.empty:
+        st.dataframe(page_df[[
+            'patient_name', 'doctor_name', 'appointment_date',
+            'appointment_type', 'status', 'follow_up_required'
+        ]], use_container_width=True)
+
+        first_row = (len(cursors) - 1) * APPOINTMENTS_PAGE_SIZE + 1
+        last_row = first_row + len(page_df) - 1
+        st.info(f"📊 Showing {first_row}-{last_row} of {total} appointments")
+
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            if st.button("⬅️ Previous", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun(scope="fragment")
+        with next_col:
+            if st.button("Next ➡️", disabled=last_row >= total, use_container_width=True):
+                last = page_df.iloc[-1]
+                cursors.append((int(last['appointment_ts']), int(last['id'])))
+                st.rerun(scope="fragment")
+    elif any(value is not None for value in filters.values()):
+        st.info("No appointments match these filters.")
+    else:
+        st.info("No appointments found. Schedule your first appointment!")
+
+
+def render():
+    st.header("📅 Appointment Management")
+
+    tab1, tab2, tab3 = st.tabs(["Schedule Appointment", "View Appointments", "Import / Export"])
+
+    with tab1:
+        schedule_appointment()
+
+    with tab2:
+        appointment_list()
+
+    with tab3:
+        import_export_tab("appointments")
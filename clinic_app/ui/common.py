@@ -0,0 +1,158 @@
+"""Shared resources and widgets for the Streamlit pages."""
+import io
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from clinic_app.bulk_io import import_file, export_table
+from clinic_app.database import DatabaseManager, SnapshotDatabase
+from clinic_app.dispatch import ReminderDispatcher, drain_outbox
+from clinic_app.metrics import instrument_database, instrument_service, start_http_server
+from clinic_app.providers import ProviderService
+from clinic_app.tenancy import ClinicDirectory, ClinicRouter
+
+# Bulk sends from the Send Reminders page share one outbox window, so a second
+# click (or a rerun after a partial failure) only sends what is still outstanding
+REMINDER_WINDOW = "7d"
+# The per-appointment buttons queue in a window of their own per clinic day, so
+# they neither block nor are blocked by the bulk and scheduled sends, and a
+# patient can be reminded by hand again the next day
+MANUAL_REMINDER_WINDOW = "manual:{:%Y-%m-%d}"
+OUTBOX_OWNER = f"streamlit:{os.getpid()}"
+
+# Analytics and exports read a copy of the database at most this many seconds old
+SNAPSHOT_MAX_AGE = 300
+
+
+# Set CLINIC_DIRECTORY to run several clinics, each on its own database (see clinic_app.tenancy)
+@st.cache_resource
+def get_router():
+    root = os.environ.get("CLINIC_DIRECTORY")
+    if not root:
+        return None
+    return ClinicRouter(ClinicDirectory(root), wrap=instrument_database, snapshot_max_age=SNAPSHOT_MAX_AGE)
+
+
+# With a single clinic: one database (and connection pool) shared by every session
+@st.cache_resource
+def _clinic_db():
+    return instrument_database(DatabaseManager())
+
+
+# Read-only copy for reports, so their long reads stay off the file bookings write to
+@st.cache_resource
+def _clinic_snapshot():
+    return instrument_database(SnapshotDatabase(_clinic_db(), max_age=SNAPSHOT_MAX_AGE))
+
+
+def clinic_selector():
+    # Sidebar clinic picker when running several clinics; every page then works on the picked one
+    router = get_router()
+    if router is None:
+        return
+    clinics = {clinic.slug: clinic.name for clinic in router.clinics()}
+    if not clinics:
+        st.error("No clinics in CLINIC_DIRECTORY yet. Add one with `python -m clinic_app.tenancy add`.")
+        st.stop()
+    st.sidebar.selectbox("🏥 Clinic:", list(clinics), format_func=clinics.get, key="clinic")
+
+
+def current_clinic():
+    # Slug of the clinic picked in the sidebar, or None with a single clinic
+    return st.session_state.get("clinic") if get_router() is not None else None
+
+
+def get_db():
+    router = get_router()
+    return _clinic_db() if router is None else router.database(st.session_state.clinic)
+
+
+def get_snapshot():
+    router = get_router()
+    return _clinic_snapshot() if router is None else router.snapshot(st.session_state.clinic)
+
+
+def snapshot_status(key):
+    # "Data as of" line with a button to take a new snapshot; returns the snapshot
+    snapshot = get_snapshot()
+    col1, col2 = st.columns([4, 1])
+    if col2.button("🔄 Refresh data", key=f"refresh_snapshot_{key}"):
+        snapshot.refresh()
+    taken_at = snapshot.refresh_if_stale()
+    col1.caption(f"📸 Data as of {taken_at:%Y-%m-%d %H:%M:%S}, refreshed every {SNAPSHOT_MAX_AGE // 60} minutes")
+    return snapshot
+
+
+# Reminder delivery workers, shared across sessions like the database
+@st.cache_resource
+def get_dispatcher():
+    return ReminderDispatcher(instrument_service(ProviderService.from_env()))
+
+
+# Prometheus /metrics on CLINIC_METRICS_PORT, started once per process
+@st.cache_resource
+def serve_metrics():
+    port = os.environ.get("CLINIC_METRICS_PORT")
+    if port:
+        start_http_server(int(port))
+    return port
+
+
+def go_to(page):
+    # Button callback: switch the sidebar page before the rerun
+    st.session_state.page = page
+
+
+def send_bulk_reminders(jobs, channel):
+    # Queue in the outbox (earlier failures go back to pending), deliver everything
+    # outstanding for the channel and return (sent, skipped because they already went out)
+    db = get_db()
+    queued = db.enqueue_reminders(jobs, REMINDER_WINDOW)
+    progress_bar = st.progress(0)
+    results = drain_outbox(
+        db, get_dispatcher(), OUTBOX_OWNER, REMINDER_WINDOW, reminder_type=channel,
+        on_progress=lambda done, total: progress_bar.progress(done / total),
+    )
+    progress_bar.progress(1.0)
+    return sum(result.sent for result in results), len(jobs) - queued
+
+
+def send_reminder(job):
+    # Queue and deliver one reminder from the individual buttons. Returns its
+    # DispatchResult (None if nothing was delivered) and its outbox state
+    # afterwards (None if it went out before the outbox existed)
+    db = get_db()
+    window = MANUAL_REMINDER_WINDOW.format(datetime.now(db.timezone))
+    db.enqueue_reminders([job], window)
+    results = drain_outbox(db, get_dispatcher(), OUTBOX_OWNER, window, reminder_type=job.channel)
+    result = next((result for result in results if result.job.appointment_id == job.appointment_id), None)
+    return result, db.get_reminder_state(job.appointment_id, job.channel, window)
+
+
+@st.fragment
+def import_export_tab(kind):
+    # Bulk CSV/Parquet upload and download for one table
+    db = get_db()
+    st.subheader(f"📥 Import {kind.title()}")
+    uploaded = st.file_uploader(f"CSV or Parquet file of {kind}", type=["csv", "parquet"], key=f"upload_{kind}")
+    if uploaded is not None and st.button(f"Import {kind.title()}", type="primary", key=f"import_{kind}"):
+        status = st.empty()
+        report = import_file(db, kind, uploaded, name=uploaded.name,
+                             on_progress=lambda progress: status.info(f"⏳ Imported {progress.imported} rows..."))
+        status.empty()
+        st.success(f"✅ Imported {report.imported} {kind} in {report.seconds:.1f}s")
+        if report.rejected:
+            st.warning(f"⚠️ Rejected {report.rejected} rows")
+            st.dataframe(pd.DataFrame(report.errors, columns=["Row", "Problem"]), use_container_width=True)
+
+    st.subheader(f"📤 Export {kind.title()}")
+    snapshot = snapshot_status(f"export_{kind}")
+    export_format = st.radio("Format", ["Parquet", "CSV"], horizontal=True, key=f"export_format_{kind}")
+    if st.button(f"Prepare {kind} export", key=f"export_{kind}"):
+        file_name = f"{kind}.{export_format.lower()}"
+        buffer = io.BytesIO()
+        rows = export_table(snapshot, kind, buffer, name=file_name)
+        st.download_button(f"⬇️ Download {file_name} ({rows} rows)", buffer.getvalue(),
+                           file_name=file_name, key=f"download_{kind}")
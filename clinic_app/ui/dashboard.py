@@ -0,0 +1,64 @@
+import streamlit as st
+
+from clinic_app.page_limits import DASHBOARD_UPCOMING_LIMIT
+from clinic_app.ui.common import get_db, go_to
+
+
+def render():
+    db = get_db()
+    st.header("📊 Dashboard Overview")
+
+    # Get statistics
+    summary = db.get_dashboard_summary(days_ahead=7)
+    recent_df = db.get_recent_appointments(5)
+    upcoming_df = db.get_upcoming_appointments(days_ahead=7, limit=DASHBOARD_UPCOMING_LIMIT)
+
+    # Metrics row
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("👥 Total Patients", summary['patients'])
+
+    with col2:
+        st.metric("👨‍⚕️ Total Doctors", summary['doctors'])
+
+    with col3:
+        st.metric("📅 Total Appointments", summary['appointments'])
+
+    with col4:
+        st.metric("⏰ Upcoming (7 days)", summary['upcoming'])
+
+    st.markdown("---")
+
+    # Quick Actions
+    st.subheader("🚀 Quick Actions")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.button("➕ Add New Patient", use_container_width=True, on_click=go_to, args=("Patients",))
+
+    with col2:
+        st.button("👨‍⚕️ Add New Doctor", use_container_width=True, on_click=go_to, args=("Doctors",))
+
+    with col3:
+        st.button("📅 Schedule Appointment", use_container_width=True, on_click=go_to, args=("Appointments",))
+
+    # Recent appointments
+    if not recent_df.empty:
+        st.subheader("📋 Recent Appointments")
+        st.dataframe(
+            recent_df[['patient_name', 'doctor_name', 'appointment_date', 'appointment_type', 'status']],
+            use_container_width=True
+        )
+
+    # Upcoming appointments alert
+    if not upcoming_df.empty:
+        st.subheader("⚠️ Upcoming Appointments Needing Reminders")
+        for apt in upcoming_df.itertuples():
+            with st.expander(f"📅 {apt.patient_name} - {apt.appointment_date}"):
+                st.write(f"**Doctor:** Dr. {apt.doctor_name}")
+                st.write(f"**Type:** {apt.appointment_type}")
+                st.write(f"**Phone:** {apt.patient_phone}")
+                st.write(f"**Email:** {apt.patient_email}")
+        if summary['upcoming'] > len(upcoming_df):
+            st.caption(f"...and {summary['upcoming'] - len(upcoming_df)} more on the Send Reminders page")
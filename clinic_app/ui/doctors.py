@@ -0,0 +1,89 @@
+import pandas as pd
+import streamlit as st
+
+from clinic_app.availability import WEEKDAYS
+from clinic_app.models import Doctor, WorkingHours
+from clinic_app.ui.common import get_db, import_export_tab
+
+
+@st.fragment
+def add_doctor_form():
+    db = get_db()
+    st.subheader("➕ Add New Doctor")
+
+    with st.form("add_doctor_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            name = st.text_input("Doctor Name *", placeholder="Dr. Sarah Smith")
+            phone = st.text_input("Phone Number *", placeholder="+1987654321")
+
+        with col2:
+            email = st.text_input("Email *", placeholder="dr.smith@clinic.com")
+            specialty = st.selectbox("Specialty", [
+                "General Practice", "Cardiology", "Dermatology",
+                "Pediatrics", "Orthopedics", "Neurology", "Other"
+            ])
+
+        submitted = st.form_submit_button("Add Doctor", type="primary")
+
+        if submitted:
+            if name and phone and email:
+                doctor = Doctor(name, phone, email, specialty)
+                doctor_id = db.add_doctor(doctor)
+                st.success(f"✅ Doctor '{name}' added successfully! (ID: {doctor_id})")
+                st.rerun()
+            else:
+                st.error("❌ Please fill in all required fields")
+
+
+@st.fragment
+def working_hours_editor():
+    db = get_db()
+    doctors_df = db.get_doctors()
+    st.subheader("🕘 Working Hours")
+    hours_options = {f"Dr. {row.name} (ID: {row.id})": int(row.id) for row in doctors_df.itertuples()}
+    hours_doctor = st.selectbox("Doctor", hours_options.keys(), key="hours_doctor")
+    hours_doctor_id = hours_options[hours_doctor]
+    hours_df = pd.DataFrame(
+        [(WEEKDAYS[block.weekday], block.start_time, block.end_time)
+         for block in db.get_working_hours(hours_doctor_id)],
+        columns=["Day", "Start", "End"],
+    )
+    edited_df = st.data_editor(
+        hours_df, num_rows="dynamic", use_container_width=True, key=f"hours_{hours_doctor_id}",
+        column_config={"Day": st.column_config.SelectboxColumn("Day", options=WEEKDAYS, required=True)},
+    )
+    if st.button("Save Working Hours", type="primary"):
+        try:
+            db.set_working_hours(hours_doctor_id, [
+                WorkingHours(hours_doctor_id, WEEKDAYS.index(row.Day), row.Start, row.End)
+                for row in edited_df.dropna().itertuples()
+            ])
+            st.success("✅ Working hours saved")
+        except ValueError as error:
+            st.error(f"❌ {error}")
+
+
+def render():
+    db = get_db()
+    st.header("👨‍⚕️ Doctor Management")
+
+    tab1, tab2, tab3 = st.tabs(["Add New Doctor", "View Doctors", "Import / Export"])
+
+    with tab1:
+        add_doctor_form()
+
+    with tab2:
+        st.subheader("📋 All Doctors")
+        doctors_df = db.get_doctors()
+
+        if not doctors_df.empty:
+            st.dataframe(doctors_df, use_container_width=True)
+            st.info(f"📊 Total Doctors: {len(doctors_df)}")
+            working_hours_editor()
+        else:
+            st.info("No doctors found. Add your first doctor!")
+
+    with tab3:
+        import_export_tab("doctors")
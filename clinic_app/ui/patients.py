@@ -0,0 +1,59 @@
+import streamlit as st
+
+from clinic_app.dispatch import CHANNELS
+from clinic_app.models import Patient
+from clinic_app.ui.common import get_db, import_export_tab
+
+
+@st.fragment
+def add_patient_form():
+    db = get_db()
+    st.subheader("➕ Add New Patient")
+
+    with st.form("add_patient_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            name = st.text_input("Full Name *", placeholder="John Doe")
+            phone = st.text_input("Phone Number *", placeholder="+1234567890")
+
+        with col2:
+            email = st.text_input("Email", placeholder="john@email.com")
+            whatsapp = st.text_input("WhatsApp Number", placeholder="+1234567890")
+
+        preferred = st.multiselect("Preferred Reminder Channels", CHANNELS,
+                                   help="In order of preference; reminders fall back to the others")
+
+        submitted = st.form_submit_button("Add Patient", type="primary")
+
+        if submitted:
+            if name and phone:
+                patient = Patient(name, phone, email, whatsapp, ",".join(preferred))
+                patient_id = db.add_patient(patient)
+                st.success(f"✅ Patient '{name}' added successfully! (ID: {patient_id})")
+                st.rerun()
+            else:
+                st.error("❌ Please fill in required fields (Name and Phone)")
+
+
+def render():
+    db = get_db()
+    st.header("👥 Patient Management")
+
+    tab1, tab2, tab3 = st.tabs(["Add New Patient", "View Patients", "Import / Export"])
+
+    with tab1:
+        add_patient_form()
+
+    with tab2:
+        st.subheader("📋 All Patients")
+        patients_df = db.get_patients()
+
+        if not patients_df.empty:
+            st.dataframe(patients_df, use_container_width=True)
+            st.info(f"📊 Total Patients: {len(patients_df)}")
+        else:
+            st.info("No patients found. Add your first patient!")
+
+    with tab3:
+        import_export_tab("patients")
@@ -0,0 +1,64 @@
+import pandas as pd
+import streamlit as st
+
+from clinic_app.metrics import (
+    DB_CALL_SECONDS, DB_ERRORS, DB_ROWS, PAGE_SECONDS, SEND_SECONDS, SENDS, SLOW_CALLS,
+    counter_totals, explain_query_plan, histogram_totals,
+)
+from clinic_app.ui.common import get_db
+
+SLOW_CALLS_SHOWN = 10
+
+
+def timing_table(histogram, label, extra=None):
+    # One row per label value that has been observed, slowest total first
+    rows = [
+        {label: name, "Calls": count, "Total (ms)": total * 1000, "Mean (ms)": total / count * 1000,
+         **{column: values.get(name, 0) for column, values in (extra or {}).items()}}
+        for name, (count, total) in histogram_totals(histogram).items() if count
+    ]
+    return pd.DataFrame(rows).sort_values("Total (ms)", ascending=False) if rows else pd.DataFrame()
+
+
+def render():
+    db = get_db()
+    st.header("⏱️ Performance")
+    st.caption("Since this server process started. Also exported for Prometheus when CLINIC_METRICS_PORT is set.")
+
+    st.subheader("🗄️ Database Calls")
+    calls_df = timing_table(DB_CALL_SECONDS, "Method",
+                            {"Rows": counter_totals(DB_ROWS), "Errors": counter_totals(DB_ERRORS)})
+    if calls_df.empty:
+        st.info("No database calls recorded yet.")
+    else:
+        st.dataframe(calls_df, use_container_width=True, hide_index=True)
+
+    st.subheader("📄 Page Reruns")
+    pages_df = timing_table(PAGE_SECONDS, "Page")
+    if not pages_df.empty:
+        st.dataframe(pages_df, use_container_width=True, hide_index=True)
+
+    st.subheader("📨 Reminder Sends")
+    sends = counter_totals(SENDS)
+    outcomes = {outcome: {channel: value for (channel, name), value in sends.items() if name == outcome}
+                for outcome in ("sent", "rejected", "error")}
+    sends_df = timing_table(SEND_SECONDS, "Channel", {outcome.title(): values for outcome, values in outcomes.items()})
+    if sends_df.empty:
+        st.info("No reminders sent by this process yet.")
+    else:
+        st.dataframe(sends_df, use_container_width=True, hide_index=True)
+
+    st.subheader("🐢 Slowest Calls")
+    if st.button("Reset slow call log"):
+        SLOW_CALLS.clear()
+    for seconds, method, args, statements in SLOW_CALLS.slowest()[:SLOW_CALLS_SHOWN]:
+        with st.expander(f"{seconds * 1000:.1f} ms - {method}({args})"):
+            # Only queries are traced (see clinic_app.metrics)
+            if not statements:
+                st.write("No queries (served from the cache or a write).")
+            for sql in statements:
+                st.code(sql.strip(), language="sql")
+                try:
+                    st.code("\n".join(explain_query_plan(db, sql)), language="text")
+                except Exception as error:
+                    st.caption(f"No plan: {error}")
@@ -0,0 +1,121 @@
+import math
+
+import pandas as pd
+import streamlit as st
+
+from clinic_app.dispatch import build_reminder_jobs, plan_reminder_jobs
+from clinic_app.page_limits import REMINDERS_PAGE_SIZE
+from clinic_app.ui.common import get_db, send_bulk_reminders, send_reminder
+
+BULK_SENDS = [
+    ("📱 Send All WhatsApp Reminders", "WhatsApp", "WhatsApp reminders"),
+    ("📨 Send All SMS Reminders", "SMS", "SMS reminders"),
+    ("📧 Send All Email Reminders", "Email", "email reminders"),
+]
+
+
+@st.fragment
+def bulk_reminders():
+    # The full upcoming list is only loaded when a button is clicked
+    db = get_db()
+    columns = st.columns(len(BULK_SENDS))
+    for column, (label, channel, noun) in zip(columns, BULK_SENDS):
+        with column:
+            if st.button(label, type="primary", use_container_width=True):
+                jobs = build_reminder_jobs(db.get_upcoming_appointments(days_ahead=7), channel)
+                success_count, skipped = send_bulk_reminders(jobs, channel)
+                st.success(f"✅ Sent {success_count} {noun}!")
+                if skipped:
+                    st.info(f"⏭️ Skipped {skipped} already sent")
+
+    if st.button("🎯 Send Using Patient Preferences", use_container_width=True):
+        jobs = plan_reminder_jobs(db.get_upcoming_appointments(days_ahead=7))
+        success_count, skipped = send_bulk_reminders(jobs, None)
+        st.success(f"✅ Sent {success_count} reminders on each patient's preferred channel!")
+        if skipped:
+            st.info(f"⏭️ Skipped {skipped} already sent")
+
+
+# (button label, key prefix, channel, message when the patient has no contact for it)
+REMINDER_BUTTONS = [
+    ("📱 WhatsApp", "wa", "WhatsApp", "No WhatsApp number"),
+    ("📨 SMS", "sms", "SMS", "No phone number"),
+    ("📧 Email", "email", "Email", "No email address"),
+]
+
+# What a button click that delivered nothing reports, by the reminder's outbox state
+OUTBOX_STATES = {
+    "sent": "⏭️ {} reminder already sent today",
+    "sending": "⏳ {} reminder is being sent from another session",
+    "pending": "⏳ {} reminder is queued and will be retried",
+    "failed": "❌ {} reminder failed too many times today",
+    "rejected": "❌ {} reminder was rejected by the provider",
+}
+
+
+def reminder_buttons(apt):
+    columns = st.columns(len(REMINDER_BUTTONS))
+    for column, (label, key, channel, missing) in zip(columns, REMINDER_BUTTONS):
+        with column:
+            if st.button(label, key=f"{key}_{apt.id}"):
+                jobs = build_reminder_jobs(pd.DataFrame([apt._asdict()]), channel)
+                if not jobs:
+                    st.error(missing)
+                    continue
+                result, state = send_reminder(jobs[0])
+                if result is None:
+                    st.info(OUTBOX_STATES.get(state, "⏭️ {} reminder already sent").format(channel))
+                elif result.sent:
+                    st.success(f"{channel} sent!")
+                else:
+                    st.error(f"{channel} failed: {result.error}")
+
+
+@st.fragment
+def individual_reminders(total):
+    # One page of expanders at a time; paging and the send buttons rerun only this list
+    pages = max(1, math.ceil(total / REMINDERS_PAGE_SIZE))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="reminders_page")
+    page_df = get_db().get_upcoming_appointments(
+        days_ahead=7, limit=REMINDERS_PAGE_SIZE, offset=(page - 1) * REMINDERS_PAGE_SIZE
+    )
+    first_row = (page - 1) * REMINDERS_PAGE_SIZE + 1
+    st.caption(f"Showing {first_row}-{first_row + len(page_df) - 1} of {total}")
+
+    for apt in page_df.itertuples():
+        with st.expander(f"📅 {apt.patient_name} - {apt.appointment_date}"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write(f"**Patient:** {apt.patient_name}")
+                st.write(f"**Doctor:** Dr. {apt.doctor_name}")
+                st.write(f"**Type:** {apt.appointment_type}")
+                st.write(f"**Date:** {apt.appointment_date}")
+
+            with col2:
+                st.write(f"**Phone:** {apt.patient_phone}")
+                st.write(f"**Email:** {apt.patient_email}")
+                st.write(f"**WhatsApp:** {apt.whatsapp_number}")
+
+            reminder_buttons(apt)
+
+
+def render():
+    st.header("📱 Send Reminders")
+
+    total = get_db().get_dashboard_summary(days_ahead=7)['upcoming']
+
+    if total == 0:
+        st.info("🎉 No upcoming appointments in the next 7 days!")
+        return
+
+    st.subheader(f"⏰ {total} Upcoming Appointments")
+
+    # Bulk reminder options
+    bulk_reminders()
+
+    st.markdown("---")
+
+    # Individual appointment reminders
+    st.subheader("📋 Individual Reminders")
+    individual_reminders(total)